@@ -0,0 +1,123 @@
+import cv2
+import numpy as np
+from frame_ingest import to_bgr
+
+
+class Detection:
+    """
+    A detected landing pad, in full-resolution image coordinates.
+    """
+
+    __slots__ = ("center", "source", "polygon", "bbox", "confidence", "label")
+
+    def __init__(self, center, source, polygon=None, bbox=None, confidence=None, label=None):
+        """
+        Args:
+            center (list): [x, y] pad centre.
+            source (str): Detector that produced it ("cv", "yolo", "ocr", ...).
+            polygon (numpy.ndarray or None): Pad outline, as returned by `cv2.approxPolyDP`.
+            bbox (tuple or None): (x, y, width, height) bounding box.
+            confidence (float or None): Detector confidence, if it reports one.
+            label (str or None): Text drawn next to the centre.
+        """
+        self.center = center
+        self.source = source
+        self.polygon = polygon
+        self.bbox = bbox
+        self.confidence = confidence
+        self.label = label
+
+    def __repr__(self):
+        return (f"Detection(center={self.center}, source={self.source!r}, bbox={self.bbox}, "
+                f"confidence={self.confidence})")
+
+
+class DetectionResult:
+    """
+    Output of a detector for one frame. Nothing is drawn; see `Annotator`.
+    """
+
+    __slots__ = ("frame", "image_center", "detection", "tracked", "raw")
+
+    def __init__(self, frame, image_center, detection=None):
+        """
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Frame the detector ran on (not modified).
+            image_center (list): [x, y] centre of the image.
+            detection (Detection or None): The pad, if found.
+        """
+        self.frame = frame
+        self.image_center = image_center
+        self.detection = detection
+        self.tracked = None  # [x, y] centre estimated by the tracker, if any
+        self.raw = None  # Backend-specific output (e.g. ultralytics results)
+
+    @property
+    def center(self):
+        """
+        list or None: [x, y] centre of the detected pad.
+        """
+        return None if self.detection is None else self.detection.center
+
+
+class Annotator:
+    """
+    Renders detection results as overlays on a copy of their frame, into reused buffers.
+
+    Rendering only happens when a consumer asks for it, and never modifies the input
+    frame. A buffer is reused `slots` renders later, so `slots` must exceed the number of
+    rendered frames in use at once (e.g. one being shown while the next is drawn).
+    """
+
+    # Colour (BGR) of the label text, per detector
+    LABEL_COLORS = {"ocr": (0, 255, 0)}
+
+    def __init__(self, slots=2):
+        """
+        Args:
+            slots (int): Number of rendered frames kept alive at the same time.
+        """
+        self.buffers = [None] * slots
+        self.index = 0
+
+    def render(self, result):
+        """
+        Draw the image centre, the detected pad and the tracked centre.
+
+        Args:
+            result (DetectionResult): Result to draw.
+
+        Returns:
+            numpy.ndarray: Annotated BGR image (valid until the buffer is reused).
+        """
+        image = to_bgr(result.frame)
+        buffer = self.buffers[self.index]
+        if buffer is None or buffer.shape != image.shape:
+            buffer = self.buffers[self.index] = np.empty_like(image)
+        self.index = (self.index + 1) % len(self.buffers)
+        np.copyto(buffer, image)
+
+        # Draw the image center
+        image_center = result.image_center
+        cv2.circle(buffer, (image_center[0], image_center[1]), 10, (0, 255, 255), -1)
+        cv2.putText(buffer, "Image Center", (image_center[0] + 15, image_center[1] - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+
+        detection = result.detection
+        if detection is not None:
+            if detection.polygon is not None:
+                cv2.drawContours(buffer, [detection.polygon], -1, (0, 255, 0), 3)
+            elif detection.bbox is not None:
+                x, y, w, h = detection.bbox
+                cv2.rectangle(buffer, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+            # Draw the pad center
+            x_center, y_center = detection.center
+            cv2.circle(buffer, (x_center, y_center), 10, (0, 0, 255), -1)
+            if detection.label:
+                cv2.putText(buffer, detection.label, (x_center - 20, y_center - 20), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.5, self.LABEL_COLORS.get(detection.source, (0, 0, 255)), 2)
+
+        if result.tracked is not None:
+            cv2.drawMarker(buffer, tuple(result.tracked), (255, 0, 255), cv2.MARKER_CROSS, 20, 2)
+        return buffer
@@ -0,0 +1,127 @@
+import numpy as np
+
+
+class BatchControl:
+    """
+    Control of many drones at once, with the state of each drone held in NumPy arrays.
+
+    Each drone follows the same rules as `Control.compute_actions`: error to the image centre,
+    proportional roll and pitch outside the error threshold, descent inside it or when the pad
+    is lost, and exploration throttle until the pad has been seen once. The decisions of any
+    drone match those of its own `Control` step for step; only detection is left to the caller.
+    """
+
+    def __init__(self, n_drones, kp_min=0.015, kp_max=0.015, error_threshold=15, exploration_throttle=0.5,
+                 dynamic_gains=False):
+        """
+        Args:
+            n_drones (int): Number of drones.
+            kp_min (float or numpy.ndarray): Proportional gain for roll, or one per drone.
+            kp_max (float or numpy.ndarray): Proportional gain for pitch, or one per drone.
+            error_threshold (float or numpy.ndarray): Threshold for error, below which throttle is
+                decreased, or one per drone.
+            exploration_throttle (float): Throttle until the pad has been seen.
+            dynamic_gains (bool): Raise the gains with the error magnitude, as `Control.adjust_gains` does.
+        """
+        self.n_drones = n_drones
+        self.kp_min = np.broadcast_to(np.asarray(kp_min, dtype=float), (n_drones,)).copy()
+        self.kp_max = np.broadcast_to(np.asarray(kp_max, dtype=float), (n_drones,)).copy()
+        self.error_threshold = np.broadcast_to(np.asarray(error_threshold, dtype=float), (n_drones,)).copy()
+        self.exploration_throttle = exploration_throttle  # Throttle value during exploration phase.
+        self.dynamic_gains = dynamic_gains
+        self.ground = 0.1  # Ground level threshold.
+
+        self.landing_throttle = np.empty(n_drones)
+        self.landing_mode = np.empty(n_drones, dtype=bool)
+        self.has_last = np.empty(n_drones, dtype=bool)  # Whether the pad has been seen
+        self.last_rectangle_center = np.empty((n_drones, 2))
+        self.actions = np.empty((n_drones, 4))
+        self.reset()
+
+    def reset(self, drones=None):
+        """
+        Return drones to the state of a new `Control`.
+
+        Args:
+            drones (numpy.ndarray or None): Indices or boolean mask of the drones to reset (default: all).
+        """
+        drones = slice(None) if drones is None else drones
+        self.landing_throttle[drones] = 0.81
+        self.landing_mode[drones] = False
+        self.has_last[drones] = False
+        self.last_rectangle_center[drones] = 0.0
+        self.actions[drones] = [0.0, 0.0, 0.0, 0.4]
+
+    @staticmethod
+    def pack_detections(centers):
+        """
+        Convert per-drone detections to the arrays taken by `compute_actions`.
+
+        Args:
+            centers (list): [x, y] pad centre or None, per drone.
+
+        Returns:
+            tuple: ((N, 2) float centres, (N,) bool detected mask).
+        """
+        detected = np.array([center is not None for center in centers], dtype=bool)
+        packed = np.zeros((len(centers), 2))
+        if detected.any():
+            packed[detected] = [center for center in centers if center is not None]
+        return packed, detected
+
+    def throttle_control(self, pos):
+        """
+        Adjust throttle based on altitude, for every drone.
+
+        Args:
+            pos (numpy.ndarray): (N,) current altitudes.
+
+        Returns:
+            numpy.ndarray: (N,) throttle values (zero near the ground).
+        """
+        airborne = pos > self.ground
+        # Drones near the ground keep their last landing throttle, as `Control` does
+        self.landing_throttle = np.where(airborne, np.maximum(0.05, pos / 1.5), self.landing_throttle)
+        return np.where(airborne, self.landing_throttle, 0.0)
+
+    def compute_actions(self, image_center, rectangle_center, detected, pos):
+        """
+        Turn the detections of all drones into control actions.
+
+        Args:
+            image_center (numpy.ndarray): [x, y] centre of the image, shared or (N, 2).
+            rectangle_center (numpy.ndarray): (N, 2) centres of the detected pads (ignored where
+                `detected` is False).
+            detected (numpy.ndarray): (N,) whether each drone detected the pad on this frame.
+            pos (numpy.ndarray): (N,) current altitudes.
+
+        Returns:
+            numpy.ndarray: (N, 4) control actions [roll, pitch, yaw, throttle] (the `actions`
+            attribute, overwritten by the next call).
+        """
+        rectangle_center = np.asarray(rectangle_center, dtype=float)
+        detected = np.asarray(detected, dtype=bool)
+        throttle_land = self.throttle_control(np.asarray(pos, dtype=float))
+
+        # Store the detected centres; drones that lost the pad steer to the last known one.
+        self.last_rectangle_center[detected] = rectangle_center[detected]
+        self.has_last |= detected
+        self.landing_mode |= self.has_last
+
+        error = self.last_rectangle_center - image_center
+        steer = self.landing_mode & (np.abs(error) > self.error_threshold[:, None]).all(axis=1)
+        descend = self.landing_mode & ~steer
+
+        if self.dynamic_gains:
+            scale = np.minimum(1.0, np.abs(error) / 80)
+            kp_roll = self.kp_min + (self.kp_max - self.kp_min) * scale[:, 0]
+            kp_pitch = self.kp_min + (self.kp_max - self.kp_min) * scale[:, 1]
+        else:
+            kp_roll, kp_pitch = self.kp_min, self.kp_max
+
+        actions = self.actions
+        actions[:, :3] = 0.0
+        actions[:, 0] = np.where(steer, kp_roll * error[:, 0] / 10, 0.0)
+        actions[:, 1] = np.where(steer, -kp_pitch * error[:, 1] / 10, 0.0)
+        actions[:, 3] = np.where(steer, 0.0, np.where(descend, -throttle_land, self.exploration_throttle))
+        return actions
@@ -0,0 +1,194 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+import detectors
+from cascade import CascadeDetector
+from frame_sources import augment, load_images, load_video, resize_frame
+from image_processing import image_processing
+
+
+def probe_yolo(ip):
+    if not Path(ip.model_path).exists():
+        raise FileNotFoundError(f"model '{ip.model_path}' not found")
+    ip.preload(yolo=True)
+
+
+def probe_yolo_onnx(ip):
+    onnx_path = Path(ip.model_path).with_suffix(".onnx")
+    if not onnx_path.exists() and not Path(ip.model_path).exists():
+        raise FileNotFoundError(f"model '{onnx_path}' not found")
+    ip.preload(yolo=True)
+
+
+def probe_ocr(ip):
+    detectors.get_backend("tesseract").get_tesseract_version()
+
+
+def probe_ocr_engine(ip):
+    ip.preload(ocr=True)
+
+
+# Detector name -> (image_processing method or "cascade", availability probe, image_processing options)
+DETECTORS = {
+    "cv": ("cv_detection", None, {}),
+    "yolo": ("Yolo_detection", probe_yolo, {}),
+    "yolo-onnx": ("Yolo_detection", probe_yolo_onnx, {"yolo_backend": "onnx"}),
+    "ocr": ("tes_detection", probe_ocr, {"ocr_engine": False}),  # One tesseract process per frame
+    "ocr-engine": ("tes_detection", probe_ocr_engine, {"ocr_engine": True}),
+    "cascade": ("cascade", probe_yolo, {}),  # OpenCV, escalating to YOLO
+}
+
+
+def load_detector(name, model_path):
+    """
+    Build a detector function, or explain why it is unavailable.
+
+    Returns:
+        tuple: (callable or None, reason it was skipped or None)
+    """
+    method, probe, options = DETECTORS[name]
+    # Frames are unrelated to each other, so ROI tracking is disabled.
+    ip = image_processing(roi_tracking=False, model_path=model_path, **options)
+    if probe is not None:
+        try:
+            probe(ip)
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+    if method == "cascade":
+        return CascadeDetector(ip).detect, None
+    return getattr(ip, method), None
+
+
+def run_detector(detect, frames, warmup, tolerance):
+    """
+    Time a detector over the frames.
+
+    Returns:
+        dict: Latency percentiles, throughput, hit rate and, where the pad center is known, accuracy.
+    """
+    for frame in frames[:warmup]:
+        detect(frame.image.copy())
+
+    latencies = np.empty(len(frames))
+    hits = 0
+    errors = []
+    for i, frame in enumerate(frames):
+        image = frame.image.copy()  # A fresh frame per call, as from a camera
+        start = time.perf_counter()
+        _, center, _ = detect(image)
+        latencies[i] = time.perf_counter() - start
+
+        if center is not None:
+            hits += 1
+            if frame.center is not None:
+                errors.append(float(np.hypot(float(center[0]) - frame.center[0], float(center[1]) - frame.center[1])))
+
+    labelled = sum(frame.center is not None for frame in frames)
+    max_error = tolerance * frames[0].image.shape[1]
+    latencies_ms = latencies * 1000
+    return {
+        "frames": len(frames),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "mean_ms": float(latencies_ms.mean()),
+        "fps": float(len(frames) / latencies.sum()),
+        "hit_rate": hits / len(frames),
+        "accuracy": sum(e <= max_error for e in errors) / labelled if labelled else None,
+        "mean_error_px": float(np.mean(errors)) if errors else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Find latency regressions against a previous run.
+
+    Returns:
+        list: Descriptions of the (detector, width) pairs whose p95 latency grew by more than `tolerance`.
+    """
+    previous = {(r["detector"], r["width"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get((result["detector"], result["width"]))
+        if old is not None and result["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result['detector']} @ {result['width']}px: p95 {old['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline landing pad detector benchmark.")
+    parser.add_argument("--images", default="./landing_pad_images", help="Directory of landing pad images.")
+    parser.add_argument("--video", action="append", default=[], help="Video file to take frames from (repeatable).")
+    parser.add_argument("--video-stride", type=int, default=5, help="Keep one video frame out of this many.")
+    parser.add_argument("--no-augment", action="store_true", help="Skip the synthetic scale/rotation/blur/lighting variants.")
+    parser.add_argument("--detectors", default="cv,yolo,yolo-onnx,ocr,ocr-engine,cascade", help="Comma-separated detectors to run.")
+    parser.add_argument("--widths", default="320,640,1280", help="Comma-separated frame widths to test.")
+    parser.add_argument("--model", default="./models/landing_pad.pt", help="YOLO weights.")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed frames before measuring.")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="Max center error, as a fraction of the frame width, for a correct detection.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--baseline", help="Previous JSON results to check for latency regressions.")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed relative p95 latency increase over the baseline.")
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    frames = list(images)
+    if not args.no_augment:
+        frames += augment(images)
+    for video in args.video:
+        frames += load_video(video, stride=args.video_stride)
+    if not frames:
+        sys.exit("No frames to benchmark.")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "frames": len(frames),
+        },
+        "results": [],
+        "skipped": {},
+    }
+
+    for name in args.detectors.split(","):
+        detect, reason = load_detector(name, args.model)
+        if detect is None:
+            print(f"Skipping {name}: {reason}", file=sys.stderr)
+            report["skipped"][name] = reason
+            continue
+
+        for width in map(int, args.widths.split(",")):
+            sized = [resize_frame(frame, width) for frame in frames]
+            result = {"detector": name, "width": width, **run_detector(detect, sized, args.warmup, args.tolerance)}
+            report["results"].append(result)
+            accuracy = "n/a" if result["accuracy"] is None else f"{result['accuracy']:.2f}"
+            print(f"{name:>5} {width:>5}px  p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                  f"p99 {result['p99_ms']:7.2f} ms  {result['fps']:8.1f} fps  "
+                  f"hit {result['hit_rate']:.2f}  acc {accuracy}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["results"], json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,102 @@
+import argparse
+import json
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from frame_ingest import FrameIngest
+from frame_sources import load_images, place_on_ground
+from image_processing import image_processing
+
+
+def legacy_ingest(chw):
+    """
+    The per-frame path before `FrameIngest`: transpose, RGB->BGR, BGR->HSV, threshold and close,
+    allocating every intermediate.
+    """
+    frame = cv2.cvtColor(np.transpose(chw, (1, 2, 0)), cv2.COLOR_RGB2BGR)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv, np.array([110, 50, 50]), np.array([130, 255, 255]))
+    return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+
+
+def measure(path, observations, repeats):
+    """
+    Returns:
+        dict: Mean/p95 latency in ms and bytes allocated per frame.
+    """
+    for chw in observations[:3]:  # Warm-up, also sizes the reused buffers
+        path(chw)
+
+    latencies = []
+    for _ in range(repeats):
+        for chw in observations:
+            start = time.perf_counter()
+            path(chw)
+            latencies.append(time.perf_counter() - start)
+
+    # Peak memory allocated while processing one frame (NumPy and OpenCV outputs are traced)
+    tracemalloc.start()
+    path(observations[0])
+    _, frame_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "mean_ms": float(latencies_ms.mean()),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "alloc_bytes_per_frame": int(frame_peak),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency and allocations of observation ingest + segmentation.")
+    parser.add_argument("--widths", default="320,640,1280", help="Comma-separated frame widths.")
+    parser.add_argument("--frames", type=int, default=20, help="Distinct observations per width.")
+    parser.add_argument("--repeats", type=int, default=10, help="Passes over the observations.")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+    args = parser.parse_args()
+
+    pad = load_images()[0].image
+    ip = image_processing(roi_tracking=False)
+    ip_lut = image_processing(roi_tracking=False, segmentation="lut")
+    ingest = FrameIngest()
+
+    def ingest_only(chw):
+        return ip.segment(ingest.ingest(chw))
+
+    def ingest_lut(chw):
+        return ip_lut.segment(ingest.ingest(chw))
+
+    def ingest_annotated(chw):
+        frame = ingest.ingest(chw)
+        mask = ip.segment(frame)
+        frame.bgr()  # Annotation needs the BGR image
+        return mask
+
+    paths = {"legacy": legacy_ingest, "ingest": ingest_only, "ingest+bgr": ingest_annotated, "ingest+lut": ingest_lut}
+    results = []
+    for width in map(int, args.widths.split(",")):
+        height = width * 3 // 4
+        observations = []
+        for i in range(args.frames):
+            bgr, _ = place_on_ground(pad, (height, width), scale=0.4, offset=(0.02 * i, 0.0), seed=i)
+            # Same layout as the Unity observation: contiguous CHW RGB
+            observations.append(np.ascontiguousarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB).transpose(2, 0, 1)))
+
+        reference = [legacy_ingest(chw) for chw in observations]
+        for path in (ingest_only, ingest_lut):
+            assert all(np.array_equal(path(chw), ref) for chw, ref in zip(observations, reference)), \
+                f"{path.__name__} mask differs from the legacy mask"
+
+        for name, path in paths.items():
+            result = {"path": name, "width": width, **measure(path, observations, args.repeats)}
+            results.append(result)
+            if not args.json:
+                print(f"{name:>11} {width:>5}px  mean {result['mean_ms']:6.2f} ms  p95 {result['p95_ms']:6.2f} ms  "
+                      f"alloc/frame {result['alloc_bytes_per_frame'] / 1024:8.1f} KiB")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
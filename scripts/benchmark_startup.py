@@ -0,0 +1,75 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Each configuration runs in a fresh interpreter: it reports the time from the first
+# import to a ready `Control` and the peak resident set size of the process.
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {scripts_dir!r})
+{setup}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"startup_s": elapsed, "peak_rss_mb": rss_kb / 1024}}))
+"""
+
+CONFIGS = {
+    # What every run paid before the detector registry: both libraries imported and the
+    # YOLO model loaded by each of the two `image_processing` instances.
+    "eager (previous)": (
+        "import cv2, numpy\n"
+        "from ultralytics import YOLO\n"
+        "import pytesseract\n"
+        "models = [YOLO('./models/landing_pad.pt') for _ in range(2)]"
+    ),
+    "cv": "from control_actions import Control\ncontrol = Control(detector='cv')",
+    "ocr": "from control_actions import Control\ncontrol = Control(detector='ocr')",
+    "yolo": "from control_actions import Control\ncontrol = Control(detector='yolo')",
+}
+
+
+def measure(setup, repeats):
+    """
+    Run a configuration in fresh interpreters.
+
+    Returns:
+        dict: Median startup time and peak RSS, or the reason the configuration was skipped.
+    """
+    runs = []
+    for _ in range(repeats):
+        code = CHILD.format(scripts_dir=str(SCRIPTS_DIR), setup=setup)
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if proc.returncode != 0:
+            reason = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+            return {"skipped": reason}
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    return {
+        "startup_s": statistics.median(r["startup_s"] for r in runs),
+        "peak_rss_mb": statistics.median(r["peak_rss_mb"] for r in runs),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup time and memory per detector configuration.")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per configuration.")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+    args = parser.parse_args()
+
+    results = {name: measure(setup, args.repeats) for name, setup in CONFIGS.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'configuration':<18} {'startup (s)':>12} {'peak RSS (MB)':>14}")
+        for name, result in results.items():
+            if "skipped" in result:
+                print(f"{name:<18} skipped: {result['skipped']}")
+            else:
+                print(f"{name:<18} {result['startup_s']:>12.3f} {result['peak_rss_mb']:>14.1f}")
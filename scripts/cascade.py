@@ -0,0 +1,169 @@
+from collections import Counter
+
+import numpy as np
+from annotation import Detection
+
+
+class CascadeDetector:
+    """
+    Landing pad detection that runs the cheap OpenCV detector first and escalates to YOLO or
+    OCR only when its answer is doubtful.
+
+    The OpenCV stage escalates when it misses, when it must choose between several pad-shaped
+    candidates without a pad to follow (see `PadIndex`), or when its centre disagrees with the
+    expected (tracked) position. Centres of both stages are then fused by confidence.
+    Per-stage hits and escalation reasons are counted in `counters`.
+    """
+
+    FALLBACKS = ("yolo", "ocr")
+    # Tesseract reports no confidence for its boxes
+    OCR_CONFIDENCE = 0.7
+
+    def __init__(self, image_processing, fallback="yolo", cv_confidence=0.8, max_disagreement=40):
+        """
+        Args:
+            image_processing (image_processing): Detectors to run.
+            fallback (str): Stage run on escalation: "yolo" or "ocr".
+            cv_confidence (float): Confidence of an unambiguous OpenCV hit.
+            max_disagreement (float): Distance in pixels beyond which two centres disagree.
+        """
+        if fallback not in self.FALLBACKS:
+            raise ValueError(f"Unknown fallback '{fallback}'. Choose 'yolo' or 'ocr'.")
+
+        self.image_processing = image_processing
+        self.fallback = fallback
+        self.cv_confidence = cv_confidence
+        self.max_disagreement = max_disagreement
+        self.confidence = 0.0  # Confidence of the last fused centre
+        self.counters = Counter()
+
+    def preload(self):
+        """
+        Load the fallback stage's backend.
+        """
+        self.image_processing.preload(yolo=self.fallback == "yolo", ocr=self.fallback == "ocr")
+
+    def run_fallback(self, frame):
+        """
+        Run the fallback stage.
+
+        Returns:
+            tuple: (DetectionResult, confidence of its detection).
+        """
+        if self.fallback == "yolo":
+            result = self.image_processing.yolo_detect(frame)
+            return result, result.detection.confidence if result.detection is not None else 0.0
+
+        result = self.image_processing.tes_detect(frame)
+        return result, self.OCR_CONFIDENCE if result.detection is not None else 0.0
+
+    def escalation_reason(self, center, expected):
+        """
+        Returns:
+            str or None: Why the OpenCV result needs a second opinion, or None if it does not.
+        """
+        if center is None:
+            return "miss"
+        if self.image_processing.ambiguous:
+            return "ambiguous"
+        if expected is not None and np.hypot(center[0] - expected[0], center[1] - expected[1]) > self.max_disagreement:
+            return "disagree"
+        return None
+
+    def fuse(self, cv_center, cv_confidence, fallback_center, fallback_confidence):
+        """
+        Combine the centres of both stages.
+
+        Returns:
+            tuple: (center or None, confidence).
+        """
+        if fallback_center is None:
+            return cv_center, cv_confidence
+        if cv_center is None:
+            return fallback_center, fallback_confidence
+
+        if np.hypot(cv_center[0] - fallback_center[0], cv_center[1] - fallback_center[1]) <= self.max_disagreement:
+            # Both stages agree: confidence-weighted average
+            self.counters["fused"] += 1
+            total = cv_confidence + fallback_confidence
+            center = [int(round((cv_center[i] * cv_confidence + fallback_center[i] * fallback_confidence) / total))
+                      for i in range(2)]
+            return center, max(cv_confidence, fallback_confidence)
+
+        # The stages disagree: trust the most confident one, with less confidence
+        self.counters["conflict"] += 1
+        if fallback_confidence >= cv_confidence:
+            return fallback_center, fallback_confidence / 2
+        return cv_center, cv_confidence / 2
+
+    def detect_result(self, frame, altitude=None, expected=None):
+        """
+        Detect the landing pad with the cascade.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame.
+            altitude (float or None): Current altitude.
+            expected (list or None): [x, y] position where the pad is expected (e.g. tracked).
+
+        Returns:
+            DetectionResult: The fused detection, labelled with the stage that produced it.
+        """
+        self.counters["frames"] += 1
+        result = self.image_processing.cv_detect(frame, altitude, expected)
+        cv_center = result.center
+        if cv_center is not None:
+            self.counters["cv_hits"] += 1
+
+        reason = self.escalation_reason(cv_center, expected)
+        if reason is None:
+            self.confidence = self.cv_confidence
+            result.detection.confidence = self.confidence
+            result.detection.label = f"cv {self.confidence:.2f}"
+            return result
+
+        self.counters["escalations"] += 1
+        self.counters[f"escalations_{reason}"] += 1
+        cv_confidence = 0.0 if cv_center is None else self.cv_confidence / 2
+        # The OCR stage searches for the pad region too; keep the candidates of the OpenCV stage
+        candidates = self.image_processing.pad_candidates
+        fallback, fallback_confidence = self.run_fallback(frame)
+        self.image_processing.pad_candidates, self.image_processing.candidates = candidates, len(candidates)
+        if fallback.detection is not None:
+            self.counters[f"{self.fallback}_hits"] += 1
+        center, self.confidence = self.fuse(cv_center, cv_confidence, fallback.center, fallback_confidence)
+
+        # Keep the outline of the stage whose centre was used
+        used = fallback.detection if center == fallback.center else result.detection
+        if center is not None:
+            result.detection = Detection(center, "cascade", polygon=used.polygon if used is not None else None,
+                                         bbox=used.bbox if used is not None else None, confidence=self.confidence,
+                                         label=f"{self.fallback} ({reason}) {self.confidence:.2f}")
+        return result
+
+    def detect(self, frame, altitude=None, annotate=True, expected=None):
+        """
+        Detect the landing pad with the cascade.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame.
+            altitude (float or None): Current altitude.
+            annotate (bool): Whether the annotated frame is needed.
+            expected (list or None): [x, y] position where the pad is expected (e.g. tracked).
+
+        Returns:
+            tuple: (image center, fused rectangle center or None, annotated frame or None).
+        """
+        result = self.detect_result(frame, altitude, expected)
+        annotated_frame = self.image_processing.annotator.render(result) if annotate else None
+        return result.image_center, result.center, annotated_frame
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters plus the OpenCV hit rate and the escalation rate.
+        """
+        frames = max(self.counters["frames"], 1)
+        stats = dict(self.counters)
+        stats["cv_hit_rate"] = self.counters["cv_hits"] / frames
+        stats["escalation_rate"] = self.counters["escalations"] / frames
+        return stats
@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+class ColorLUT:
+    """
+    Segmentation engine that maps RGB colours to the pad mask with one table lookup.
+
+    The table holds the result of `cv2.inRange(RGB->HSV, lower, upper)` for every
+    quantised RGB colour. It is built once per threshold set and cached on disk, keyed
+    by the thresholds and quantisation.
+
+    Tolerance: with `bits=8` (default) every colour has its own entry and the mask is
+    identical to the HSV path. With fewer bits each entry covers a cube of colours and
+    is decided by the cube's centre, so only pixels within `2 ** (8 - bits - 1)` levels of
+    a threshold boundary (in RGB) can differ; the table shrinks from 16 MiB to
+    `2 ** (3 * bits)` bytes but the index costs a few extra array operations.
+    """
+
+    def __init__(self, lower, upper, bits=8, cache_dir="./lut_cache"):
+        """
+        Args:
+            lower (array-like): Lower HSV bound (OpenCV ranges: H 0-180, S and V 0-255).
+            upper (array-like): Upper HSV bound.
+            bits (int): Quantisation bits per channel (1-8).
+            cache_dir (str or None): Directory of the cached tables; None disables the cache.
+        """
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be between 1 and 8, got {bits}")
+        self.lower = np.array(lower, dtype=np.uint8)
+        self.upper = np.array(upper, dtype=np.uint8)
+        self.bits = bits
+        self.cache_dir = cache_dir
+        self.table = self.load_or_build()
+        self._index = None
+        self._rgbx = None
+
+    @property
+    def cache_path(self):
+        key = "_".join(map(str, [*self.lower, *self.upper]))
+        return Path(self.cache_dir) / f"lut_{key}_b{self.bits}.npy"
+
+    def load_or_build(self):
+        """
+        Returns:
+            numpy.ndarray: The lookup table, read from the cache if present.
+        """
+        if self.cache_dir is not None and self.cache_path.exists():
+            table = np.load(self.cache_path)
+            if table.shape == (1 << (3 * self.bits),):
+                return table
+
+        table = self.build()
+        if self.cache_dir is not None:
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                np.save(self.cache_path, table)
+            except OSError as e:
+                print(f"Could not cache colour LUT: {e}")
+        return table
+
+    def build(self):
+        """
+        Evaluate the HSV threshold for every quantised colour.
+
+        Returns:
+            numpy.ndarray: uint8 table of 0/255 values indexed by the packed colour.
+        """
+        index = np.arange(1 << (3 * self.bits), dtype=np.uint32)
+        if self.bits == 8:
+            # Entry i is the colour whose RGBX pixel, read as a native uint32, equals i
+            rgb = index.view(np.uint8).reshape(-1, 4)[:, :3]
+        else:
+            mask = (1 << self.bits) - 1
+            shift = 8 - self.bits
+            half = (1 << shift) >> 1  # Centre of each quantisation cube
+            channels = [(index >> (c * self.bits)) & mask for c in range(3)]
+            rgb = np.stack([(ch << shift) + half for ch in channels], axis=1).astype(np.uint8)
+
+        hsv = cv2.cvtColor(np.ascontiguousarray(rgb).reshape(-1, 1, 3), cv2.COLOR_RGB2HSV)
+        return cv2.inRange(hsv, self.lower, self.upper).reshape(-1)
+
+    def packed(self, image, code=None):
+        """
+        Pack an image into one uint32 colour index per pixel.
+
+        Args:
+            image (numpy.ndarray): RGBX image with a zero fourth channel (used as is), or any
+                image together with the `cv2.COLOR_*2RGBA` code that converts it.
+            code (int or None): Conversion to RGBA, or None if `image` is already RGBX.
+
+        Returns:
+            numpy.ndarray: (height, width) uint32 view or array.
+        """
+        if code is not None:
+            shape = image.shape[:2] + (4,)
+            if self._rgbx is None or self._rgbx.shape != shape:
+                self._rgbx = np.empty(shape, np.uint8)
+            cv2.cvtColor(image, code, dst=self._rgbx)
+            self._rgbx[..., 3] = 0
+            image = self._rgbx
+        return image.view(np.uint32)[..., 0]
+
+    def apply(self, image, code=None, dst=None):
+        """
+        Compute the pad mask of an image.
+
+        Args:
+            image (numpy.ndarray): See `packed`.
+            code (int or None): See `packed`.
+            dst (numpy.ndarray or None): (height, width) uint8 output buffer.
+
+        Returns:
+            numpy.ndarray: Binary mask (0/255), as `cv2.inRange` on the HSV image would return.
+        """
+        packed = self.packed(image, code)
+
+        # np.take converts indices to intp; converting into a reused buffer avoids a new array per frame
+        if self._index is None or self._index.shape != packed.shape:
+            self._index = np.empty(packed.shape, np.intp)
+        index = self._index
+        if self.bits == 8:
+            np.copyto(index, packed)
+        else:
+            shift = 8 - self.bits
+            mask = (1 << self.bits) - 1
+            np.bitwise_and(packed >> shift, mask, out=index)
+            index |= ((packed >> (8 + shift)) & mask) << self.bits
+            index |= ((packed >> (16 + shift)) & mask) << (2 * self.bits)
+
+        # mode="clip" avoids the temporary output buffer np.take uses in its default mode
+        return np.take(self.table, index, out=dst, mode="clip")
@@ -1,8 +1,21 @@
+import time
+
 import numpy as np
+from annotation import DetectionResult
+from cascade import CascadeDetector
+from frame_gate import FrameGate
 from image_processing import image_processing
+from instrumentation import Instrumentation
+from pad_tracker import PadTracker
 
 class Control:
-    def __init__(self, kp_min=0.015, kp_max=0.015, error_threshold=15):
+    # Detector names mapped to `image_processing` methods.
+    DETECTORS = {"cv": "cv_detect", "yolo": "yolo_detect", "ocr": "tes_detect", "cascade": None}
+
+    def __init__(self, kp_min=0.015, kp_max=0.015, error_threshold=15, roi_tracking=True, detector="cv",
+                 segmentation="hsv", yolo_backend="ultralytics", track=False, detect_every=1,
+                 max_uncertainty=12.0, command_gain=0.0, max_coast=15, cascade_fallback="yolo", instrumentation=None,
+                 gate=False, gate_threshold=3.0, gate_max_age=10, exploration_throttle=0.5, dynamic_gains=False):
         """
         Initialize the Control class with proportional control parameters.
 
@@ -10,18 +23,75 @@ class Control:
             kp_min (float): Minimum proportional gain for roll and pitch control.
             kp_max (float): Maximum proportional gain for roll and pitch control.
             error_threshold (int): Threshold for error, below which throttle is decreased.
+            roi_tracking (bool): Search only around the last detected pad instead of the full frame.
+            detector (str): Landing pad detector: "cv" (OpenCV), "yolo", "ocr" (Tesseract) or
+                "cascade" (OpenCV, escalating to `cascade_fallback`). Only the selected detector's
+                backend is loaded.
+            segmentation (str): Pad colour segmentation of the OpenCV detector: "hsv" or "lut".
+            yolo_backend (str): YOLO inference backend: "ultralytics" or "onnx" (ONNX Runtime, CPU).
+            track (bool): Follow the pad with a Kalman tracker (`PadTracker`) that predicts its centre
+                between detections and smooths the error signal.
+            detect_every (int): With tracking, run the detector on one frame out of `detect_every`.
+            max_uncertainty (float): With tracking, force a detection on the next frame when the
+                predicted centre is uncertain by more than this many pixels.
+            command_gain (float): Image motion of the pad at a full roll/pitch command, in pixels
+                per frame at 1 m altitude, used by the tracker's motion model.
+            max_coast (int): With tracking, frames without detection after which the track is
+                dropped and the last detected centre is held instead (see `PadTracker.expire`).
+            cascade_fallback (str): Stage the cascade escalates to: "yolo" or "ocr".
+            instrumentation (Instrumentation or None): Receives the "detect" and "control" stage timings.
+            gate (bool): Reuse the last detection, shifted, on frames that barely changed since it
+                was made (`FrameGate`), instead of running the detector.
+            gate_threshold (float): With gating, the largest frame change at which the detection is reused.
+            gate_max_age (int): With gating, the number of frames after which the detector runs anyway.
+            exploration_throttle (float): Throttle until the pad has been seen.
+            dynamic_gains (bool): Raise the roll and pitch gains from `kp_min` towards `kp_max`
+                with the error magnitude (see `adjust_gains`).
         """
+        if detect_every < 1:
+            raise ValueError("detect_every must be at least 1.")
+        if detector not in self.DETECTORS:
+            raise ValueError(f"Unknown detector '{detector}'. Choose from {sorted(self.DETECTORS)}.")
+
         self.kp_min = kp_min
         self.kp_max = kp_max
-        self.image_processing = image_processing()
+        self.image_processing = image_processing(roi_tracking=roi_tracking, segmentation=segmentation,
+                                                 yolo_backend=yolo_backend)
+        self.detector = detector
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.command_gain = command_gain
+        self.max_coast = max_coast
+        self.tracker = self.make_tracker() if track else None
+        self.detect_every = detect_every
+        self.max_uncertainty = max_uncertainty
+        self.frame_index = 0
+        self.detector_runs = 0
+        self.gate = FrameGate(gate_threshold, gate_max_age) if gate else None
+        self.cascade = CascadeDetector(self.image_processing, cascade_fallback) if detector == "cascade" else None
+        # Load the selected backend at startup rather than on the first frame.
+        if self.cascade is not None:
+            self.cascade.preload()
+        else:
+            self.image_processing.preload(yolo=detector == "yolo", ocr=detector == "ocr")
         self.error_threshold = error_threshold
-        self.exploration_throttle = 0.5  # Throttle value during exploration phase.
+        self.exploration_throttle = exploration_throttle  # Throttle value during exploration phase.
+        self.dynamic_gains = dynamic_gains
         self.landing_throttle = 0.81  # Throttle value for landing phase.
         self.landing_mode = False
         self.actions = [0.0, 0.0, 0.0, 0.4]  # Initial control actions [roll, pitch, yaw, throttle].
         
         # Stores the last detected rectangle center for continuity in tracking.
         self.last_rectangle_center = None
+        self.last_detection = None  # Last centre found by the detector itself
+        self.detection = None
+        self.result = None  # DetectionResult of the last frame
+
+    def make_tracker(self):
+        """
+        Returns:
+            PadTracker: A new tracker, configured with this controller's motion model and track timeout.
+        """
+        return PadTracker(command_gain=self.command_gain, max_coast=self.max_coast)
 
     def compute_error(self, image_center, rectangle_center):
         """
@@ -43,14 +113,10 @@ class Control:
         Dynamically adjust the proportional gains based on error magnitude.
 
         Note:
-            Currently, this function does not modify `kp_roll` and `kp_pitch`, 
-            as they are set to fixed values (`kp_min` and `kp_max`). However, 
-            if gain adjustment is needed, this function can be modified to 
-            dynamically update `kp_roll` and `kp_pitch` based on error magnitude.
-            
-            To enable dynamic gain adjustment:
-            - Modify `self.kp_roll` and `self.kp_pitch` within this function.
-            - Update `kp_min` and `kp_max` accordingly to define the range of variation.
+            By default the gains are fixed: `kp_roll` is `kp_min` and `kp_pitch` is `kp_max`.
+            With `dynamic_gains`, each gain rises linearly from `kp_min` at zero error to
+            `kp_max` at an error of 80 pixels or more, so that large offsets are corrected
+            faster and small ones without overshoot.
 
         Args:
             error_x (float): Error in the x-axis.
@@ -59,17 +125,16 @@ class Control:
         Returns:
             tuple: (kp_roll, kp_pitch) proportional gains for roll and pitch.
         """
-        self.kp_roll = self.kp_min  # Currently fixed, but can be adjusted dynamically.
-        self.kp_pitch = self.kp_max  # Currently fixed, but can be adjusted dynamically.
-
-        # Scaling factors for gain adjustment (currently unused but can be leveraged)
-        scale_factor_x = -error_x / 80  
-        scale_factor_y = -error_y / 80  
-
-        # If dynamic gain control is needed, uncomment and modify the following lines:
-        # self.kp_roll = max(self.kp_min, min(self.kp_max, self.kp_roll + scale_factor_x))
-        # self.kp_pitch = max(self.kp_min, min(self.kp_max, self.kp_pitch + scale_factor_y))
+        if not self.dynamic_gains:
+            self.kp_roll = self.kp_min
+            self.kp_pitch = self.kp_max
+            return self.kp_roll, self.kp_pitch
 
+        # Scaling factors for gain adjustment, saturating at 80 pixels of error
+        scale_factor_x = min(1.0, abs(error_x) / 80)
+        scale_factor_y = min(1.0, abs(error_y) / 80)
+        self.kp_roll = self.kp_min + (self.kp_max - self.kp_min) * scale_factor_x
+        self.kp_pitch = self.kp_min + (self.kp_max - self.kp_min) * scale_factor_y
         return self.kp_roll, self.kp_pitch
 
     def decrease_error(self, error_x, error_y):
@@ -103,30 +168,182 @@ class Control:
         Returns:
             float: Adjusted throttle value.
         """
+        throttle = self.landing_throttle_at(pos)
+        if throttle > 0.0:
+            self.landing_throttle = throttle
+        return throttle
+
+    @staticmethod
+    def landing_throttle_at(pos):
+        """
+        Throttle of `throttle_control` at an altitude, without updating `landing_throttle`.
+
+        Safe to call from one thread while another runs the controller.
+
+        Args:
+            pos (float): Current altitude or position.
+
+        Returns:
+            float: Throttle value.
+        """
         ground = 0.1  # Define ground level threshold.
         if pos <= ground:
             return 0.0  # If near ground, set throttle to zero.
+        # Reduce throttle smoothly to avoid sudden drops.
+        return max(0.05, pos / 1.5)
+
+    def detect_result(self, frame, pos):
+        """
+        Detect the pad on a frame, reusing the last detection if the frame gate allows it.
+
+        The gate is skipped while it costs more than it saves (see `FrameGate.bypass`).
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame used for image processing.
+            pos (float): Current altitude or position.
+
+        Returns:
+            DetectionResult: Detector output (nothing drawn).
+        """
+        gate = self.gate
+        if gate is None:
+            return self.run_detector(frame, pos)
+        if gate.bypass():
+            # The gate costs more than it saves with this detector
+            start = time.perf_counter()
+            result = self.run_detector(frame, pos)
+            gate.record_cost(detector=time.perf_counter() - start)
+            return result
+
+        start = time.perf_counter()
+        result = gate.reuse(frame)
+        gated = time.perf_counter()
+        gate.record_cost(gate=gated - start)
+        if result is None:
+            result = self.run_detector(frame, pos)
+            gate.record_cost(detector=time.perf_counter() - gated)
+            gate.store(result)
+        return result
+
+    def run_detector(self, frame, pos):
+        """
+        Run the configured detector on a frame.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame used for image processing.
+            pos (float): Current altitude or position.
+
+        Returns:
+            DetectionResult: Detector output (nothing drawn).
+        """
+        # Expect the pad where it is tracked, or where it was last seen
+        expected = self.tracker.center if self.tracker is not None else self.last_rectangle_center
+        if self.detector == "cv":
+            return self.image_processing.cv_detect(frame, pos, expected)
+        if self.detector == "cascade":
+            return self.cascade.detect_result(frame, pos, expected)
+        return getattr(self.image_processing, self.DETECTORS[self.detector])(frame)
+
+    def detect(self, frame, pos, annotate=True):
+        """
+        Run the configured detector on a frame.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame used for image processing.
+            pos (float): Current altitude or position.
+            annotate (bool): Whether the annotated frame is needed.
+
+        Returns:
+            tuple: (image center, rectangle center or None, annotated frame or None).
+        """
+        result = self.detect_result(frame, pos)
+        return result.image_center, result.center, self.annotate(result) if annotate else None
+
+    def track(self, frame, pos):
+        """
+        Estimate the pad centre with the tracker, running the detector only when it is due.
+
+        The detector runs on every `detect_every`-th frame, and on any frame where the
+        tracker has no track or its prediction is too uncertain. A track that coasts too long
+        without detection, or out of the frame, is dropped, and the last detected centre is
+        held as without tracker.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame used for image processing.
+            pos (float): Current altitude or position.
+
+        Returns:
+            DetectionResult: Detector output (without detection on skipped frames), with the
+            tracked centre in `tracked`.
+        """
+        # The actions of the previous call were applied since the previous frame.
+        self.tracker.predict(self.actions, pos)
+        height, width = frame.shape[:2]
+        if self.tracker.expire((width, height)) and self.last_detection is not None:
+            self.last_rectangle_center = self.last_detection
+
+        due = self.frame_index % self.detect_every == 0 or self.tracker.uncertainty > self.max_uncertainty
+        self.frame_index += 1
+        if due:
+            self.detector_runs += 1
+            result = self.detect_result(frame, pos)
+            if result.center is not None:
+                self.last_detection = result.center
+                self.tracker.update(result.center)
         else:
-            # Reduce throttle smoothly to avoid sudden drops.
-            self.landing_throttle = max(0.05, pos / 1.5)
-            return self.landing_throttle
+            result = DetectionResult(frame, [width // 2, height // 2])
+
+        result.tracked = self.tracker.center
+        return result
 
-    def get_control_actions(self, frame, pos):
+    def annotate(self, result):
+        """
+        Render a detection result.
+
+        Returns:
+            numpy.ndarray: Annotated BGR copy of the frame.
+        """
+        with self.instrumentation.span("annotate"):
+            if self.detector == "yolo" and self.image_processing.yolo_plot and result.raw:
+                return result.raw[0].plot()
+            return self.image_processing.annotator.render(result)
+
+    def get_control_actions(self, frame, pos, annotate=True):
         """
         Process an image frame to calculate control actions.
 
         Args:
-            frame (numpy.ndarray): Camera frame used for image processing.
+            frame (numpy.ndarray or IngestedFrame): Camera frame used for image processing.
             pos (float): Current altitude or position.
+            annotate (bool): Whether the annotated frame is needed; nothing is drawn when it is not.
 
         Returns:
-            tuple: (control actions, annotated frame with visual indicators).
+            tuple: (control actions, annotated frame with visual indicators, or None).
         """
-        image_center, rectangle_center, annotated_frame = self.image_processing.cv_detection(frame)
-        # Alternative detection methods (uncomment if needed):
-        # image_center, rectangle_center, annotated_frame = self.image_processing.tes_detection(frame)
-        # image_center, rectangle_center, annotated_frame = self.image_processing.Yolo_detection(frame)
+        with self.instrumentation.span("detect"):
+            result = self.track(frame, pos) if self.tracker is not None else self.detect_result(frame, pos)
+        # Kept for consumers that render it later or inspect the detection
+        self.result = result
+
+        # Detected (or tracked) pad centre of this frame, before falling back on the last one
+        rectangle_center = result.tracked if self.tracker is not None else result.center
+        self.detection = rectangle_center
+        with self.instrumentation.span("control"):
+            actions = self.compute_actions(result.image_center, rectangle_center, pos)
+        return actions, self.annotate(result) if annotate else None
 
+    def compute_actions(self, image_center, rectangle_center, pos):
+        """
+        Turn a detection into control actions.
+
+        Args:
+            image_center (list): [x, y] center of the image.
+            rectangle_center (list or None): [x, y] center of the detected pad, or None.
+            pos (float): Current altitude or position.
+
+        Returns:
+            list: Control actions [roll, pitch, yaw, throttle].
+        """
         # Adjust throttle based on altitude.
         throttle_land = self.throttle_control(pos)
 
@@ -155,4 +372,4 @@ class Control:
             # Maintain exploration throttle when not in landing mode.
             self.actions = [0.0, 0.0, 0.0, self.exploration_throttle]
 
-        return self.actions, annotated_frame
+        return self.actions
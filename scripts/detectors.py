@@ -0,0 +1,81 @@
+import threading
+
+# Detector backends are loaded on first use and shared by every user in the process,
+# so importing this module (or `image_processing`) costs only OpenCV and NumPy.
+
+_loaders = {}
+_backends = {}
+_lock = threading.Lock()
+
+
+def register_backend(name, loader):
+    """
+    Register a detector backend.
+
+    Args:
+        name (str): Backend name, e.g. "yolo".
+        loader (callable): Called with the backend options on first use; returns the backend object.
+    """
+    _loaders[name] = loader
+
+
+def get_backend(name, **options):
+    """
+    Return the shared backend instance, loading it on first use.
+
+    Args:
+        name (str): Registered backend name.
+        **options: Loader options (e.g. `model_path`). Each distinct set of options is loaded once.
+
+    Returns:
+        object: The loaded backend.
+    """
+    key = (name, tuple(sorted(options.items())))
+    backend = _backends.get(key)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(key)
+            if backend is None:
+                if name not in _loaders:
+                    raise KeyError(f"Unknown detector backend '{name}'. Available: {sorted(_loaders)}")
+                backend = _loaders[name](**options)
+                _backends[key] = backend
+    return backend
+
+
+def loaded_backends():
+    """
+    Returns:
+        list: Names of the backends loaded so far.
+    """
+    return sorted({name for name, _ in _backends})
+
+
+def _load_yolo(model_path="./models/landing_pad.pt"):
+    from ultralytics import YOLO
+
+    return YOLO(model_path)
+
+
+def _load_yolo_onnx(model_path="./models/landing_pad.pt"):
+    from yolo_onnx import OnnxYolo
+
+    return OnnxYolo(model_path)
+
+
+def _load_tesseract():
+    import pytesseract
+
+    return pytesseract
+
+
+def _load_ocr_engine(whitelist="H"):
+    from ocr_engine import load_engine
+
+    return load_engine(whitelist)
+
+
+register_backend("yolo", _load_yolo)
+register_backend("yolo_onnx", _load_yolo_onnx)
+register_backend("tesseract", _load_tesseract)
+register_backend("ocr_engine", _load_ocr_engine)
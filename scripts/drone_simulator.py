@@ -0,0 +1,218 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+
+class KinematicDroneSimulator:
+    """
+    Pure NumPy/OpenCV stand-in for `UnityEnvironmentWrapper`.
+
+    Models a drone with first-order velocity response above a flat ground with a blue
+    landing pad at the origin, and renders the downward camera view. `reset`, `step` and
+    `close` follow the Unity wrapper: observations are `[image, position]` where `image`
+    is a CHW uint8 RGB array and `position[1]` is the height.
+
+    Actions are `[roll, pitch, yaw, throttle]`: roll moves the drone towards the right of
+    the image, pitch towards the top, yaw turns it and throttle climbs (negative descends).
+    """
+
+    def __init__(self, pad_image="./landing_pad_images/landing_pad.png", image_size=(480, 640), fov_deg=90.0,
+                 pad_size=2.0, dt=0.05, max_speed=2.0, max_climb_rate=1.5, max_yaw_rate=1.0, response_time=0.2,
+                 start_height=(2.0, 5.0), start_offset=1.5, landing_height=0.1, max_height=20.0, max_steps=2000,
+                 seed=None):
+        """
+        Args:
+            pad_image (str): Picture of the landing pad (BGR file).
+            image_size (tuple): (height, width) of the camera image.
+            fov_deg (float): Horizontal field of view of the camera.
+            pad_size (float): Side length of the landing pad in metres.
+            dt (float): Simulated seconds per step.
+            max_speed (float): Horizontal speed at full roll/pitch command, in m/s.
+            max_climb_rate (float): Vertical speed at full throttle, in m/s.
+            max_yaw_rate (float): Yaw rate at full yaw command, in rad/s.
+            response_time (float): Time constant of the velocity response, in seconds.
+            start_height (tuple): Range of the initial height, in metres.
+            start_offset (float): Maximum initial horizontal distance from the pad on each axis, in metres.
+            landing_height (float): Height at which the episode ends with a landing.
+            max_height (float): Height at which the episode ends as a fly-away.
+            max_steps (int): Steps before the episode times out.
+            seed (int or None): Seed of the initial state generator.
+        """
+        pad = cv2.imread(str(pad_image))
+        if pad is None:
+            raise FileNotFoundError(f"Landing pad image '{pad_image}' not found!")
+        self.pad = cv2.cvtColor(pad, cv2.COLOR_BGR2RGB)
+
+        self.image_size = image_size
+        self.focal = image_size[1] / (2 * np.tan(np.radians(fov_deg) / 2))
+        self.pad_size = pad_size
+        self.dt = dt
+        self.max_speed = max_speed
+        self.max_climb_rate = max_climb_rate
+        self.max_yaw_rate = max_yaw_rate
+        self.response_time = response_time
+        self.start_height = start_height
+        self.start_offset = start_offset
+        self.landing_height = landing_height
+        self.max_height = max_height
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        height, width = image_size
+        self.ground = np.empty((height, width, 3), np.uint8)
+        self.ground[:] = (70, 110, 60)  # Grass (RGB)
+        self.image = np.empty_like(self.ground)
+
+        self.position = np.zeros(3)  # [x, height, z]; x to the image right, z to the image top
+        self.velocity = np.zeros(3)
+        self.yaw = 0.0
+        self.steps = 0
+
+    @property
+    def command_gain(self):
+        """
+        float: Image motion of the pad at a full roll/pitch command, in pixels per step at 1 m altitude.
+        """
+        return self.focal * self.max_speed * self.dt
+
+    def seed(self, seed):
+        """
+        Reseed the generator of initial states, e.g. to give an episode a reproducible start.
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def reset(self):
+        """
+        Start a new episode at a random position above and around the pad.
+
+        Returns:
+            list: Initial observation [image, position].
+        """
+        self.position = np.array([
+            self.rng.uniform(-self.start_offset, self.start_offset),
+            self.rng.uniform(*self.start_height),
+            self.rng.uniform(-self.start_offset, self.start_offset),
+        ])
+        self.velocity = np.zeros(3)
+        self.yaw = 0.0
+        self.steps = 0
+        return self.observation()
+
+    def step(self, action):
+        """
+        Advance the simulation by `dt`.
+
+        Args:
+            action (list): [roll, pitch, yaw, throttle], each clipped to [-1, 1].
+
+        Returns:
+            tuple: (observation, reward, done, info). `info` reports whether the drone
+            `landed` and its horizontal `offset` from the pad center in metres.
+        """
+        roll, pitch, yaw, throttle = np.clip(np.asarray(action, dtype=float), -1.0, 1.0)
+
+        # Body-frame commands rotated into the world frame by the current yaw
+        cos_yaw, sin_yaw = np.cos(self.yaw), np.sin(self.yaw)
+        target = np.array([
+            self.max_speed * (roll * cos_yaw - pitch * sin_yaw),
+            self.max_climb_rate * throttle,
+            self.max_speed * (roll * sin_yaw + pitch * cos_yaw),
+        ])
+        self.velocity += (target - self.velocity) * min(1.0, self.dt / self.response_time)
+        self.position += self.velocity * self.dt
+        self.position[1] = max(0.0, self.position[1])
+        self.yaw += self.max_yaw_rate * yaw * self.dt
+        self.steps += 1
+
+        offset = float(np.hypot(self.position[0], self.position[2]))
+        landed = self.position[1] <= self.landing_height
+        done = landed or self.position[1] >= self.max_height or self.steps >= self.max_steps
+        reward = -offset if landed else 0.0
+        info = {"landed": bool(landed), "offset": offset, "steps": self.steps, "time": self.steps * self.dt}
+        return self.observation(), reward, done, info
+
+    def observation(self):
+        """
+        Returns:
+            list: [CHW uint8 RGB camera image, position vector (index 1 is the height)]. Like
+            Unity's, the image is a new array that later steps do not overwrite.
+        """
+        return [np.ascontiguousarray(self.render().transpose(2, 0, 1)), self.position.copy()]
+
+    def render(self):
+        """
+        Render the downward camera view (HWC RGB).
+        """
+        height, width = self.image_size
+        np.copyto(self.image, self.ground)
+
+        # Pad pixels per metre at the current height; the pad is centred at the world origin
+        altitude = max(self.position[1], 1e-3)
+        scale = self.focal / altitude
+        side = self.pad.shape[0]
+        pixels = self.pad_size * scale / side
+        cos_yaw, sin_yaw = np.cos(self.yaw), np.sin(self.yaw)
+
+        # Pad center relative to the drone, in the camera frame (x right, y down)
+        dx, dz = -self.position[0], -self.position[2]
+        u = width / 2 + scale * (dx * cos_yaw + dz * sin_yaw)
+        v = height / 2 - scale * (-dx * sin_yaw + dz * cos_yaw)
+
+        # Map pad pixels to image pixels: scale, rotate by -yaw, translate to (u, v)
+        matrix = np.array([
+            [pixels * cos_yaw, -pixels * sin_yaw, 0.0],
+            [pixels * sin_yaw, pixels * cos_yaw, 0.0],
+        ])
+        matrix[:, 2] = (u, v) - matrix[:, :2] @ (side / 2, side / 2)
+        cv2.warpAffine(self.pad, matrix, (width, height), dst=self.image,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_TRANSPARENT)
+        return self.image
+
+    def close(self):
+        """
+        Nothing to release; kept for interface compatibility.
+        """
+
+
+if __name__ == "__main__":
+    from control_actions import Control
+    from frame_ingest import FrameIngest
+
+    parser = argparse.ArgumentParser(description="Run closed-loop landings in the kinematic simulator.")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--track", action="store_true", help="Follow the pad with the Kalman tracker.")
+    parser.add_argument("--detect-every", type=int, default=1, help="Run the detector every N frames when tracking.")
+    parser.add_argument("--gate", action="store_true",
+                        help="Reuse the last detection on near-identical frames (pays off with expensive detectors).")
+    parser.add_argument("--gate-threshold", type=float, default=3.0, help="Largest frame change reusing a detection.")
+    parser.add_argument("--gate-max-age", type=int, default=10, help="Frames after which a detection is forced.")
+    args = parser.parse_args()
+
+    env = KinematicDroneSimulator(seed=args.seed)
+    ingest = FrameIngest()
+    landed, offsets, sim_time, steps, detections = 0, [], 0.0, 0, 0
+    start = time.perf_counter()
+    for _ in range(args.episodes):
+        control = Control(track=args.track, detect_every=args.detect_every, command_gain=env.command_gain,
+                          gate=args.gate, gate_threshold=args.gate_threshold, gate_max_age=args.gate_max_age)
+        observation, done = env.reset(), False
+        while not done:
+            frame = ingest.ingest(observation[0])
+            actions, _ = control.get_control_actions(frame, observation[1][1], annotate=False)
+            observation, reward, done, info = env.step(actions)
+        landed += info["landed"]
+        offsets.append(info["offset"])
+        sim_time += info["time"]
+        steps += info["steps"]
+        if args.gate:
+            detections += control.gate.misses + control.gate.bypassed
+        else:
+            detections += control.detector_runs if args.track else info["steps"]
+    elapsed = time.perf_counter() - start
+
+    print(f"Episodes: {args.episodes}, landed: {landed}, mean final offset: {np.mean(offsets):.2f} m")
+    print(f"Steps: {steps} in {elapsed:.1f} s ({steps / elapsed:.0f} steps/s, "
+          f"x{sim_time / elapsed:.0f} real time), detector on {100 * detections / steps:.0f}% of the frames")
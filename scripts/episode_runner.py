@@ -0,0 +1,214 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+class UnityFactory:
+    """
+    Builds one Unity environment per worker, each on its own port.
+    """
+
+    def __init__(self, env_path, base_port=None, no_graphics=True):
+        """
+        Args:
+            env_path (str): Path to the Unity environment application.
+            base_port (int or None): Port of worker 0; worker k uses `base_port + k`.
+            no_graphics (bool): Do not render the main window (camera observations still are).
+        """
+        self.env_path = env_path
+        self.base_port = base_port
+        self.no_graphics = no_graphics
+
+    def __call__(self, worker):
+        from simulation import UnityEnvironmentWrapper
+
+        return UnityEnvironmentWrapper(self.env_path, worker_id=worker, base_port=self.base_port,
+                                       no_graphics=self.no_graphics)
+
+
+class KinematicFactory:
+    """
+    Builds one kinematic simulator per worker.
+    """
+
+    def __init__(self, **options):
+        """
+        Args:
+            **options: `KinematicDroneSimulator` arguments.
+        """
+        self.options = options
+
+    def __call__(self, worker):
+        from drone_simulator import KinematicDroneSimulator
+
+        return KinematicDroneSimulator(**self.options)
+
+
+def run_episode(env, control, max_steps=None, landing_height=0.1, dt=None):
+    """
+    Fly one episode.
+
+    Environments that report `landed` and `offset` in their step info (like
+    `KinematicDroneSimulator`) are trusted; otherwise the drone has landed if the episode
+    ends below `landing_height`, and the offset is measured from the origin of the position
+    observation.
+
+    Args:
+        env (object): Environment with the `UnityEnvironmentWrapper` interface.
+        control (Control): Controller of the episode.
+        max_steps (int or None): Steps after which the episode is abandoned.
+        landing_height (float): Height below which an episode without `landed` info counts as landed.
+        dt (float or None): Simulated seconds per step (None: measure wall-clock time).
+
+    Returns:
+        dict: landed, steps, time_to_land (seconds, or None) and offset (metres).
+    """
+    from frame_ingest import FrameIngest
+
+    ingest = FrameIngest()
+    observation, done, info, steps = env.reset(), False, {}, 0
+    start = time.perf_counter()
+    while not done and (max_steps is None or steps < max_steps):
+        frame = ingest.ingest(observation[0])
+        actions, _ = control.get_control_actions(frame, observation[1][1], annotate=False)
+        observation, reward, done, info = env.step(actions)
+        steps += 1
+    elapsed = steps * dt if dt is not None else time.perf_counter() - start
+
+    position = np.asarray(observation[1], dtype=float)
+    landed = bool(info["landed"]) if "landed" in info else bool(done and position[1] <= landing_height)
+    offset = float(info["offset"]) if "offset" in info else float(np.hypot(position[0], position[2]))
+    return {"landed": landed, "steps": steps, "time_to_land": elapsed if landed else None, "offset": offset}
+
+
+def run_worker(env_factory, worker, episodes, control_options, max_steps, seed):
+    """
+    Worker process: build an environment and fly the given episodes with a fresh `Control` each.
+
+    Returns:
+        list: One result dict per episode.
+    """
+    import cv2
+    from control_actions import Control
+
+    # Parallelism comes from the processes; keep OpenCV to one thread each
+    cv2.setNumThreads(1)
+    env = env_factory(worker)
+    results = []
+    try:
+        for episode in episodes:
+            if hasattr(env, "seed"):
+                # Reproducible starts, whatever the number of workers
+                env.seed(seed + episode)
+            control = Control(**control_options)
+            start = time.perf_counter()
+            result = run_episode(env, control, max_steps, dt=getattr(env, "dt", None))
+            result.update(episode=episode, worker=worker, wall_seconds=time.perf_counter() - start)
+            results.append(result)
+    finally:
+        env.close()
+    return results
+
+
+def summarize(results, elapsed):
+    """
+    Aggregate episode results.
+
+    Returns:
+        dict: Success rate, time-to-land and final offset statistics, and throughput.
+    """
+    landed = [r for r in results if r["landed"]]
+    times = np.array([r["time_to_land"] for r in landed])
+    offsets = np.array([r["offset"] for r in results])
+    steps = sum(r["steps"] for r in results)
+
+    def stats(values):
+        if not len(values):
+            return None
+        return {"mean": float(values.mean()), "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)), "max": float(values.max())}
+
+    return {
+        "episodes": len(results),
+        "success_rate": len(landed) / len(results) if results else None,
+        "time_to_land_s": stats(times),
+        "final_offset_m": stats(offsets),
+        "landed_offset_m": stats(np.array([r["offset"] for r in landed])),
+        "steps": steps,
+        "wall_seconds": elapsed,
+        "episodes_per_second": len(results) / elapsed if elapsed > 0 else None,
+        "steps_per_second": steps / elapsed if elapsed > 0 else None,
+    }
+
+
+def run_episodes(env_factory, episodes, workers=None, control_options=None, max_steps=None, seed=0):
+    """
+    Fly episodes on several environments at once, one process per environment.
+
+    Args:
+        env_factory (callable): Picklable `factory(worker_index)` returning an environment with the
+            `UnityEnvironmentWrapper` interface (e.g. `UnityFactory`, `KinematicFactory`).
+        episodes (int): Number of episodes.
+        workers (int or None): Number of environments and processes (default: one per core).
+        control_options (dict or None): `Control` arguments.
+        max_steps (int or None): Steps after which an episode is abandoned.
+        seed (int): Seed of episode 0 for environments with a `seed` method; episode i uses `seed + i`.
+
+    Returns:
+        tuple: (summary dict, list of per-episode results sorted by episode).
+    """
+    workers = min(workers or os.cpu_count() or 1, episodes)
+    control_options = control_options or {}
+    # Spawned workers start without the parent's OpenCV threads and Unity sockets
+    context = multiprocessing.get_context("spawn")
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(run_worker, env_factory, worker, range(worker, episodes, workers), control_options,
+                            max_steps, seed)
+            for worker in range(workers)
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: r["episode"])
+    return summarize(results, elapsed), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fly landing episodes on several environments in parallel.")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--workers", type=int, help="Parallel environments (default: one per core).")
+    parser.add_argument("--env", help="Path to the Unity simulation build (default: the kinematic simulator).")
+    parser.add_argument("--base-port", type=int, help="Port of the first Unity environment.")
+    parser.add_argument("--graphics", action="store_true", help="Render the Unity windows.")
+    parser.add_argument("--detector", default="cv", help="Landing pad detector.")
+    parser.add_argument("--track", action="store_true", help="Follow the pad with the Kalman tracker.")
+    parser.add_argument("--detect-every", type=int, default=1, help="With --track, run the detector every N frames.")
+    parser.add_argument("--max-steps", type=int, help="Abandon episodes after this many steps.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the summary and the episodes to this JSON file.")
+    args = parser.parse_args()
+
+    if args.env:
+        factory = UnityFactory(args.env, base_port=args.base_port, no_graphics=not args.graphics)
+        control_options = {}
+    else:
+        factory = KinematicFactory()
+        control_options = {"command_gain": KinematicFactory()(0).command_gain}
+    control_options.update(detector=args.detector, track=args.track, detect_every=args.detect_every)
+
+    summary, results = run_episodes(factory, args.episodes, args.workers, control_options, args.max_steps,
+                                    args.seed)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "episodes": results}, f, indent=2)
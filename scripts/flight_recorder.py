@@ -0,0 +1,319 @@
+import argparse
+import mmap
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import cv2
+import numpy as np
+from frame_ingest import IngestedFrame
+
+MAGIC = b"DRONELOG"
+VERSION = 2
+CHUNK_MAGIC = b"CHNK"
+# Magic, version, frames per chunk, frame height, frame width
+FILE_HEADER = struct.Struct("<8sIIII")
+# Magic, number of records in the chunk, size of the compressed frames
+CHUNK_HEADER = struct.Struct("<4sII")
+
+# One record per control step; `source` is the frame the applied actions were computed from
+RECORD_DTYPE = np.dtype([
+    ("index", "<i8"),
+    ("time", "<f8"),
+    ("height", "<f4"),
+    ("detection", "<i4", (2,)),  # [-1, -1] when the pad was not detected
+    ("actions", "<f4", (4,)),
+    ("source", "<i8"),
+])
+
+
+class FlightRecorder:
+    """
+    Append-only binary log of a flight, written by a background thread.
+
+    The file is a header followed by chunks of `chunk_frames` steps. A chunk holds the
+    records of its steps (`RECORD_DTYPE`) and then their camera frames as HWC RGB,
+    zlib-compressed as one stream per chunk. The control loop only copies the frame into a
+    pooled buffer; the conversion, compression and writes happen on the writer thread. The
+    pool holds as many frames as fit in `pool_bytes`. When the writer falls behind and the
+    pool is empty, steps are dropped (and counted) rather than delaying the loop.
+    """
+
+    def __init__(self, path, chunk_frames=64, pool_bytes=64 * 2 ** 20, level=1):
+        """
+        Args:
+            path (str): Output file (overwritten).
+            chunk_frames (int): Steps per chunk.
+            pool_bytes (int): Memory for the frames waiting for the writer, in bytes (at least
+                two frames are pooled).
+            level (int): zlib compression level of the frames.
+        """
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.pool_bytes = pool_bytes
+        self.pool_size = None  # Pooled frames, set by `start`
+        self.level = level
+        self.file = open(path, "wb")
+        self.frame_shape = None
+        self.frame_bytes = 0  # Uncompressed size of the frames written
+        self.written_bytes = 0  # Compressed size of the frames written
+        self.pool = queue.SimpleQueue()
+        self.pending = queue.Queue()
+        self.recorded = 0
+        self.dropped = 0
+        self.thread = None
+
+    def start(self, height, width):
+        """
+        Write the header and start the writer for frames of the given size.
+        """
+        self.frame_shape = (height, width)
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, self.chunk_frames, height, width))
+        self.pool_size = max(2, self.pool_bytes // (height * width * 4))
+        for _ in range(self.pool_size):
+            self.pool.put(np.empty((height, width, 4), np.uint8))
+        self.thread = threading.Thread(target=self._write, name="flight-recorder", daemon=True)
+        self.thread.start()
+
+    def record(self, index, frame, height, detection, actions, source=None):
+        """
+        Queue one control step. Never blocks.
+
+        Args:
+            index (int): Step index.
+            frame (IngestedFrame): Camera frame observed at this step.
+            height (float): Altitude at this step.
+            detection (list or None): Detected [x, y] pad centre, or None.
+            actions (list): [roll, pitch, yaw, throttle] applied at this step.
+            source (int or None): Step whose frame the actions were computed from (default: `index`).
+        """
+        if self.thread is None:
+            self.start(*frame.shape[:2])
+        if frame.shape[:2] != self.frame_shape:
+            raise ValueError(f"Frame size {frame.shape[:2]} differs from the recorded size {self.frame_shape}.")
+        try:
+            buffer = self.pool.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        np.copyto(buffer, frame.rgbx)
+        record = (index, time.time(), height, detection if detection is not None else (-1, -1), actions,
+                  index if source is None else source)
+        self.pending.put((record, buffer))
+
+    def _write(self):
+        height, width = self.frame_shape
+        records = np.zeros(self.chunk_frames, RECORD_DTYPE)
+        rgb = np.empty((height, width, 3), np.uint8)
+        compressor, compressed = zlib.compressobj(self.level), []
+        count = 0
+        while True:
+            item = self.pending.get()
+            if item is not None:
+                record, buffer = item
+                records[count] = record
+                cv2.cvtColor(buffer, cv2.COLOR_RGBA2RGB, dst=rgb)
+                self.pool.put(buffer)
+                # Frames are compressed as they arrive, not all at the end of the chunk
+                compressed.append(compressor.compress(rgb))
+                count += 1
+            if count and (count == self.chunk_frames or item is None):
+                compressed.append(compressor.flush())
+                frames = b"".join(compressed)
+                # One write per chunk; a chunk cut short by a crash is ignored when reading
+                self.file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, count, len(frames)))
+                self.file.write(records[:count].tobytes())
+                self.file.write(frames)
+                self.recorded += count
+                self.frame_bytes += rgb.nbytes * count
+                self.written_bytes += len(frames)
+                compressor, compressed = zlib.compressobj(self.level), []
+                count = 0
+            if item is None:
+                self.file.flush()
+                return
+
+    def close(self):
+        """
+        Write the last, possibly partial, chunk and close the file.
+        """
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join()
+            self.thread = None
+        self.file.close()
+        ratio = f", frames compressed x{self.frame_bytes / self.written_bytes:.1f}" if self.written_bytes else ""
+        print(f"Flight recorder: {self.recorded} steps written to {self.path}, {self.dropped} dropped{ratio}")
+
+
+class FlightLog:
+    """
+    Memory-mapped reader of a `FlightRecorder` file, with random access to every step.
+
+    Records are zero-copy views into the mapping. Frames are decompressed a chunk at a
+    time, and the last chunk read is kept, so reading the steps in order decompresses each
+    chunk once.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Log file.
+        """
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.chunk_frames, height, width = FILE_HEADER.unpack_from(self.mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a version {VERSION} flight log.")
+        self.frame_shape = (height, width, 3)
+
+        # Index the chunks: (first step, records view, compressed frames view)
+        self.chunks = []
+        self.length = 0
+        self._cached = (None, None)  # (chunk, decompressed frames) of the last chunk read
+        offset = FILE_HEADER.size
+        while offset + CHUNK_HEADER.size <= len(self.mmap):
+            magic, count, size = CHUNK_HEADER.unpack_from(self.mmap, offset)
+            offset += CHUNK_HEADER.size
+            frames_offset = offset + count * RECORD_DTYPE.itemsize
+            end = frames_offset + size
+            if magic != CHUNK_MAGIC or end > len(self.mmap):
+                break  # Truncated tail
+            records = np.frombuffer(self.mmap, RECORD_DTYPE, count, offset)
+            self.chunks.append((self.length, records, memoryview(self.mmap)[frames_offset:end]))
+            self.length += count
+            offset = end
+
+    def __len__(self):
+        return self.length
+
+    def locate(self, index):
+        if not 0 <= index < self.length:
+            raise IndexError(f"Step {index} out of range (log has {self.length} steps).")
+        # Every chunk but the last is full
+        chunk = min(index // self.chunk_frames, len(self.chunks) - 1)
+        return chunk, index - self.chunks[chunk][0]
+
+    def frames(self, chunk):
+        """
+        Returns:
+            numpy.ndarray: Read-only (count, height, width, 3) RGB camera frames of a chunk.
+        """
+        if self._cached[0] != chunk:
+            _, records, compressed = self.chunks[chunk]
+            frames = np.frombuffer(zlib.decompress(compressed), np.uint8)
+            self._cached = (chunk, frames.reshape((len(records),) + self.frame_shape))
+        return self._cached[1]
+
+    def record(self, index):
+        """
+        Returns:
+            numpy.void: Record of a step (`RECORD_DTYPE`).
+        """
+        chunk, i = self.locate(index)
+        return self.chunks[chunk][1][i]
+
+    def frame(self, index):
+        """
+        Returns:
+            numpy.ndarray: Read-only (height, width, 3) RGB camera frame of a step.
+        """
+        chunk, i = self.locate(index)
+        return self.frames(chunk)[i]
+
+    @property
+    def records(self):
+        """
+        numpy.ndarray: Records of all steps (a copy).
+        """
+        if not self.chunks:
+            return np.zeros(0, RECORD_DTYPE)
+        return np.concatenate([records for _, records, _ in self.chunks])
+
+    def __iter__(self):
+        for chunk, (_, records, _) in enumerate(self.chunks):
+            yield from zip(records, self.frames(chunk))
+
+    def close(self):
+        self.chunks = []
+        self._cached = (None, None)
+        try:
+            self.mmap.close()
+        except BufferError:
+            pass  # Frames or records are still referenced; the mapping goes away with them
+
+
+def replay(log, control, start=0, stop=None):
+    """
+    Re-run a controller over recorded frames, without the simulation.
+
+    Args:
+        log (FlightLog): Recorded flight.
+        control (Control): Controller (any detector and configuration).
+        start (int): First step.
+        stop (int or None): Step after the last one (default: the end of the log).
+
+    Returns:
+        dict: Steps replayed, replay speed relative to the recording, agreement of the
+        detections and mean difference of the actions with the recorded ones.
+    """
+    stop = len(log) if stop is None else min(stop, len(log))
+    frame = IngestedFrame()
+    same_detection, action_error = 0, 0.0
+    begin = time.perf_counter()
+    for index in range(start, stop):
+        record = log.record(index)
+        actions, _ = control.get_control_actions(frame.load_rgb(log.frame(index)), float(record["height"]),
+                                                 annotate=False)
+        recorded = record["detection"]
+        detection = control.detection
+        same_detection += (detection is None) == (recorded[0] < 0) and (
+            detection is None or np.hypot(*(np.asarray(detection) - recorded)) <= 2)
+        action_error += float(np.abs(np.asarray(actions, np.float32) - record["actions"]).mean())
+    elapsed = time.perf_counter() - begin
+
+    steps = stop - start
+    recorded_time = float(log.record(stop - 1)["time"] - log.record(start)["time"]) if steps > 1 else 0.0
+    return {
+        "steps": steps,
+        "seconds": elapsed,
+        "speedup": recorded_time / elapsed if elapsed > 0 else None,
+        "detection_agreement": same_detection / steps if steps else None,
+        "mean_action_difference": action_error / steps if steps else None,
+    }
+
+
+if __name__ == "__main__":
+    from control_actions import Control
+
+    parser = argparse.ArgumentParser(description="Inspect or replay a recorded flight.")
+    parser.add_argument("log", help="Flight log written by main.py --record.")
+    parser.add_argument("--detector", choices=sorted(Control.DETECTORS), default="cv",
+                        help="Detector to replay the flight with.")
+    parser.add_argument("--track", action="store_true", help="Replay with the Kalman tracker.")
+    parser.add_argument("--detect-every", type=int, default=1, help="With --track, run the detector every N frames.")
+    parser.add_argument("--start", type=int, default=0, help="First step to replay.")
+    parser.add_argument("--stop", type=int, help="Step after the last one to replay.")
+    parser.add_argument("--export-frame", type=int, metavar="STEP", help="Write the frame of a step to frame_<STEP>.png.")
+    args = parser.parse_args()
+
+    log = FlightLog(args.log)
+    print(f"{args.log}: {len(log)} steps of {log.frame_shape[1]}x{log.frame_shape[0]} frames "
+          f"in {len(log.chunks)} chunks")
+
+    if args.export_frame is not None:
+        path = f"frame_{args.export_frame}.png"
+        cv2.imwrite(path, cv2.cvtColor(log.frame(args.export_frame), cv2.COLOR_RGB2BGR))
+        print(f"Step {args.export_frame}: {log.record(args.export_frame)}, frame written to {path}")
+    else:
+        control = Control(detector=args.detector, track=args.track, detect_every=args.detect_every)
+        result = replay(log, control, args.start, args.stop)
+        print(f"Replayed {result['steps']} steps in {result['seconds']:.2f} s "
+              f"(x{result['speedup'] or 0:.0f} real time), detections matching the recording: "
+              f"{100 * result['detection_agreement']:.1f}%, "
+              f"mean action difference: {result['mean_action_difference']:.4f}")
+    log.close()
@@ -0,0 +1,191 @@
+import cv2
+import numpy as np
+from annotation import Detection, DetectionResult
+from frame_ingest import IngestedFrame
+
+
+class FrameGate:
+    """
+    Reuses the last detection on frames that barely changed since it was made.
+
+    Each frame is reduced to a small grayscale thumbnail. It is compared with the thumbnail
+    of the frame the cached detection was made on: the image translation between the two is
+    estimated by phase correlation, and the change is the mean absolute difference left
+    once the translation is compensated. When the change is below `threshold` and the cached
+    detection is younger than `max_age` frames, the detection is reused, shifted by the
+    translation; otherwise the detector runs and its result becomes the new cache.
+
+    The gate itself costs a few tenths of a millisecond per frame, more than a cheap
+    detector such as the OpenCV one saves on its hits. The caller reports the measured
+    costs (`record_cost`), and `bypass` then tells it to skip the gate unless the expected
+    saving (hit rate times detector cost) exceeds the gate's own cost by `margin`, with a
+    probe every `probe_every` frames in case the detector becomes slower. The cache is not
+    refreshed while bypassed, so it is dropped, and a probe gates two frames: the first
+    takes a fresh reference, the second can reuse it.
+    """
+
+    def __init__(self, threshold=3.0, max_age=10, size=(64, 48), probe_every=50, min_samples=20,
+                 margin=1.5):
+        """
+        Args:
+            threshold (float): Largest change (mean absolute grey-level difference) at which the
+                cached detection is reused.
+            max_age (int): Frames after which a detection is forced, however still the scene.
+            size (tuple): (width, height) of the thumbnails.
+            probe_every (int): While bypassed, use the gate anyway on two frames after every
+                `probe_every` bypassed ones.
+            min_samples (int): Gated frames measured before the gate may be bypassed.
+            margin (float): Factor by which the expected saving must exceed the gate's cost.
+        """
+        self.threshold = threshold
+        self.max_age = max_age
+        self.size = size
+        self.window = cv2.createHanningWindow(size, cv2.CV_32F)
+
+        self.reference = None  # Thumbnail of the frame the cached detection was made on
+        self.cached = None  # That detection (Detection or None)
+        self.age = 0
+        self.thumbnail = None  # Thumbnail of the current frame
+        self.change = None  # Change of the current frame
+        self.hits = 0
+        self.misses = 0
+        self.forced = 0  # Misses due to the age of the cache
+        self.probe_every = probe_every
+        self.min_samples = min_samples
+        self.margin = margin
+        self.cost = None  # Moving average of the time spent in `reuse`, in seconds
+        self.detector_cost = None  # Moving average of the detector time, in seconds
+        self.bypassed = 0  # Frames on which the gate was skipped
+        self._since_probe = 0
+
+    def make_thumbnail(self, frame):
+        """
+        Returns:
+            numpy.ndarray: (height, width) float32 grayscale thumbnail of a frame.
+        """
+        if isinstance(frame, IngestedFrame):
+            gray = cv2.cvtColor(frame.rgbx, cv2.COLOR_RGBA2GRAY)
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Averaging (not sampling) keeps a one-pixel camera shift from changing the whole thumbnail
+        gray = cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+        return gray.astype(np.float32)
+
+    def compare(self, thumbnail):
+        """
+        Compare a thumbnail with the reference.
+
+        Returns:
+            tuple: (change, (dx, dy) translation in thumbnail pixels).
+        """
+        # Windowed copies: some OpenCV versions apply the window to the inputs in place
+        (dx, dy), _ = cv2.phaseCorrelate(self.reference * self.window, thumbnail * self.window)
+        width, height = self.size
+        margin_x, margin_y = int(np.ceil(abs(dx))) + 1, int(np.ceil(abs(dy))) + 1
+        if 2 * margin_x >= width or 2 * margin_y >= height:
+            return np.inf, (dx, dy)
+        shifted = cv2.warpAffine(self.reference, np.float32([[1, 0, dx], [0, 1, dy]]), self.size)
+        residual = cv2.absdiff(shifted, thumbnail)[margin_y:height - margin_y, margin_x:width - margin_x]
+        return float(residual.mean()), (dx, dy)
+
+    def reuse(self, frame):
+        """
+        Return the cached detection, shifted, if the frame barely changed.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame.
+
+        Returns:
+            DetectionResult or None: The reused detection, or None if the detector must run
+            (then pass its result to `store`).
+        """
+        self.thumbnail = self.make_thumbnail(frame)
+        self.change = None
+        if self.reference is not None:
+            if self.age >= self.max_age:
+                self.forced += 1
+            else:
+                self.change, (dx, dy) = self.compare(self.thumbnail)
+                if self.change <= self.threshold:
+                    self.hits += 1
+                    self.age += 1
+                    return self.shifted_result(frame, dx, dy)
+        self.misses += 1
+        return None
+
+    def shifted_result(self, frame, dx, dy):
+        """
+        Returns:
+            DetectionResult: The cached detection, moved by a thumbnail translation, on a frame.
+        """
+        height, width = frame.shape[:2]
+        result = DetectionResult(frame, [width // 2, height // 2])
+        cached = self.cached
+        if cached is not None:
+            shift_x, shift_y = int(round(dx * width / self.size[0])), int(round(dy * height / self.size[1]))
+            polygon = None if cached.polygon is None else cached.polygon + np.array([shift_x, shift_y],
+                                                                                     cached.polygon.dtype)
+            bbox = None if cached.bbox is None else (cached.bbox[0] + shift_x, cached.bbox[1] + shift_y) + tuple(
+                cached.bbox[2:])
+            result.detection = Detection([cached.center[0] + shift_x, cached.center[1] + shift_y], cached.source,
+                                         polygon, bbox, cached.confidence, cached.label)
+        return result
+
+    def store(self, result):
+        """
+        Cache the detection made on the frame last passed to `reuse`.
+
+        Args:
+            result (DetectionResult): Detector output on that frame.
+        """
+        self.reference = self.thumbnail
+        self.cached = result.detection
+        self.age = 0
+
+    def record_cost(self, gate=None, detector=None):
+        """
+        Report measured times, in seconds, of one `reuse` call and/or one detector run.
+        """
+        if gate is not None:
+            self.cost = gate if self.cost is None else 0.9 * self.cost + 0.1 * gate
+        if detector is not None:
+            self.detector_cost = detector if self.detector_cost is None else 0.9 * self.detector_cost + 0.1 * detector
+
+    def bypass(self):
+        """
+        Returns:
+            bool: Whether to run the detector without the gate on this frame, because the gate
+            costs more than it is expected to save.
+        """
+        total = self.hits + self.misses
+        if self.cost is None or self.detector_cost is None or total < self.min_samples:
+            return False
+        if self.margin * self.cost < self.hits / total * self.detector_cost:
+            return False
+        self._since_probe += 1
+        if self._since_probe > self.probe_every:
+            if self._since_probe >= self.probe_every + 2:
+                self._since_probe = 0
+            return False
+        # The detections of bypassed frames are not stored: never compare with an older reference
+        self.reset()
+        self.bypassed += 1
+        return True
+
+    def reset(self):
+        """
+        Drop the cached detection.
+        """
+        self.reference = None
+        self.cached = None
+        self.age = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hits, misses (of which forced by age), the hit rate, and frames on which the
+            gate was bypassed.
+        """
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "forced": self.forced,
+                "hit_rate": self.hits / total if total else None, "bypassed": self.bypassed}
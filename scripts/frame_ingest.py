@@ -0,0 +1,156 @@
+import cv2
+import numpy as np
+
+# An RGBX pixel read as a native uint32, with the X byte cleared
+_RGB_MASK = np.array([255, 255, 255, 0], np.uint8).view(np.uint32)[0]
+
+
+class IngestedFrame:
+    """
+    A camera frame held as a contiguous HWC RGBX array in a reused buffer.
+
+    The fourth channel is always zero, so each pixel read as a uint32 is a packed RGB
+    colour index (used by `ColorLUT`); OpenCV colour conversions accept the 4-channel
+    image directly. The BGR copy needed by OpenCV drawing and by the YOLO/OCR detectors
+    is built only when `bgr()` is called, at most once per frame.
+    """
+
+    def __init__(self):
+        self.rgbx = None
+        self._zeros = None
+        self._bgr = None
+        self._bgr_valid = False
+
+    @property
+    def shape(self):
+        return self.rgbx.shape[:2] + (3,)
+
+    def load(self, chw):
+        """
+        Copy a CHW RGB observation into the HWC RGBX buffer (reallocated only if the shape changes).
+
+        Args:
+            chw (numpy.ndarray): (channels, height, width) uint8 image.
+
+        Returns:
+            IngestedFrame: self
+        """
+        self._allocate(*chw.shape[1:])
+
+        # Interleaving the channel planes is much cheaper than copying a transposed view
+        cv2.merge([chw[0], chw[1], chw[2], self._zeros], dst=self.rgbx)
+        self._bgr_valid = False
+        return self
+
+    def load_rgb(self, rgb):
+        """
+        Copy an HWC RGB image (e.g. a recorded frame) into the HWC RGBX buffer.
+
+        Args:
+            rgb (numpy.ndarray): (height, width, 3) uint8 image.
+
+        Returns:
+            IngestedFrame: self
+        """
+        self._allocate(*rgb.shape[:2])
+        cv2.cvtColor(rgb, cv2.COLOR_RGB2RGBA, dst=self.rgbx)
+        # OpenCV sets the alpha channel to 255; clear it in place, one pixel word at a time
+        self.rgbx.view(np.uint32)[...] &= _RGB_MASK
+        self._bgr_valid = False
+        return self
+
+    def attach(self, rgbx):
+        """
+        Use an existing HWC RGBX array (e.g. a shared-memory slot) as the frame, without copying.
+
+        Args:
+            rgbx (numpy.ndarray): (height, width, 4) uint8 image with a zero fourth channel.
+
+        Returns:
+            IngestedFrame: self
+        """
+        if self._bgr is None or self._bgr.shape[:2] != rgbx.shape[:2]:
+            self._bgr = np.empty(rgbx.shape[:2] + (3,), np.uint8)
+        self.rgbx = rgbx
+        self._zeros = None  # The next `load` allocates a buffer of its own
+        self._bgr_valid = False
+        return self
+
+    def _allocate(self, height, width):
+        if self._zeros is None or self._zeros.shape != (height, width):
+            self.rgbx = np.empty((height, width, 4), np.uint8)
+            self._zeros = np.zeros((height, width), np.uint8)
+            self._bgr = np.empty((height, width, 3), np.uint8)
+
+    def bgr(self):
+        """
+        Returns:
+            numpy.ndarray: BGR version of the frame, converted on first use.
+        """
+        if not self._bgr_valid:
+            cv2.cvtColor(self.rgbx, cv2.COLOR_RGBA2BGR, dst=self._bgr)
+            self._bgr_valid = True
+        return self._bgr
+
+
+def to_bgr(frame):
+    """
+    Returns:
+        numpy.ndarray: The BGR image of an `IngestedFrame`, or `frame` itself if it already is one.
+    """
+    return frame.bgr() if isinstance(frame, IngestedFrame) else frame
+
+
+class FrameIngest:
+    """
+    Ring of reusable `IngestedFrame` buffers for the observations of the environment.
+
+    A frame's buffers are reused `slots` frames later, so `slots` must exceed the number
+    of frames that can be in flight at once (e.g. in the pipelined loop).
+    """
+
+    def __init__(self, slots=1):
+        """
+        Args:
+            slots (int): Number of frames kept alive at the same time.
+        """
+        self.frames = [IngestedFrame() for _ in range(slots)]
+        self.index = 0
+
+    def ingest(self, chw):
+        """
+        Load the next observation image into the next buffer in the ring.
+
+        Args:
+            chw (numpy.ndarray): (channels, height, width) uint8 RGB image.
+
+        Returns:
+            IngestedFrame: The loaded frame.
+        """
+        frame = self.frames[self.index]
+        self.index = (self.index + 1) % len(self.frames)
+        return frame.load(chw)
+
+
+class Buffers:
+    """
+    Reusable scratch arrays, looked up by name and shape.
+
+    Arrays are views into one flat allocation per name that only grows, so regions of
+    varying size (e.g. ROI windows) reuse the same memory.
+    """
+
+    def __init__(self):
+        self._storage = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Returns:
+            numpy.ndarray: Contiguous array of the given shape (contents undefined).
+        """
+        size = int(np.prod(shape))
+        storage = self._storage.get(name)
+        if storage is None or storage.size < size or storage.dtype != dtype:
+            storage = np.empty(size, dtype)
+            self._storage[name] = storage
+        return storage[:size].reshape(shape)
@@ -0,0 +1,160 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp"}
+
+
+class Frame:
+    """
+    A benchmark frame and, when known, the true landing pad center.
+    """
+
+    def __init__(self, image, name, center=None):
+        """
+        Args:
+            image (numpy.ndarray): BGR image.
+            name (str): Where the frame came from, e.g. "landing_pad.png/rot30".
+            center (list or None): True [x, y] pad center in image coordinates, if known.
+        """
+        self.image = image
+        self.name = name
+        self.center = center
+
+
+def load_images(directory="./landing_pad_images"):
+    """
+    Load every image in a directory. The pad is assumed to be centred in the picture.
+
+    Returns:
+        list: Frames, with the image center as ground truth.
+    """
+    frames = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        image = cv2.imread(str(path))
+        if image is None:
+            print(f"Warning: could not read image '{path}'.")
+            continue
+        height, width = image.shape[:2]
+        frames.append(Frame(image, path.name, [width // 2, height // 2]))
+    return frames
+
+
+def load_video(path, stride=1, max_frames=None):
+    """
+    Read frames from a video file (ground truth unknown).
+
+    Args:
+        path (str): Video file path.
+        stride (int): Keep one frame out of `stride`.
+        max_frames (int or None): Stop after this many frames.
+
+    Returns:
+        list: Frames.
+    """
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Error: Could not open video '{path}'.")
+
+    frames = []
+    index = 0
+    try:
+        while max_frames is None or len(frames) < max_frames:
+            ret, image = cap.read()
+            if not ret:
+                break
+            if index % stride == 0:
+                frames.append(Frame(image, f"{Path(path).name}#{index}"))
+            index += 1
+    finally:
+        cap.release()
+    return frames
+
+
+def place_on_ground(pad, canvas_size=(480, 640), scale=0.5, angle=0.0, offset=(0.0, 0.0), seed=0):
+    """
+    Render a pad image onto a textured ground, as seen by the downward camera.
+
+    Args:
+        pad (numpy.ndarray): Pad image (BGR).
+        canvas_size (tuple): (height, width) of the output frame.
+        scale (float): Pad side length as a fraction of the frame height.
+        angle (float): Pad rotation in degrees.
+        offset (tuple): Pad center offset from the frame center, as fractions of (width, height).
+        seed (int): Seed of the ground texture.
+
+    Returns:
+        tuple: (frame, [x, y] pad center).
+    """
+    height, width = canvas_size
+    rng = np.random.default_rng(seed)
+    ground = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+    ground[..., 1] += 40  # Greenish ground
+    ground = cv2.GaussianBlur(ground, (5, 5), 0)
+
+    center = [int(width / 2 + offset[0] * width), int(height / 2 + offset[1] * height)]
+    side = max(8, int(scale * height))
+    pad = cv2.resize(pad, (side, side), interpolation=cv2.INTER_AREA)
+
+    # Warp the pad and a coverage mask into the frame in one go
+    matrix = cv2.getRotationMatrix2D((side / 2, side / 2), angle, 1.0)
+    matrix[:, 2] += (center[0] - side / 2, center[1] - side / 2)
+    warped = cv2.warpAffine(pad, matrix, (width, height), flags=cv2.INTER_LINEAR)
+    mask = cv2.warpAffine(np.full((side, side), 255, np.uint8), matrix, (width, height), flags=cv2.INTER_NEAREST)
+
+    frame = np.where(mask[..., None] > 0, warped, ground)
+    return frame, center
+
+
+def adjust_lighting(image, gain=1.0, bias=0.0):
+    """
+    Apply a brightness/contrast change: gain * image + bias, saturated to uint8.
+    """
+    return cv2.convertScaleAbs(image, alpha=gain, beta=bias)
+
+
+def augment(frames, scales=(0.3, 0.6, 0.9), angles=(0, 30), blurs=(0, 5), lighting=((1.0, 0), (0.6, -20), (1.3, 20))):
+    """
+    Build synthetic variants of each frame: the pad placed on the ground at several
+    scales and rotations, then blurred and re-lit.
+
+    Args:
+        frames (list): Source frames (the pad pictures).
+        scales (tuple): Pad sizes, as fractions of the frame height.
+        angles (tuple): Pad rotations in degrees.
+        blurs (tuple): Gaussian blur kernel sizes (0 for none).
+        lighting (tuple): (gain, bias) pairs for the lighting change.
+
+    Returns:
+        list: Synthetic frames with their true pad center.
+    """
+    variants = []
+    seed = 0
+    for frame in frames:
+        for scale in scales:
+            for angle in angles:
+                offset = (0.1 * np.cos(seed), 0.1 * np.sin(seed))
+                placed, center = place_on_ground(frame.image, scale=scale, angle=angle, offset=offset, seed=seed)
+                seed += 1
+                for blur in blurs:
+                    blurred = cv2.GaussianBlur(placed, (blur, blur), 0) if blur else placed
+                    for gain, bias in lighting:
+                        name = f"{frame.name}/s{scale}/r{angle}/b{blur}/l{gain}"
+                        variants.append(Frame(adjust_lighting(blurred, gain, bias), name, center))
+    return variants
+
+
+def resize_frame(frame, width):
+    """
+    Resize a frame to the given width, keeping the aspect ratio and scaling its ground truth.
+    """
+    height, current_width = frame.image.shape[:2]
+    if current_width == width:
+        return frame
+    factor = width / current_width
+    image = cv2.resize(frame.image, (width, max(1, round(height * factor))), interpolation=cv2.INTER_AREA)
+    center = None if frame.center is None else [int(c * factor) for c in frame.center]
+    return Frame(image, frame.name, center)
@@ -0,0 +1,333 @@
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import util
+
+import numpy as np
+from episode_runner import KinematicFactory, UnityFactory, run_episode, summarize
+
+# `Control` arguments that can be swept
+PARAMETERS = ("kp_min", "kp_max", "error_threshold", "exploration_throttle", "dynamic_gains")
+
+# Environment of this worker process, built once by `_init_worker`
+_env = None
+
+
+def grid(space):
+    """
+    Every combination of the values of a grid.
+
+    Args:
+        space (dict): Parameter name -> list of values.
+
+    Returns:
+        list: Parameter dicts.
+    """
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_search(space, samples, seed=0):
+    """
+    Random parameter sets.
+
+    Args:
+        space (dict): Parameter name -> (low, high) range sampled uniformly, or list of values
+            sampled with equal probability.
+        samples (int): Number of parameter sets.
+        seed (int): Seed of the sampler.
+
+    Returns:
+        list: Parameter dicts.
+    """
+    rng = np.random.default_rng(seed)
+    candidates = []
+    for _ in range(samples):
+        params = {}
+        for name in sorted(space):
+            values = space[name]
+            if isinstance(values, tuple):
+                params[name] = round(float(rng.uniform(*values)), 6)
+            else:
+                params[name] = values[rng.integers(len(values))]
+        candidates.append(params)
+    return candidates
+
+
+def check_parameters(candidates):
+    """
+    Raise a ValueError for parameters that are not `Control` arguments.
+    """
+    for params in candidates:
+        unknown = set(params) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown parameters {sorted(unknown)}. Choose from {list(PARAMETERS)}.")
+
+
+def describe(env_factory):
+    """
+    Returns:
+        str: Stable description of an environment factory, part of the cache keys.
+    """
+    return f"{type(env_factory).__name__}{json.dumps(vars(env_factory), sort_keys=True, default=str)}"
+
+
+class SweepCache:
+    """
+    Results of evaluated parameter sets, appended to a JSON-lines file.
+
+    A result is keyed by the parameter set and everything else the evaluation depends on
+    (environment, episodes, seed, step limit, fixed `Control` arguments), so a sweep rerun
+    with more candidates only evaluates the new ones.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str or None): Cache file (None: keep results in memory only).
+        """
+        self.path = path
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.results[entry["key"]] = entry
+
+    @staticmethod
+    def key(params, setting):
+        text = json.dumps({"params": params, "setting": setting}, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def get(self, key):
+        return self.results.get(key)
+
+    def put(self, key, entry):
+        entry = dict(entry, key=key)
+        self.results[key] = entry
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+def _init_worker(env_factory, counter):
+    """
+    Worker process initializer: build the environment of this process once.
+    """
+    import cv2
+
+    global _env
+    # Parallelism comes from the processes; keep OpenCV to one thread each
+    cv2.setNumThreads(1)
+    with counter.get_lock():
+        worker = counter.value
+        counter.value += 1
+    _env = env_factory(worker)
+    util.Finalize(None, _env.close, exitpriority=10)
+
+
+def _run_task(index, params, episodes, control_options, max_steps, seed):
+    """
+    Fly some episodes of one parameter set in this worker's environment.
+
+    Returns:
+        tuple: (candidate index, list of episode results).
+    """
+    from control_actions import Control
+
+    results = []
+    for episode in episodes:
+        if hasattr(_env, "seed"):
+            # Every parameter set flies the same starts
+            _env.seed(seed + episode)
+        control = Control(**control_options, **params)
+        start = time.perf_counter()
+        result = run_episode(_env, control, max_steps, dt=getattr(_env, "dt", None))
+        result.update(episode=episode, wall_seconds=time.perf_counter() - start)
+        results.append(result)
+    return index, results
+
+
+def rank_key(entry):
+    """
+    Sort key: highest success rate, then smallest landing offset, then fastest landing.
+    """
+    summary = entry["summary"]
+    offset = summary["landed_offset_m"]
+    time_to_land = summary["time_to_land_s"]
+    return (-(summary["success_rate"] or 0.0),
+            offset["mean"] if offset else np.inf,
+            time_to_land["mean"] if time_to_land else np.inf)
+
+
+def sweep(env_factory, candidates, episodes=20, workers=None, control_options=None, max_steps=None, seed=0,
+          cache_path=None, chunk_episodes=5, verbose=True):
+    """
+    Evaluate parameter sets with closed-loop episodes on all cores, and rank them.
+
+    All candidates share one pool of worker processes, each holding one environment, and
+    are split into tasks of `chunk_episodes` episodes so the pool stays busy. Every candidate
+    flies the same episode starts (for environments with a `seed` method).
+
+    Args:
+        env_factory (callable): Picklable `factory(worker_index)` returning an environment
+            (see `episode_runner`).
+        candidates (list): Parameter dicts (names from `PARAMETERS`).
+        episodes (int): Episodes per parameter set.
+        workers (int or None): Worker processes (default: one per core).
+        control_options (dict or None): Fixed `Control` arguments (e.g. the detector).
+        max_steps (int or None): Steps after which an episode is abandoned.
+        seed (int): Seed of episode 0; episode i uses `seed + i`.
+        cache_path (str or None): JSON-lines file of already evaluated parameter sets.
+        chunk_episodes (int): Episodes per task.
+        verbose (bool): Print progress.
+
+    Returns:
+        list: One dict per candidate (params, summary, cached), best first.
+    """
+    check_parameters(candidates)
+    control_options = control_options or {}
+    cache = SweepCache(cache_path)
+    setting = {"env": describe(env_factory), "episodes": episodes, "seed": seed, "max_steps": max_steps,
+               "control": control_options}
+    keys = [cache.key(params, setting) for params in candidates]
+    entries = [None] * len(candidates)
+    todo = []
+    for index, key in enumerate(keys):
+        cached = cache.get(key)
+        if cached is not None:
+            entries[index] = {"params": candidates[index], "summary": cached["summary"], "cached": True}
+        elif key not in (keys[i] for i in todo):
+            todo.append(index)
+    if verbose:
+        print(f"Sweep: {len(candidates)} parameter sets, {len(candidates) - len(todo)} cached, "
+              f"{len(todo)} x {episodes} episodes to fly")
+
+    if todo:
+        tasks = [(index, range(first, min(first + chunk_episodes, episodes)))
+                 for index in todo for first in range(0, episodes, chunk_episodes)]
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        # Spawned workers start without the parent's OpenCV threads and Unity sockets
+        context = multiprocessing.get_context("spawn")
+        counter = context.Value("i", 0)
+        results = {index: [] for index in todo}
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(env_factory, counter)) as executor:
+            futures = [executor.submit(_run_task, index, candidates[index], chunk, control_options, max_steps, seed)
+                       for index, chunk in tasks]
+            for future in as_completed(futures):
+                index, chunk_results = future.result()
+                results[index].extend(chunk_results)
+                if len(results[index]) == episodes:
+                    # Throughput of one worker on this parameter set
+                    summary = summarize(results[index], sum(r["wall_seconds"] for r in results[index]))
+                    cache.put(keys[index], {"params": candidates[index], "setting": setting, "summary": summary})
+                    done += 1
+                    if verbose:
+                        print(f"  [{done}/{len(todo)}] {candidates[index]}: success {summary['success_rate']:.2f}")
+
+    for index, entry in enumerate(entries):
+        if entry is None:
+            entries[index] = {"params": candidates[index], "summary": cache.get(keys[index])["summary"],
+                              "cached": False}
+    return sorted(entries, key=rank_key)
+
+
+def format_table(entries, limit=None):
+    """
+    Returns:
+        str: Ranked table of parameter sets with landing accuracy and time-to-land.
+    """
+    names = sorted({name for entry in entries for name in entry["params"]})
+    header = ["rank"] + names + ["success", "offset_mean", "offset_p95", "land_s_mean", "land_s_p95"]
+    rows = []
+    for rank, entry in enumerate(entries[:limit], 1):
+        summary = entry["summary"]
+        offset, time_to_land = summary["landed_offset_m"] or {}, summary["time_to_land_s"] or {}
+        rows.append([str(rank)] + [str(entry["params"].get(name, "")) for name in names] + [
+            f"{summary['success_rate']:.2f}",
+            f"{offset['mean']:.3f}" if offset else "-",
+            f"{offset['p95']:.3f}" if offset else "-",
+            f"{time_to_land['mean']:.2f}" if time_to_land else "-",
+            f"{time_to_land['p95']:.2f}" if time_to_land else "-",
+        ])
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in [header] + rows)
+
+
+def parse_value(text):
+    """
+    Parse a parameter value: a boolean, an integer or a float.
+    """
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_space(options, ranges=False):
+    """
+    Parse `name=v1,v2,...` options, or with `ranges`, also `name=low:high`.
+
+    Returns:
+        dict: Parameter name -> list of values or (low, high) tuple.
+    """
+    space = {}
+    for option in options or []:
+        name, _, values = option.partition("=")
+        if ranges and ":" in values:
+            low, high = values.split(":")
+            space[name] = (float(low), float(high))
+        else:
+            space[name] = [parse_value(value) for value in values.split(",")]
+    return space
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the Control gains and thresholds with closed-loop episodes.")
+    parser.add_argument("--grid", action="append", metavar="NAME=V1,V2,...",
+                        help=f"Grid values of a parameter ({', '.join(PARAMETERS)}); repeat for each parameter.")
+    parser.add_argument("--random", action="append", metavar="NAME=LOW:HIGH|V1,V2,...",
+                        help="Random search range or values of a parameter; repeat for each parameter.")
+    parser.add_argument("--samples", type=int, default=20, help="Parameter sets drawn with --random.")
+    parser.add_argument("--episodes", type=int, default=20, help="Episodes per parameter set.")
+    parser.add_argument("--workers", type=int, help="Parallel environments (default: one per core).")
+    parser.add_argument("--env", help="Path to the Unity simulation build (default: the kinematic simulator).")
+    parser.add_argument("--base-port", type=int, help="Port of the first Unity environment.")
+    parser.add_argument("--detector", default="cv", help="Landing pad detector.")
+    parser.add_argument("--max-steps", type=int, help="Abandon episodes after this many steps.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default="sweep_cache.jsonl", help="Results of evaluated parameter sets.")
+    parser.add_argument("--top", type=int, help="Rows of the ranked table to print.")
+    parser.add_argument("--output", help="Write the ranked results to this JSON file.")
+    args = parser.parse_args()
+
+    if args.random:
+        candidates = random_search(parse_space(args.random, ranges=True), args.samples, args.seed)
+        fixed = grid(parse_space(args.grid))
+        candidates = [dict(params, **extra) for params in candidates for extra in fixed]
+    else:
+        candidates = grid(parse_space(args.grid))
+
+    if args.env:
+        factory = UnityFactory(args.env, base_port=args.base_port)
+        control_options = {"detector": args.detector}
+    else:
+        factory = KinematicFactory()
+        control_options = {"detector": args.detector, "command_gain": factory(0).command_gain}
+
+    ranked = sweep(factory, candidates, args.episodes, args.workers, control_options, args.max_steps, args.seed,
+                   args.cache)
+    print(format_table(ranked, args.top))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(ranked, f, indent=2)
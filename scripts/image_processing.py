@@ -1,175 +1,570 @@
 import cv2
 import numpy as np
-from ultralytics import YOLO
-import pytesseract
+
+import detectors
+from color_lut import ColorLUT
+from annotation import Annotator, Detection, DetectionResult
+from frame_ingest import Buffers, IngestedFrame, to_bgr
+from pad_index import PadCandidate, PadIndex
 
 class image_processing:
-    def __init__(self):
-        # Initialize YOLO model
-        self.model = YOLO("./models/landing_pad.pt")
+    def __init__(self, roi_tracking=True, roi_margin=0.5, roi_growth=1.5, max_misses=5,
+                 model_path="./models/landing_pad.pt", segmentation="hsv", lut_bits=8,
+                 multires=True, min_area=5000, adaptive_area=True, min_pad_side=96, max_level=3, ocr_engine=True,
+                 yolo_backend="ultralytics", yolo_conf=0.5, yolo_plot=False, max_pad_motion=80.0):
+        """
+        Initialize the detectors and the region-of-interest tracking state.
+
+        The YOLO model and Tesseract are not loaded here: they are loaded from the shared
+        `detectors` registry the first time `Yolo_detection` or `tes_detection` is called.
 
-    def cv_detection(self, frame):
+        Args:
+            roi_tracking (bool): Search only a window around the last detected pad in `cv_detection`.
+            roi_margin (float): Extra window size around the last pad, as a fraction of its extent.
+            roi_growth (float): Factor by which the window grows after each missed frame.
+            max_misses (int): Consecutive misses before falling back to a full-frame scan.
+            model_path (str): Path of the YOLO weights used by `Yolo_detection`.
+            segmentation (str): "hsv" to convert to HSV and threshold, or "lut" to threshold
+                with a precomputed colour lookup table (see `ColorLUT`).
+            lut_bits (int): Quantisation bits per channel of the lookup table (8 is exact).
+            multires (bool): Pick an image pyramid level for `cv_detection` from the altitude, so
+                the pad is processed at a resolution where it spans about `min_pad_side` pixels.
+            min_area (float): Minimum contour area of the pad, in full-resolution pixels.
+            adaptive_area (bool): Lower `min_area` to a quarter of the pad area expected at the
+                altitude, so small (high-altitude) pads are not filtered out. With `multires` also
+                off, the fixed `min_area` filter of the original detector is used.
+            min_pad_side (int): Smallest expected pad side, in pixels of the pyramid level used.
+            max_level (int): Deepest pyramid level (each level halves the resolution).
+            ocr_engine (bool): Run `tes_detection` only over the pad region and only for the 'H'
+                character, on a persistent OCR worker process when `tesserocr` is installed
+                (see `ocr_engine.load_engine`).
+            yolo_backend (str): "ultralytics", or "onnx" for the ONNX Runtime CPU backend (`OnnxYolo`).
+            yolo_conf (float): Minimum confidence of a YOLO detection.
+            yolo_plot (bool): Annotate YOLO hits with ultralytics' full plot (slow; debugging only).
+            max_pad_motion (float): Largest image motion of a pad between two frames, in pixels, for
+                associating the candidates of `cv_detect` with the pads seen before (see `PadIndex`).
         """
-        Detect an "H" marker in the given image using color segmentation and contour analysis.
+        if yolo_backend not in ("ultralytics", "onnx"):
+            raise ValueError(f"Unknown YOLO backend '{yolo_backend}'. Choose 'ultralytics' or 'onnx'.")
+        if segmentation not in ("hsv", "lut"):
+            raise ValueError(f"Unknown segmentation '{segmentation}'. Choose 'hsv' or 'lut'.")
+        self.model_path = model_path
+        self.ocr_engine = ocr_engine
+        self.yolo_backend = yolo_backend
+        self.yolo_conf = yolo_conf
+        self.yolo_plot = yolo_plot
+
+        self.roi_tracking = roi_tracking
+        self.roi_margin = roi_margin
+        self.roi_growth = roi_growth
+        self.max_misses = max_misses
+        self.kernel = np.ones((5, 5), np.uint8)
+        self.multires = multires
+        self.min_area = min_area
+        self.adaptive_area = adaptive_area
+        self.min_pad_side = min_pad_side
+        self.max_level = max_level
+        self.min_level = 0  # Forced downscaling, e.g. when running behind schedule
+        # Pad side in pixels times altitude (constant for a given camera and pad), learnt from detections
+        self.pad_scale = None
+        self.candidates = 0  # Pad-shaped contours seen by the last search
+        self.pad_candidates = []  # Those contours, as `PadCandidate`s, best score first
+        # Pads seen during the flight, and the one being approached
+        self.pad_index = PadIndex(max_pad_motion)
+        self.ambiguous = False  # Whether the last `cv_detect` chose between pads without a target to follow
+
+        # Range of blue color in HSV
+        self.segmentation = segmentation
+        self.lut_bits = lut_bits
+        self.lut = None
+        self.set_thresholds([110, 50, 50], [130, 255, 255])
+
+        # Scratch arrays reused across frames (one instance must not be used by two threads at once)
+        self.buffers = Buffers()
+        # Overlays are only drawn when requested, on a copy of the frame
+        self.annotator = Annotator()
+        self.reset_tracking()
+
+    @property
+    def model(self):
+        """
+        YOLO model, loaded on first access and shared with every other user of the same weights.
+        """
+        return detectors.get_backend("yolo", model_path=self.model_path)
+
+    def preload(self, yolo=False, ocr=False):
+        """
+        Load detector backends now instead of on the first frame that needs them.
+
+        Args:
+            yolo (bool): Load the YOLO model.
+            ocr (bool): Load Tesseract.
+        """
+        if yolo:
+            detectors.get_backend("yolo_onnx" if self.yolo_backend == "onnx" else "yolo", model_path=self.model_path)
+        if ocr:
+            detectors.get_backend("ocr_engine" if self.ocr_engine else "tesseract")
+
+    def reset_tracking(self):
+        """
+        Forget the last known landing pad so the next `cv_detection` call scans the full frame.
+        """
+        self.last_box = None  # [x, y, w, h] of the last detected pad contour
+        self.last_altitude = None  # Altitude at which `last_box` was detected
+        self.misses = 0  # Consecutive frames without a detection inside the window
+
+    def search_window(self, frame_shape, altitude=None):
+        """
+        Compute the window to search for the landing pad in the next frame.
+
+        The window is centred on the last detected pad and sized from its extent. The
+        extent is scaled by the altitude change since the detection (the pad appears
+        larger as the drone descends) and grown after every missed frame.
 
         Args:
-            frame (numpy.ndarray): Input image.
+            frame_shape (tuple): Shape of the full frame.
+            altitude (float or None): Current altitude, if known.
 
         Returns:
-            tuple: 
-                - image_center (list): Coordinates [x, y] of the image center.
-                - center_state (list or None): Coordinates [x, y] of the "H" marker's center or None if not detected.
-                - frame (numpy.ndarray): Annotated image with the "H" marker highlighted.
+            tuple or None: (x0, y0, x1, y1) window in frame coordinates, or None for a full-frame scan.
+        """
+        if not self.roi_tracking or self.last_box is None or self.misses >= self.max_misses:
+            return None
+
+        height, width = frame_shape[:2]
+        x, y, w, h = self.last_box
+
+        scale = 1.0
+        if altitude is not None and self.last_altitude is not None and altitude > 0:
+            scale = max(1.0, self.last_altitude / altitude)
+
+        scale *= (1 + self.roi_margin) * self.roi_growth ** self.misses
+        half_w = int(w * scale / 2) + self.kernel.shape[1]
+        half_h = int(h * scale / 2) + self.kernel.shape[0]
+        cx, cy = x + w // 2, y + h // 2
+
+        x0, y0 = max(0, cx - half_w), max(0, cy - half_h)
+        x1, y1 = min(width, cx + half_w), min(height, cy + half_h)
+        if x0 == 0 and y0 == 0 and x1 == width and y1 == height:
+            return None
+        return x0, y0, x1, y1
+
+    def set_thresholds(self, lower, upper):
+        """
+        Change the HSV range of the pad colour, rebuilding (or loading) the lookup table if one is used.
+
+        Args:
+            lower (array-like): Lower HSV bound.
+            upper (array-like): Upper HSV bound.
+        """
+        self.lower_blue = np.array(lower)
+        self.upper_blue = np.array(upper)
+        if self.segmentation == "lut":
+            self.lut = ColorLUT(self.lower_blue, self.upper_blue, bits=self.lut_bits)
+
+    def detection_scale(self, altitude=None):
+        """
+        Choose the pyramid level and the minimum pad area for the current altitude.
+
+        The expected pad side is `pad_scale / altitude`. Large pads (low altitude) are
+        searched on downscaled images (with `multires`); the area threshold is lowered for
+        small pads (with `adaptive_area`). The level is never below `min_level`, which a
+        scheduler may raise to save time.
+
+        Args:
+            altitude (float or None): Current altitude, if known.
+
+        Returns:
+            tuple: (level, min_area) with `min_area` in full-resolution pixels.
+        """
+        if self.pad_scale is None or altitude is None or altitude <= 0:
+            return self.min_level, self.min_area
+
+        expected_side = self.pad_scale / altitude
+        min_area = self.min_area
+        if self.adaptive_area:
+            # The pad contour encloses roughly the whole pad; accept down to a quarter of its expected area
+            min_area = min(min_area, 0.25 * expected_side ** 2)
+        if not self.multires or expected_side < 2 * self.min_pad_side:
+            return self.min_level, min_area
+
+        level = min(self.max_level, int(np.log2(expected_side / self.min_pad_side)))
+        return max(level, self.min_level), min_area
+
+    def segment(self, frame, window=None, level=0):
+        """
+        Threshold the blue landing pad colour in the whole frame or inside a window.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): BGR image, or an ingested RGBX frame
+                (thresholded without an intermediate BGR copy).
+            window (tuple or None): (x0, y0, x1, y1) region, or None for the full frame.
+            level (int): Pyramid level: the region is downscaled by `2 ** level` first.
+
+        Returns:
+            numpy.ndarray: Cleaned-up binary mask of the region, in a buffer reused by the next call.
+        """
+        ingested = isinstance(frame, IngestedFrame)
+        image = frame.rgbx if ingested else frame
+
+        height, width = image.shape[:2]
+        x0, y0, x1, y1 = window if window is not None else (0, 0, width, height)
+        factor = 1 << level
+        shape = ((y1 - y0) // factor, (x1 - x0) // factor)
+        region = image[y0:y1, x0:x1]
+        if level:
+            # INTER_AREA averages whole blocks, so aligned windows give the same pixels as the full frame
+            region = cv2.resize(region, shape[::-1], dst=self.buffers.get("pyramid", shape + image.shape[2:]),
+                                interpolation=cv2.INTER_AREA)
+
+        if self.lut is not None:
+            # One table lookup per pixel; the RGBX pixels of an ingested frame are the indices
+            mask = self.lut.apply(region, None if ingested else cv2.COLOR_BGR2RGBA,
+                                  dst=self.buffers.get("mask", shape))
+        else:
+            # Convert to HSV
+            code = cv2.COLOR_RGB2HSV if ingested else cv2.COLOR_BGR2HSV
+            hsv = cv2.cvtColor(region, code, dst=self.buffers.get("hsv", shape + (3,)))
+
+            # Threshold the HSV image to get only blue colors
+            mask = cv2.inRange(hsv, self.lower_blue, self.upper_blue, dst=self.buffers.get("mask", shape))
+
+        # Apply morphological operations to clean up the mask
+        return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel, dst=self.buffers.get("closed", shape))
+
+    def find_pad_candidates(self, frame, window=None, level=0, min_area=5000):
+        """
+        Search for every blue landing pad in the whole frame or only inside a window.
+
+        Contours touching an inner edge of the window are rejected, because they may be
+        clipped and would not match the full-frame result. Each contour approximating a
+        quadrilateral is scored by its squareness and fill ratio; the candidates are kept in
+        `pad_candidates` and their number in `candidates` (more than one is ambiguous).
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image (BGR) or ingested frame.
+            window (tuple or None): (x0, y0, x1, y1) region to search, or None for the full frame.
+            level (int): Pyramid level to search at (see `segment`).
+            min_area (float): Minimum contour area, in full-resolution pixels.
+
+        Returns:
+            list: `PadCandidate`s in full-resolution coordinates, best score first.
+        """
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = window if window is not None else (0, 0, width, height)
+        inner = (window is not None) and (x0 > 0, y0 > 0, x1 < width, y1 < height)
+
+        # Align the region on the pyramid grid
+        factor = 1 << level
+        x0, y0 = x0 // factor * factor, y0 // factor * factor
+        x1, y1 = x0 + (x1 - x0) // factor * factor, y0 + (y1 - y0) // factor * factor
+
+        mask = self.segment(frame, (x0, y0, x1, y1), level)
+
+        # Find contours in the mask, in full-frame coordinates
+        if level:
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            contours = [c * factor + (x0, y0) for c in contours if cv2.contourArea(c) * factor ** 2 > min_area]
+        else:
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x0, y0))
+            contours = [c for c in contours if cv2.contourArea(c) > min_area]
+
+        # Inner window edges, with a kernel-sized guard band where the closing may differ
+        guard = self.kernel.shape[0] * factor
+        candidates = []
+        for contour in contours:
+            if inner:
+                bx, by, bw, bh = cv2.boundingRect(contour)
+                if ((inner[0] and bx < x0 + guard) or (inner[1] and by < y0 + guard)
+                        or (inner[2] and bx + bw > x1 - guard) or (inner[3] and by + bh > y1 - guard)):
+                    continue
+
+            epsilon = 0.08 * cv2.arcLength(contour, True)
+            approx = cv2.approxPolyDP(contour, epsilon, True)
+
+            if len(approx) == 4:  # Check if the polygon has 4 points (potential landing pad)
+                # Calculate the center of the rectangle
+                M = cv2.moments(contour)
+                if M["m00"] != 0:
+                    (_, _), (side_a, side_b), _ = cv2.minAreaRect(contour)
+                    area = M["m00"]
+                    squareness = min(side_a, side_b) / max(side_a, side_b, 1)
+                    fill = min(1.0, area / max(side_a * side_b, 1))
+                    center = [int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])]
+                    candidates.append(PadCandidate(center, approx, contour, area, squareness, fill))
+
+        candidates.sort(key=lambda candidate: (candidate.score, candidate.area), reverse=True)
+        self.pad_candidates = candidates
+        self.candidates = len(candidates)
+        return candidates
+
+    def find_landing_pad(self, frame, window=None, level=0, min_area=5000):
+        """
+        Search for the blue landing pad in the whole frame or only inside a window.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image (BGR) or ingested frame.
+            window (tuple or None): (x0, y0, x1, y1) region to search, or None for the full frame.
+            level (int): Pyramid level to search at (see `segment`).
+            min_area (float): Minimum contour area, in full-resolution pixels.
+
+        Returns:
+            tuple or None: (approx, contour, center_state) of the best-scoring pad found, in full-resolution
+            coordinates, or None.
+        """
+        candidates = self.find_pad_candidates(frame, window, level, min_area)
+        if not candidates:
+            return None
+        found = candidates[0]
+        return found.approx, found.contour, found.center
+
+    def cv_detect(self, frame, altitude=None, expected=None):
+        """
+        Detect the landing pad using color segmentation and contour analysis.
+
+        With ROI tracking enabled, only a window around the last detected pad is searched.
+        A miss grows the window for the next frame, and after `max_misses` consecutive
+        misses the full frame is scanned again. With `multires`, low-altitude frames (where
+        the pad is large) are searched on a downscaled image. With several pads in view, the
+        one being approached is followed across frames by `pad_index`.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image (BGR) or ingested frame.
+            altitude (float or None): Current altitude, used to size the tracking window and
+                to pick the pyramid level.
+            expected (list or None): [x, y] position where the pad is expected (e.g. where it was
+                last seen), used to pick a pad when the one being approached is lost.
+
+        Returns:
+            DetectionResult: The pad's centre, outline and bounding box, if found.
         """
         # Image center
         height, width = frame.shape[:2]
         image_center = [width // 2, height // 2]
 
-        # Convert BGR to HSV
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        window = self.search_window(frame.shape, altitude)
+        level, min_area = self.detection_scale(altitude)
+        candidates = self.find_pad_candidates(frame, window, level, min_area)
+
+        detection = None
+        self.ambiguous = False
+        # Associated on empty frames too, so that pads no longer seen age out
+        ids = self.pad_index.associate(candidates)
+        if candidates:
+            index, followed = self.pad_index.select(candidates, ids, expected)
+            self.ambiguous = len(candidates) > 1 and not followed
+            found = candidates[index]
+            approx, contour, center_state = found.approx, found.contour, found.center
+            self.last_box = list(cv2.boundingRect(contour))
+            self.last_altitude = altitude
+            self.misses = 0
+            if altitude is not None and altitude > 0:
+                self.pad_scale = max(self.last_box[2:]) * altitude
+            detection = Detection(center_state, "cv", polygon=approx, bbox=tuple(self.last_box), label="Center")
+        elif window is not None:
+            self.misses += 1
+        else:
+            # A full-frame scan found nothing, so there is nothing left to track.
+            self.reset_tracking()
+
+        return DetectionResult(frame, image_center, detection)
+
+    def cv_detection(self, frame, altitude=None, annotate=True):
+        """
+        Detect an "H" marker in the given image using color segmentation and contour analysis.
 
-        # Define range of blue color in HSV
-        lower_blue = np.array([110, 50, 50])
-        upper_blue = np.array([130, 255, 255])
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image (BGR) or ingested frame.
+            altitude (float or None): Current altitude (see `cv_detect`).
+            annotate (bool): Render the detection. When False nothing is drawn.
 
-        # Threshold the HSV image to get only blue colors
-        mask = cv2.inRange(hsv, lower_blue, upper_blue)
+        Returns:
+            tuple: 
+                - image_center (list): Coordinates [x, y] of the image center.
+                - center_state (list or None): Coordinates [x, y] of the "H" marker's center or None if not detected.
+                - frame (numpy.ndarray or None): Annotated BGR copy of the image with the "H" marker
+                  highlighted (None when `annotate` is False).
+        """
+        result = self.cv_detect(frame, altitude)
+        return result.image_center, result.center, self.annotator.render(result) if annotate else None
 
-        # Apply morphological operations to clean up the mask
-        kernel = np.ones((5, 5), np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-
-        # Find contours in the mask
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        contours = [c for c in contours if cv2.contourArea(c) > 5000]
-        
-        # Draw the image center
-        cv2.circle(frame, (image_center[0], image_center[1]), 10, (0, 255, 255), -1)
-        cv2.putText(frame, "Image Center", (image_center[0] + 15, image_center[1] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-        
-        # Process contours if available
-        if contours:
-            for contour in contours:
-                epsilon = 0.08 * cv2.arcLength(contour, True)
-                approx = cv2.approxPolyDP(contour, epsilon, True)
-
-                if len(approx) == 4:  # Check if the polygon has 4 points (potential landing pad)
-                    cv2.drawContours(frame, [approx], -1, (0, 255, 0), 3)
-
-                    # Calculate the center of the rectangle
-                    M = cv2.moments(contour)
-                    if M["m00"] != 0:
-                        x_center = int(M["m10"] / M["m00"])
-                        y_center = int(M["m01"] / M["m00"])
-                        center_state = [x_center, y_center]
-                        
-                        # Draw the rectangle center
-                        cv2.circle(frame, (x_center, y_center), 10, (0, 0, 255), -1)
-                        cv2.putText(frame, "Center", (x_center - 20, y_center - 20),
-                                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
-
-                        return image_center, center_state, frame
-
-        # If no "Landing pad" is detected, return None
-        return image_center, None, frame
+    def yolo_detections(self, frame):
+        """
+        Run the YOLO model on a BGR frame with the configured backend.
 
-    def Yolo_detection(self, frame):
+        Returns:
+            tuple:
+                - detections (numpy.ndarray): (N, 6) rows `[x1, y1, x2, y2, confidence, class]`,
+                  by decreasing confidence.
+                - results (list or None): ultralytics results (None with the ONNX backend).
         """
-        Perform object detection using YOLO, extract bounding box corners, and annotate the frame.
+        if self.yolo_backend == "onnx":
+            return detectors.get_backend("yolo_onnx", model_path=self.model_path)(frame), None
+
+        results = self.model(frame, verbose=False)
+        if not results:
+            return np.empty((0, 6), np.float32), results
+        return results[0].boxes.data.cpu().numpy(), results
+
+    def yolo_detect(self, frame):
+        """
+        Detect the landing pad with YOLO.
 
         Args:
-            frame (numpy.ndarray): Input image.
+            frame (numpy.ndarray or IngestedFrame): Input image.
 
         Returns:
-            tuple:
-                - image_center (list): [x, y] center of the image.
-                - center_state (list or None): [x, y] center of the detected object (or None if no detection).
-                - frame (numpy.ndarray): Annotated frame with bounding boxes and centers.
+            DetectionResult: The most confident box above `yolo_conf`, if any; `raw` holds the
+            ultralytics results.
         """
         # Get image dimensions
         height, width = frame.shape[:2]
         image_center = [width // 2, height // 2]
-        
-        # Draw the image center
-        cv2.circle(frame, (image_center[0], image_center[1]), 10, (0, 255, 255), -1)
-        cv2.putText(frame, "Image Center", (image_center[0] + 15, image_center[1] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
 
         # Run YOLO inference
-        results = self.model(frame)
-
-        center_state = None  # Default: No detection
+        detections, results = self.yolo_detections(to_bgr(frame))
+
+        # Only consider detections with confidence greater than the threshold; the first is the most confident
+        detection = None
+        confident = detections[detections[:, 4] > self.yolo_conf]
+        if len(confident):
+            x_min, y_min, x_max, y_max = confident[0, :4].astype(int)
+            confidence = float(confident[0, 4])
+            detection = Detection([int(x_min + x_max) // 2, int(y_min + y_max) // 2], "yolo",
+                                  bbox=(int(x_min), int(y_min), int(x_max - x_min), int(y_max - y_min)),
+                                  confidence=confidence, label=f"Pad {confidence:.2f}")
+
+        result = DetectionResult(frame, image_center, detection)
+        result.raw = results
+        return result
 
-        # Check if any results are found
-        if results:
-            for result in results:
-                for box in result.boxes.data:
-                    x_center, y_center, width, height = box[:4]  # Extract YOLO bbox values
-                    confidence = float(box[4])  # Confidence score
+    def Yolo_detection(self, frame):
+        """
+        Perform object detection using YOLO, extract bounding box corners, and annotate the frame.
 
-                    if confidence > 0.5:  # Only consider detections with confidence greater than 0.5
-                        center_state = [x_center, y_center]
-                        annotated_frame = results[0].plot()
-                        return image_center, center_state, annotated_frame
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image.
 
-        return image_center, None, frame
+        Returns:
+            tuple:
+                - image_center (list): [x, y] center of the image.
+                - center_state (list or None): [x, y] center of the detected object (or None if no detection).
+                - frame (numpy.ndarray): Annotated copy of the frame with bounding boxes and centers.
+        """
+        result = self.yolo_detect(frame)
+        if self.yolo_plot and result.raw:
+            # Full ultralytics rendering: slow, for debugging only
+            return result.image_center, result.center, result.raw[0].plot()
+        return result.image_center, result.center, self.annotator.render(result)
 
-    def tes_detection(self, frame):
+    def tes_detect(self, frame):
         """
-        Detect an "H" marker in the given image using Tesseract OCR.
+        Detect the "H" marker with Tesseract OCR.
+
+        Uses the OCR engine over the pad region if `ocr_engine` is set, otherwise one
+        `tesseract` process over the whole frame.
 
         Args:
-            frame (numpy.ndarray): Input image.
+            frame (numpy.ndarray or IngestedFrame): Input image.
 
         Returns:
-            tuple:
-                - image_center (list): Coordinates [x, y] of the image center.
-                - center_state (list or None): Coordinates [x, y] of the "H" marker's center or None if not detected.
-                - frame (numpy.ndarray): Annotated frame with the detection result.
+            DetectionResult: The first 'H' found, if any.
         """
+        if self.ocr_engine:
+            return self.tes_engine_detect(frame)
+
         # Get image dimensions
         height, width = frame.shape[:2]
         image_center = [width // 2, height // 2]
 
-        # Draw the image center
-        cv2.circle(frame, (image_center[0], image_center[1]), 10, (0, 255, 255), -1)
-        cv2.putText(frame, "Image Center", (image_center[0] + 15, image_center[1] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
-
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(to_bgr(frame), cv2.COLOR_BGR2GRAY)
 
         # Apply thresholding to preprocess for OCR
         _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)
 
+        pytesseract = detectors.get_backend("tesseract")
+
         try:
             # Run OCR on the processed image
             extracted_data = pytesseract.image_to_boxes(thresh, config="--psm 6")
         except pytesseract.TesseractError as e:
             print(f"Tesseract OCR error: {e}")
-            return image_center, None, frame
+            return DetectionResult(frame, image_center)
 
-        center_state = None  # Default: No detection
+        detection = None  # Default: No detection
 
         # Parse OCR results for the character 'H'
         for line in extracted_data.splitlines():
             char, x_min, y_min, x_max, y_max, _ = line.split()
             if char == "H":
-                x_min, y_min, x_max, y_max = map(int, [x_min, y_min, x_max, y_max])
+                # Tesseract boxes have their origin at the bottom left of the image
+                x_min, x_max = int(x_min), int(x_max)
+                y_min, y_max = height - int(y_max), height - int(y_min)
+                detection = Detection([(x_min + x_max) // 2, (y_min + y_max) // 2], "ocr",
+                                      bbox=(x_min, y_min, x_max - x_min, y_max - y_min), label="'H' Detected")
 
-                # Calculate the center of the detected "H"
-                x_center = (x_min + x_max) // 2
-                y_center = -(y_min + y_max) // 2
-                center_state = [x_center, y_center]
+                # Stop after finding the first 'H'
+                break
 
-                # Draw bounding box and center
-                cv2.rectangle(frame, (x_min, frame.shape[0] - y_min), (x_max, frame.shape[0] - y_max), (0, 255, 0), 2)
-                cv2.circle(frame, (x_center, frame.shape[0] - y_center), 10, (0, 0, 255), -1)
-                cv2.putText(frame, "'H' Detected", (x_center - 20, frame.shape[0] - y_center - 20),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        return DetectionResult(frame, image_center, detection)
 
-                # Stop after finding the first 'H'
+    def tes_detection(self, frame):
+        """
+        Detect an "H" marker in the given image using Tesseract OCR.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image.
+
+        Returns:
+            tuple:
+                - image_center (list): Coordinates [x, y] of the image center.
+                - center_state (list or None): Coordinates [x, y] of the "H" marker's center or None if not detected.
+                - frame (numpy.ndarray): Annotated copy of the frame with the detection result.
+        """
+        result = self.tes_detect(frame)
+        return result.image_center, result.center, self.annotator.render(result)
+
+    def tes_engine_detect(self, frame):
+        """
+        Detect an "H" marker with the OCR engine (persistent when `tesserocr` is installed).
+
+        Only the landing pad region found by colour segmentation is read (the whole frame
+        if no pad is found), and recognition is limited to the 'H' character.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Input image.
+
+        Returns:
+            DetectionResult: The first 'H' found, if any.
+        """
+        # Get image dimensions
+        height, width = frame.shape[:2]
+        image_center = [width // 2, height // 2]
+
+        # Candidate region: the blue pad, if the colour detector finds one
+        found = self.find_landing_pad(frame, min_area=self.min_area)
+        x0, y0, w, h = cv2.boundingRect(found[1]) if found is not None else (0, 0, width, height)
+
+        # Convert to grayscale and apply thresholding to preprocess for OCR
+        gray = cv2.cvtColor(to_bgr(frame)[y0:y0 + h, x0:x0 + w], cv2.COLOR_BGR2GRAY)
+        _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)
+
+        engine = detectors.get_backend("ocr_engine")
+        detection = None  # Default: No detection
+        try:
+            boxes = engine.image_to_boxes(thresh)
+        except RuntimeError as e:
+            print(f"Tesseract OCR error: {e}")
+            boxes = []
+
+        # Take the first 'H'
+        for char, x_min, y_min, x_max, y_max in boxes:
+            if char == "H":
+                x_min, x_max = x_min + x0, x_max + x0
+                y_min, y_max = y_min + y0, y_max + y0
+                detection = Detection([(x_min + x_max) // 2, (y_min + y_max) // 2], "ocr",
+                                      bbox=(x_min, y_min, x_max - x_min, y_max - y_min), label="'H' Detected")
                 break
 
-        return image_center, center_state, frame
+        return DetectionResult(frame, image_center, detection)
@@ -0,0 +1,244 @@
+import contextlib
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+# Shared no-op span handed out while instrumentation is disabled
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    """
+    Times one stage of one frame.
+    """
+
+    __slots__ = ("samples", "start")
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.start)
+        return False
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread samples the Python stacks of the profiled
+    threads at a fixed interval and counts them.
+
+    The result is written in the collapsed-stack format ("frame;frame;frame count" per line)
+    read by flame graph tools.
+    """
+
+    def __init__(self, interval=0.001, thread_ids=None, max_depth=64):
+        """
+        Args:
+            interval (float): Seconds between samples.
+            thread_ids (set or None): Threads to sample (None: every thread but the sampler).
+            max_depth (int): Frames kept per stack, from the innermost.
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path):
+        """
+        Write the collapsed stacks to a file.
+        """
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Instrumentation:
+    """
+    Per-stage latency measurement for the control loop.
+
+    Stages are timed with `span(name)` and frames are closed with `frame()`. Each stage keeps
+    the durations of its last `window` calls, from which p50/p95/max are computed; frames are
+    counted against an optional deadline. Stats can be dumped as JSON periodically and at
+    exit, and a sampling profiler can be run over a window of frames.
+
+    When disabled, `span` returns a shared no-op context manager and `frame` returns at once.
+    """
+
+    def __init__(self, enabled=False, window=1000, deadline=None, stats_path=None, dump_every=0.0,
+                 profile_frames=None, profile_path="profile.collapsed"):
+        """
+        Args:
+            enabled (bool): Measure anything at all.
+            window (int): Number of recent samples kept per stage.
+            deadline (float or None): Frame period budget in seconds; longer frames are counted as misses.
+            stats_path (str or None): JSON file the stats are written to (at exit, and every
+                `dump_every` seconds if set).
+            dump_every (float): Seconds between periodic dumps (0: only at exit).
+            profile_frames (tuple or None): (first frame, frame count) to run the sampling profiler over.
+            profile_path (str): Collapsed-stack output of the profiler.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.deadline = deadline
+        self.stats_path = stats_path
+        self.dump_every = dump_every
+        self.profile_frames = profile_frames
+        self.profile_path = profile_path
+        self.profiler = None
+
+        self.stages = {}
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.deadline_misses = 0
+        self.started_at = time.perf_counter()
+        self.frame_started_at = self.started_at
+        self.last_dump = self.started_at
+
+    def span(self, name):
+        """
+        Context manager timing one stage.
+
+        Args:
+            name (str): Stage name.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        samples = self.stages.get(name)
+        if samples is None:
+            samples = self.stages.setdefault(name, deque(maxlen=self.window))
+        return _Span(samples)
+
+    def frame(self):
+        """
+        Mark the end of a control-loop iteration.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        duration = now - self.frame_started_at
+        self.frame_started_at = now
+        self.frame_times.append(duration)
+        self.frames += 1
+        if self.deadline is not None and duration > self.deadline:
+            self.deadline_misses += 1
+
+        if self.profile_frames is not None:
+            first, count = self.profile_frames
+            if self.frames == first:
+                self.profiler = SamplingProfiler()
+                self.profiler.start()
+            elif self.frames == first + count:
+                self.stop_profiler()
+
+        if self.dump_every and self.stats_path and now - self.last_dump >= self.dump_every:
+            self.dump()
+
+    def stop_profiler(self):
+        """
+        Stop the profiler, if running, and write its stacks.
+        """
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler.write(self.profile_path)
+            print(f"Profile of {self.profiler.samples} samples written to {self.profile_path}")
+            self.profiler = None
+
+    @staticmethod
+    def summarize(samples):
+        """
+        Returns:
+            dict: Count and mean/p50/p95/max in milliseconds of a list of durations.
+        """
+        ms = np.asarray(samples) * 1000
+        return {
+            "count": len(ms),
+            "mean_ms": float(ms.mean()),
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "max_ms": float(ms.max()),
+        }
+
+    def stats(self):
+        """
+        Returns:
+            dict: Per-stage latencies over the recent window, frame rate and deadline misses.
+        """
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "frames": self.frames,
+            "fps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "deadline_ms": None if self.deadline is None else self.deadline * 1000,
+            "deadline_misses": self.deadline_misses,
+            "frame": self.summarize(self.frame_times) if self.frame_times else None,
+            "stages": {name: self.summarize(samples) for name, samples in list(self.stages.items()) if samples},
+        }
+
+    def dump(self, path=None):
+        """
+        Write the stats as JSON.
+
+        Args:
+            path (str or None): Output file (default: `stats_path`).
+        """
+        path = path or self.stats_path
+        self.last_dump = time.perf_counter()
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def report(self):
+        """
+        Print a per-stage latency table.
+        """
+        stats = self.stats()
+        print(f"Frames: {stats['frames']} ({stats['fps']:.1f} fps), deadline misses: {stats['deadline_misses']}")
+        rows = list(stats["stages"].items()) + ([("frame", stats["frame"])] if stats["frame"] else [])
+        for name, stage in rows:
+            print(f"  {name:>10}  p50 {stage['p50_ms']:7.2f} ms  p95 {stage['p95_ms']:7.2f} ms  "
+                  f"max {stage['max_ms']:7.2f} ms")
+
+    def close(self):
+        """
+        Stop the profiler and write the final stats.
+        """
+        if not self.enabled:
+            return
+        self.stop_profiler()
+        self.report()
+        if self.stats_path:
+            self.dump()
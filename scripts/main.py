@@ -1,22 +1,82 @@
-import cv2
+import argparse
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+from annotation import Annotator
 from control_actions import Control
-from image_processing import image_processing
+from drone_simulator import KinematicDroneSimulator
+from flight_recorder import FlightRecorder
+from frame_ingest import FrameIngest
+from instrumentation import Instrumentation
+from multirate import LatestSlot, MultiRateController, VisionThread
+from preview import PreviewWindow
+from scheduler import AdaptiveScheduler
 from simulation import UnityEnvironmentWrapper
+from triggers import Triggers
+from video_export import VideoExporter
 
 
 class Main:
-    def __init__(self, unity_env_path):
+    def __init__(self, unity_env_path, pipelined=False, max_staleness=1, headless=False, trigger_file=None,
+                 detector="cv", env=None, segmentation="hsv", yolo_backend="ultralytics",
+                 track=False, detect_every=1, cascade_fallback="yolo", instrumentation=None,
+                 target_rate=None, record=None, gate=False, control_rate=None, export=None, export_raw=None,
+                 export_scale=1.0, export_every=1, max_estimate_age=0.5):
         """
         Initialize the main control class with Unity environment and control logic.
 
         Args:
             unity_env_path (str): Path to the Unity environment application.
+            pipelined (bool): Overlap detection on frame t with the environment step for frame t-1.
+            max_staleness (int): In pipelined mode, the maximum number of frames between the
+                observation used to compute an action and the step it is applied to.
+            headless (bool): Disable all OpenCV windows; commands then come only from
+                signals, the trigger file or the trigger queue.
+            trigger_file (str or None): File polled for "land" / "exit" commands.
+            detector (str): Landing pad detector: "cv", "yolo", "ocr" or "cascade".
+            env (object or None): Environment with the `UnityEnvironmentWrapper` interface to use
+                instead of launching Unity, e.g. a `KinematicDroneSimulator`.
+            segmentation (str): Pad colour segmentation: "hsv" or "lut" (precomputed lookup table).
+            yolo_backend (str): YOLO inference backend: "ultralytics" or "onnx".
+            track (bool): Follow the pad with a Kalman tracker between detections.
+            detect_every (int): With tracking, run the detector on one frame out of `detect_every`.
+            cascade_fallback (str): Stage the cascade detector escalates to: "yolo" or "ocr".
+            instrumentation (Instrumentation or None): Per-stage latency measurement (disabled if None).
+            target_rate (float or None): Control rate in Hz to maintain by degrading detection
+                (`AdaptiveScheduler`), or None to always run at full quality.
+            record (str or None): Flight log file to record every step to (`FlightRecorder`).
+            gate (bool): Reuse the last detection on frames that barely changed (`FrameGate`).
+            control_rate (float or None): Run detection in its own thread at whatever rate it
+                allows, and step the environment at this fixed rate in Hz (`MultiRateController`).
+            export (str or None): Video (.mp4, .avi, .mkv) or GIF file to export the annotated frames to.
+            export_raw (str or None): Video or GIF file to export the raw camera frames to.
+            export_scale (float): Size of the exported frames relative to the camera frames.
+            export_every (int): Export one frame out of `export_every`.
+            max_estimate_age (float): With `control_rate`, age in seconds beyond which a pad
+                estimate is no longer used.
         """
+        if control_rate and (pipelined or target_rate):
+            raise ValueError("control_rate cannot be combined with pipelined or target_rate.")
         # Initialize Unity environment, control system, and image processing
-        self.unity_env = UnityEnvironmentWrapper(unity_env_path)
-        self.control = Control(kp_min=0.015, kp_max=0.015, error_threshold=15)
-        self.image_processing = image_processing()
+        self.unity_env = env if env is not None else UnityEnvironmentWrapper(unity_env_path)
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.control = Control(kp_min=0.015, kp_max=0.015, error_threshold=15, detector=detector,
+                               segmentation=segmentation, yolo_backend=yolo_backend, track=track,
+                               detect_every=detect_every,
+                               command_gain=getattr(self.unity_env, "command_gain", 0.0),
+                               cascade_fallback=cascade_fallback, instrumentation=self.instrumentation,
+                               gate=gate)
+        self.image_processing = self.control.image_processing
+        # Source of the control actions: the controller itself, or a scheduler keeping it on time
+        self.scheduler = AdaptiveScheduler(self.control, target_rate) if target_rate else None
+        self.controller = self.scheduler if self.scheduler is not None else self.control
+        self.recorder = FlightRecorder(record) if record else None
+        # Frames are exported once per environment step (per control tick with `control_rate`)
+        fps = control_rate or 1.0 / getattr(self.unity_env, "dt", 0.05)
+        self.exporter = VideoExporter(export, fps, export_scale, export_every) if export else None
+        self.raw_exporter = VideoExporter(export_raw, fps, export_scale, export_every) if export_raw else None
 
         # Flag to check if the simulation has ended
         self.done = False
@@ -24,32 +84,50 @@ class Main:
         # Flag to indicate if the emergency landing is in progress
         self.landing_in_progress = False
 
+        # Pipelined sense/act loop settings
+        self.pipelined = pipelined
+        self.max_staleness = max_staleness
+        self.control_rate = control_rate
+        self.max_estimate_age = max_estimate_age
+
+        # Non-blocking command sources and the optional preview window
+        self.headless = headless
+        self.triggers = Triggers(trigger_file)
+        self.preview = None
+
+        # Reused frame buffers; in pipelined mode up to max_staleness + 1 frames are in flight
+        self.ingest = FrameIngest(slots=max_staleness + 2 if pipelined else 1)
+        if pipelined:
+            # So are their annotated frames
+            self.image_processing.annotator = Annotator(slots=max_staleness + 2)
+
     def run(self):
         """
         Main loop for running the simulation and controlling the actions.
         Continuously process the camera image, calculate control actions,
         and interact with the Unity environment.
         """
+        if self.pipelined:
+            return self.run_pipelined()
+        if self.control_rate:
+            return self.run_multirate()
+
         observation = self.unity_env.reset()
+        annotated_frame = None
+        step_index = 0
+        span = self.instrumentation.span
+        self.start_io()
 
         try:
             while not self.done:
-                # Get the camera image from the Unity environment
-                camera_image = np.transpose(
-                    observation[0], (1, 2, 0)
-                )  # Transpose to (height, width, channels)
-                frame = cv2.cvtColor(
-                    camera_image, cv2.COLOR_RGB2BGR
-                )  # Convert RGB to BGR for OpenCV
-
-                # Extract position sensor data (e.g., height)
-                Position_Sensor = observation[1]
-                height = Position_Sensor[1]
-
-                # Check for emergency landing mode (activated when '0' key is pressed)
-                if cv2.waitKey(1) & 0xFF == ord("0"):
-                    self.landing_in_progress = True
-                    print("Emergency landing mode activated!")
+                # Get the camera image and height from the Unity environment
+                with span("observe"):
+                    frame, height = self.read_observation(observation)
+                    self.export_raw(frame)
+
+                # Check for emergency landing mode (key '0', SIGUSR1, trigger file or queue)
+                with span("triggers"):
+                    self.check_triggers()
 
                 if self.landing_in_progress:
                     # If emergency landing mode is on, control the throttle to land
@@ -60,43 +138,463 @@ class Main:
                         0.0,
                         -throttle_land,
                     ]  # Set all other control values to 0, except throttle
+                    detection = None
 
                 else:
                     # Normal operation: Get control actions based on the current image frame and height
-                    actions, annotated_frame = self.control.get_control_actions(
-                        frame, height
+                    actions, annotated_frame, detection = self.control_step(
+                        frame, height, annotate=self.annotating
                     )
 
+                if self.recorder is not None:
+                    with span("record"):
+                        self.recorder.record(step_index, frame, height, detection, actions)
+
                 # Step the environment with the calculated actions
-                observation, reward, done, info = self.unity_env.step(actions)
+                with span("step"):
+                    observation, reward, done, info = self.unity_env.step(actions)
+                step_index += 1
 
                 # Check if the environment is done (simulation ended)
                 if done:
                     self.done = True
 
                 # Display annotated frame (for debugging and visual monitoring)
-                cv2.imshow("Downward Camera View", annotated_frame)
-                cv2.moveWindow("Downward Camera View", 500, 250)
+                with span("display"):
+                    self.show(annotated_frame)
 
                 # Reset environment if done
                 if self.done:
                     observation = self.unity_env.reset()
+                self.instrumentation.frame()
 
-                # Exit on ESC key press
-                if cv2.waitKey(1) & 0xFF == 27:  # 27 is the ESC key ASCII code
+                # Exit on ESC key press, SIGINT/SIGTERM, trigger file or queue
+                if self.triggers.exit_requested:
                     break
 
         finally:
             # Close Unity environment and OpenCV windows properly at the end
             self.unity_env.close()
-            cv2.destroyAllWindows()
+            self.stop_io()
+            self.report_cascade()
+            self.report_gate()
+            self.report_scheduler()
+            self.instrumentation.close()
+
+    def control_step(self, frame, height, annotate):
+        """
+        Compute the control actions for a frame.
+
+        Returns:
+            tuple: (actions, annotated frame or None, detected pad centre or None).
+        """
+        actions, annotated_frame = self.controller.get_control_actions(frame, height, annotate)
+        return actions, annotated_frame, self.control.detection
+
+    def start_io(self):
+        """
+        Install the signal triggers and, unless headless, start the preview window.
+        """
+        self.triggers.install_signal_handlers()
+        if not self.headless:
+            self.preview = PreviewWindow(self.triggers)
+
+    def stop_io(self):
+        """
+        Close the preview window and restore the signal handlers.
+        """
+        if self.preview is not None:
+            self.preview.close()
+            self.preview = None
+        self.triggers.restore_signal_handlers()
+        if self.recorder is not None:
+            self.recorder.close()
+        for exporter in (self.exporter, self.raw_exporter):
+            if exporter is not None:
+                exporter.close()
+
+    def check_triggers(self):
+        """
+        Poll the command sources and enter emergency landing mode when requested.
+
+        Also renders the preview window when it must be drawn from the main thread (macOS).
+        """
+        if self.preview is not None:
+            self.preview.render()
+        self.triggers.poll()
+        if self.triggers.emergency_landing and not self.landing_in_progress:
+            self.landing_in_progress = True
+            print("Emergency landing mode activated!")
+
+    @property
+    def annotating(self):
+        """
+        bool: Whether annotated frames are wanted (for the preview window or the video export).
+        """
+        return self.preview is not None or self.exporter is not None
+
+    def show(self, frame):
+        """
+        Hand a frame to the preview window and the video export, if any. Never blocks the control loop.
+
+        Args:
+            frame (numpy.ndarray or None): Annotated frame.
+        """
+        if self.preview is not None:
+            self.preview.show(frame)
+        if self.exporter is not None:
+            self.exporter.write(frame)
+
+    def export_raw(self, frame):
+        """
+        Hand a camera frame to the raw video export, if any. Never blocks the control loop.
+
+        Args:
+            frame (IngestedFrame): Camera frame.
+        """
+        if self.raw_exporter is not None:
+            self.raw_exporter.write(frame)
+
+    def read_observation(self, observation):
+        """
+        Split an environment observation into the camera frame and the height.
+
+        The CHW RGB image is copied once into a reused HWC buffer; the BGR image is only
+        built if a detector or the annotation needs it.
+
+        Args:
+            observation (tuple): Observation returned by the Unity environment.
+
+        Returns:
+            tuple: (frame (IngestedFrame), height)
+        """
+        frame = self.ingest.ingest(observation[0])
+
+        # Extract position sensor data (e.g., height)
+        height = observation[1][1]
+        return frame, height
+
+    def run_pipelined(self):
+        """
+        Pipelined variant of `run`.
+
+        A worker thread runs `Control.get_control_actions` on frame t while the main
+        thread steps the environment with the actions computed for an earlier frame.
+        At most `max_staleness` frames separate the observation an action was computed
+        from and the step it is applied to; when the worker falls further behind the
+        main thread waits for it. Action latency is reported when the loop ends.
+        """
+        observation = self.unity_env.reset()
+        pending = deque()  # (frame index, observation time, future) in submission order
+        latencies = []  # (staleness in frames, latency in seconds) per applied action
+        actions = None
+        annotated_frame = None
+        detection = None
+        source_index = 0
+        step_index = 0
+        start_time = time.perf_counter()
+        span = self.instrumentation.span
+        self.start_io()
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while not self.done:
+                with span("observe"):
+                    frame, height = self.read_observation(observation)
+                    self.export_raw(frame)
+                observed_at = time.perf_counter()
+                future = executor.submit(
+                    self.control_step, frame, height, self.annotating
+                )
+                pending.append((step_index, observed_at, future))
+
+                # Take every finished result, and wait for those that would exceed the staleness bound
+                with span("wait"):
+                    while pending and (
+                        pending[0][2].done()
+                        or actions is None
+                        or step_index - pending[0][0] >= self.max_staleness
+                    ):
+                        frame_index, frame_time, future = pending.popleft()
+                        actions, annotated_frame, detection = future.result()
+                        source_index = frame_index
+                        latencies.append((step_index - frame_index, time.perf_counter() - frame_time))
+
+                # Check for emergency landing mode (key '0', SIGUSR1, trigger file or queue)
+                with span("triggers"):
+                    self.check_triggers()
+
+                step_actions = actions
+                if self.landing_in_progress:
+                    # If emergency landing mode is on, control the throttle to land; the worker
+                    # thread owns the Control state, so leave it untouched
+                    step_actions = [0.0, 0.0, 0.0, -Control.landing_throttle_at(height)]
+
+                if self.recorder is not None:
+                    with span("record"):
+                        self.recorder.record(step_index, frame, height, detection, step_actions, source_index)
+
+                # Step the environment while the worker processes the latest frame
+                with span("step"):
+                    observation, reward, done, info = self.unity_env.step(step_actions)
+                step_index += 1
+
+                if done:
+                    self.done = True
+
+                # Display annotated frame (for debugging and visual monitoring)
+                with span("display"):
+                    self.show(annotated_frame)
+
+                if self.done:
+                    observation = self.unity_env.reset()
+                self.instrumentation.frame()
+
+                # Exit on ESC key press, SIGINT/SIGTERM, trigger file or queue
+                if self.triggers.exit_requested:
+                    break
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.unity_env.close()
+            self.stop_io()
+            self.report_latency(latencies, step_index, time.perf_counter() - start_time)
+            self.report_cascade()
+            self.report_gate()
+            self.report_scheduler()
+            self.instrumentation.close()
+
+    def run_multirate(self):
+        """
+        Multi-rate variant of `run`.
+
+        A vision thread detects the pad on the newest frame at whatever rate the detector
+        allows. The main thread steps the environment at `control_rate` and computes the
+        commands every tick from the fresh height and the newest pad estimate
+        (`MultiRateController`). The age of the estimates is reported when the loop ends.
+        The newest annotated frame is exported once per tick, so the video plays in real time
+        whatever the vision rate.
+        """
+        observation = self.unity_env.reset()
+        controller = MultiRateController(self.control, self.max_estimate_age)
+        period = 1.0 / self.control_rate
+        step_index = 0
+        span = self.instrumentation.span
+        self.start_io()
+
+        annotated = LatestSlot()
+
+        def show_vision(frame):
+            if self.preview is not None:
+                self.preview.show(frame)
+            if self.exporter is not None:
+                # The annotator reuses its buffers; keep a copy for the control thread to export
+                annotated.write(frame.copy())
+
+        vision = VisionThread(self.control, controller.estimates, show_vision if self.annotating else None)
+        start_time = next_tick = time.perf_counter()
+        try:
+            while not self.done:
+                with span("observe"):
+                    observed_at = time.perf_counter()
+                    height = observation[1][1]
+                    frame = vision.submit(observation[0], height, step_index, observed_at)
+                    self.export_raw(frame)
+
+                # Check for emergency landing mode (key '0', SIGUSR1, trigger file or queue)
+                with span("triggers"):
+                    self.check_triggers()
+
+                if self.landing_in_progress:
+                    # If emergency landing mode is on, control the throttle to land; the worker
+                    # thread owns the Control state, so leave it untouched
+                    actions = [0.0, 0.0, 0.0, -Control.landing_throttle_at(height)]
+                    detection = None
+                else:
+                    with span("control"):
+                        actions = controller.tick(height, observed_at)
+                    detection = self.control.detection
+                if self.exporter is not None:
+                    self.exporter.write(annotated.read())
+
+                if self.recorder is not None:
+                    with span("record"):
+                        self.recorder.record(step_index, frame, height, detection, actions,
+                                             max(controller.last_seq, 0))
+
+                with span("step"):
+                    observation, reward, done, info = self.unity_env.step(actions)
+                step_index += 1
+
+                if done:
+                    self.done = True
+                if self.done:
+                    observation = self.unity_env.reset()
+                self.instrumentation.frame()
+
+                # Exit on ESC key press, SIGINT/SIGTERM, trigger file or queue
+                if self.triggers.exit_requested:
+                    break
+
+                # Hold the control rate; when running late, start the next tick right away
+                next_tick += period
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    with span("wait"):
+                        time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()
+
+        finally:
+            vision.close()
+            self.unity_env.close()
+            self.stop_io()
+            self.report_multirate(vision, controller, time.perf_counter() - start_time)
+            self.report_cascade()
+            self.report_gate()
+            self.instrumentation.close()
+
+    def report_multirate(self, vision, controller, elapsed):
+        """
+        Print the rates of the control and vision stages and the age of the estimates.
+        """
+        stats = controller.stats()
+        print(f"Control ticks: {stats['ticks']} in {elapsed:.1f} s ({stats['ticks'] / elapsed:.1f} Hz), "
+              f"{stats['fresh_ticks']} with a new estimate")
+        print(f"Vision: {vision.processed} frames detected ({vision.processed / elapsed:.1f} Hz), "
+              f"{vision.dropped} skipped")
+        if stats["mean_age_ms"] is not None:
+            print(f"Estimate age when used: mean {stats['mean_age_ms']:.1f} ms, max {stats['max_age_ms']:.1f} ms")
+
+    def report_cascade(self):
+        """
+        Print the stage counters of the cascade detector, if it is used.
+        """
+        if self.control.cascade is not None:
+            stats = self.control.cascade.stats()
+            print(f"Cascade: OpenCV hit rate {stats['cv_hit_rate']:.2f}, "
+                  f"escalation rate {stats['escalation_rate']:.2f}, counters {stats}")
+
+    def report_gate(self):
+        """
+        Print the hit rate of the frame gate, if it is used.
+        """
+        if self.control.gate is not None:
+            stats = self.control.gate.stats()
+            print(f"Frame gate: {stats['hits']} detections reused, {stats['misses']} run "
+                  f"({stats['forced']} forced by age), hit rate {stats['hit_rate'] or 0:.2f}, "
+                  f"bypassed on {stats['bypassed']} frames (gate slower than the detector)")
+
+    def report_scheduler(self):
+        """
+        Print the degradation levels used by the scheduler, if any.
+        """
+        if self.scheduler is not None:
+            self.scheduler.report()
+
+    def report_latency(self, latencies, steps, elapsed):
+        """
+        Print the control rate and the age of the applied actions.
+
+        Args:
+            latencies (list): (staleness in frames, latency in seconds) per applied action.
+            steps (int): Number of environment steps taken.
+            elapsed (float): Wall-clock duration of the loop in seconds.
+        """
+        if not latencies or elapsed <= 0:
+            return
+
+        staleness = np.array([frames for frames, _ in latencies])
+        seconds = np.array([latency for _, latency in latencies]) * 1000
+        print(f"Control cycles: {steps} in {elapsed:.1f} s ({steps / elapsed:.1f} Hz)")
+        print(f"Action staleness: mean {staleness.mean():.2f} frames, max {staleness.max()} frames")
+        print(f"Action latency: mean {seconds.mean():.1f} ms, "
+              f"p95 {np.percentile(seconds, 95):.1f} ms, max {seconds.max():.1f} ms")
 
 
 if __name__ == "__main__":
-    # Initialize the Main class and run the simulation
+    parser = argparse.ArgumentParser(description="Autonomous drone landing in the Unity simulation.")
+    parser.add_argument("--env", default="./simulations/linux_build/Linux_Simulation.x86_64",
+                        help="Path to the Unity simulation build.")
+    parser.add_argument("--kinematic", action="store_true",
+                        help="Use the built-in kinematic simulator instead of the Unity build.")
+    parser.add_argument("--detector", choices=sorted(Control.DETECTORS), default="cv",
+                        help="Landing pad detector; only its backend is loaded.")
+    parser.add_argument("--segmentation", choices=["hsv", "lut"], default="hsv",
+                        help="Pad colour segmentation: HSV conversion or precomputed lookup table.")
+    parser.add_argument("--yolo-backend", choices=["ultralytics", "onnx"], default="ultralytics",
+                        help="YOLO inference backend; 'onnx' runs the exported model with ONNX Runtime.")
+    parser.add_argument("--cascade-fallback", choices=["yolo", "ocr"], default="yolo",
+                        help="With --detector cascade, the detector run when OpenCV is unsure.")
+    parser.add_argument("--track", action="store_true",
+                        help="Follow the pad with a Kalman tracker that predicts it between detections.")
+    parser.add_argument("--detect-every", type=int, default=1,
+                        help="With --track, run the detector on one frame out of N.")
+    parser.add_argument("--gate", action="store_true",
+                        help="Reuse the last detection, shifted, on frames that barely changed "
+                             "(for expensive detectors: yolo, ocr, cascade).")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Time each stage of the control loop and print the latencies at exit.")
+    parser.add_argument("--deadline-ms", type=float,
+                        help="With --instrument, count the frames longer than this budget.")
+    parser.add_argument("--stats-file",
+                        help="With --instrument, write the stage latencies to this JSON file.")
+    parser.add_argument("--stats-every", type=float, default=0.0,
+                        help="With --stats-file, also rewrite it every N seconds.")
+    parser.add_argument("--profile-frames", metavar="FIRST:COUNT",
+                        help="With --instrument, run the sampling profiler over COUNT frames from frame FIRST.")
+    parser.add_argument("--profile-file", default="profile.collapsed",
+                        help="Collapsed-stack output of the sampling profiler.")
+    parser.add_argument("--target-rate", type=float,
+                        help="Control rate in Hz to hold by skipping detections, using a cheaper detector, "
+                             "a lower resolution or no annotation when running late.")
+    parser.add_argument("--record", metavar="LOG",
+                        help="Record every step (frame, height, detection, actions) to a flight log "
+                             "for replay with scripts/flight_recorder.py.")
+    parser.add_argument("--control-rate", type=float,
+                        help="Run detection in its own thread and compute the commands at this fixed "
+                             "rate in Hz from the newest pad estimate and the current height.")
+    parser.add_argument("--max-estimate-age", type=float, default=0.5,
+                        help="With --control-rate, age in seconds beyond which a pad estimate is not used.")
+    parser.add_argument("--export", metavar="FILE",
+                        help="Export the annotated frames to a video (.mp4, .avi, .mkv) or GIF file.")
+    parser.add_argument("--export-raw", metavar="FILE",
+                        help="Export the raw camera frames to a video or GIF file.")
+    parser.add_argument("--export-scale", type=float, default=1.0,
+                        help="Size of the exported frames relative to the camera frames.")
+    parser.add_argument("--export-every", type=int, default=1,
+                        help="Export one frame out of N.")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Overlap detection with the environment step.")
+    parser.add_argument("--max-staleness", type=int, default=1,
+                        help="Maximum age in frames of the actions applied in pipelined mode.")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without OpenCV windows (use SIGUSR1 / --trigger-file for commands).")
+    parser.add_argument("--trigger-file",
+                        help='File polled for commands: write "land" or "exit" into it.')
+    args = parser.parse_args()
+
+    instrumentation = Instrumentation(
+        enabled=args.instrument,
+        deadline=args.deadline_ms / 1000 if args.deadline_ms else None,
+        stats_path=args.stats_file,
+        dump_every=args.stats_every,
+        profile_frames=tuple(map(int, args.profile_frames.split(":"))) if args.profile_frames else None,
+        profile_path=args.profile_file,
+    )
 
-    app = Main("./simulations/linux_build/Linux_Simulation.x86_64")  # for Linux
-    # app = Main("./simulations/macos_build/MacOS_Simulation.app")  # for MacOS
-    # app = Main("./simulations/windows_build/Xerox_UAV.exe")         # for Windows
+    # Initialize the Main class and run the simulation
+    # --env ./simulations/linux_build/Linux_Simulation.x86_64  # for Linux
+    # --env ./simulations/macos_build/MacOS_Simulation.app     # for MacOS
+    # --env ./simulations/windows_build/Xerox_UAV.exe          # for Windows
+    app = Main(args.env, pipelined=args.pipelined, max_staleness=args.max_staleness,
+               headless=args.headless, trigger_file=args.trigger_file, detector=args.detector,
+               cascade_fallback=args.cascade_fallback,
+               env=KinematicDroneSimulator() if args.kinematic else None, segmentation=args.segmentation,
+               yolo_backend=args.yolo_backend, track=args.track, detect_every=args.detect_every,
+               instrumentation=instrumentation, target_rate=args.target_rate, record=args.record,
+               gate=args.gate, control_rate=args.control_rate, export=args.export,
+               export_raw=args.export_raw, export_scale=args.export_scale, export_every=args.export_every,
+               max_estimate_age=args.max_estimate_age)
 
     app.run()
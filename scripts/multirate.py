@@ -0,0 +1,280 @@
+import threading
+import time
+from collections import deque
+
+from frame_ingest import IngestedFrame
+
+
+class Estimate:
+    """
+    A pad estimate published by the vision stage, with the timestamps of its frame.
+    """
+
+    __slots__ = ("seq", "frame_time", "time", "result")
+
+    def __init__(self, seq, frame_time, result):
+        """
+        Args:
+            seq (int): Index of the frame the estimate was computed from.
+            frame_time (float): `time.perf_counter()` when that frame was observed.
+            result (DetectionResult): Detector output on that frame.
+        """
+        self.seq = seq
+        self.frame_time = frame_time
+        self.time = time.perf_counter()  # Publication time
+        self.result = result
+
+
+class LatestSlot:
+    """
+    Latest-value slot between one writer and any number of readers.
+
+    Writing replaces the value and reading returns the newest one; older values are simply
+    dropped. Replacing a reference is atomic in CPython, so neither side takes a lock.
+    """
+
+    def __init__(self):
+        self.value = None
+        self.writes = 0
+
+    def write(self, value):
+        self.value = value
+        self.writes += 1
+
+    def read(self):
+        return self.value
+
+
+class VisionThread:
+    """
+    Vision stage: detects the pad on the newest frame, at whatever rate the detector allows.
+
+    `submit` hands over a frame without waiting; a frame still waiting when the next one
+    arrives is dropped. Each detection is published to `estimates` as an `Estimate`.
+    The frames live in a small pool of reused buffers, so the caller never writes into the
+    frame being detected.
+    """
+
+    def __init__(self, control, estimates, annotate=None):
+        """
+        Args:
+            control (Control): Controller whose detector runs in this thread (its `detect_result`
+                only; the tracker and the commands stay with the control stage).
+            estimates (LatestSlot): Slot the estimates are published to.
+            annotate (callable or None): Called with each annotated frame (e.g. `PreviewWindow.show`),
+                or None to skip the annotation.
+        """
+        self.control = control
+        self.estimates = estimates
+        self.annotate = annotate
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+
+        # One frame being loaded, one waiting and one being detected
+        self._free = [IngestedFrame() for _ in range(3)]
+        self._pending = None  # (frame, height, seq, frame_time)
+        self._running = True
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="vision", daemon=True)
+        self._thread.start()
+
+    def submit(self, chw, height, seq, frame_time):
+        """
+        Copy an observation into a free buffer and make it the next frame to detect. Never blocks
+        on the detector.
+
+        Args:
+            chw (numpy.ndarray): (channels, height, width) uint8 RGB image.
+            height (float): Altitude at the observation.
+            seq (int): Frame index.
+            frame_time (float): `time.perf_counter()` at the observation.
+
+        Returns:
+            IngestedFrame: The loaded frame (valid until the next `submit`).
+        """
+        with self._condition:
+            if self._pending is not None:
+                # Replace the frame the detector has not started on
+                frame = self._pending[0]
+                self._pending = None
+                self.dropped += 1
+            else:
+                frame = self._free.pop()
+        frame.load(chw)
+        with self._condition:
+            self._pending = (frame, height, seq, frame_time)
+            self.submitted += 1
+            self._condition.notify()
+        return frame
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                frame, height, seq, frame_time = self._pending
+                self._pending = None
+
+            result = self.control.detect_result(frame, height)
+            self.estimates.write(Estimate(seq, frame_time, result))
+            if self.annotate is not None:
+                self.annotate(self.control.annotate(result))
+            self.processed += 1
+
+            with self._condition:
+                self._free.append(frame)
+
+    def close(self):
+        """
+        Stop the thread once the current detection is done.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+
+
+class MultiRateController:
+    """
+    Control stage: computes the commands every tick from the fresh height and the newest
+    pad estimate of the vision stage, however old.
+
+    On a tick with a new estimate, the commands are those of `Control.compute_actions`. In
+    between, the tracker (if the controller has one) predicts the pad from the commands
+    and the commands follow the prediction; without a tracker, roll and pitch are held at
+    zero rather than repeating a correction already applied, and a descent continues with
+    the throttle of the current height. Estimates older than `max_age` are not used.
+
+    An estimate describes the pad when its frame was observed, some ticks ago. With a
+    tracker and `compensate`, the track is rewound to the tick of that frame, corrected
+    there, and predicted forward again with the commands of the ticks since, so the
+    pipeline delay does not lag the track.
+    """
+
+    def __init__(self, control, max_age=0.5, compensate=True):
+        """
+        Args:
+            control (Control): Controller providing the command logic (and the tracker, if any).
+            max_age (float): Age in seconds beyond which an estimate is ignored.
+            compensate (bool): Apply tracker measurements at the tick of their frame (see above).
+        """
+        self.control = control
+        self.max_age = max_age
+        self.compensate = compensate
+        # [tick time, track, state, covariance, actions, height] of the tracker after each tick's prediction
+        self.history = deque(maxlen=256)
+        self.estimates = LatestSlot()
+        self.last_seq = -1
+        self.image_center = None
+        self.age = None  # Age of the newest estimate at the last tick, in seconds
+        self.ages = []  # Age of each new estimate when first used
+        self.ticks = 0
+        self.fresh_ticks = 0
+
+    def tick(self, height, now=None):
+        """
+        Compute the commands of one control tick.
+
+        Args:
+            height (float): Current altitude.
+            now (float or None): `time.perf_counter()` of the tick (default: now).
+
+        Returns:
+            list: Control actions [roll, pitch, yaw, throttle].
+        """
+        control = self.control
+        tracker = control.tracker
+        now = time.perf_counter() if now is None else now
+        self.ticks += 1
+        if tracker is not None:
+            # The actions of the previous tick were applied since then
+            actions = list(control.actions)
+            tracker.predict(actions, height)
+            if self.image_center is not None:
+                tracker.expire((2 * self.image_center[0], 2 * self.image_center[1]))
+            if tracker.initialized:
+                self.history.append([now, tracker.tracks, tracker.x.copy(), tracker.P.copy(), actions, height])
+
+        estimate = self.estimates.read()
+        fresh = False
+        if estimate is not None:
+            self.image_center = estimate.result.image_center
+            self.age = now - estimate.frame_time
+            fresh = estimate.seq != self.last_seq and self.age <= self.max_age
+        if fresh:
+            self.last_seq = estimate.seq
+            self.fresh_ticks += 1
+            self.ages.append(self.age)
+            if tracker is not None and estimate.result.center is not None:
+                self.update_tracker(estimate)
+
+        if tracker is not None and tracker.center is not None and (
+                fresh or tracker.uncertainty <= control.max_uncertainty):
+            center = tracker.center
+        elif fresh:
+            center = estimate.result.center
+        else:
+            return self.hold(height)
+        control.detection = center
+        return control.compute_actions(self.image_center, center, height)
+
+    def update_tracker(self, estimate):
+        """
+        Correct the tracker with an estimate, at the tick its frame was observed.
+
+        The tracker state predicted for that tick is restored and updated, then the later
+        ticks are predicted again with the commands and heights they used.
+        """
+        tracker = self.control.tracker
+        history = self.history
+        start = None
+        if self.compensate and tracker.initialized:
+            for index in range(len(history) - 1, -1, -1):
+                tick_time, track = history[index][:2]
+                if track != tracker.tracks:
+                    break
+                if tick_time <= estimate.frame_time + 1e-9:
+                    start = index
+                    break
+        if start is None or start == len(history) - 1:
+            tracker.update(estimate.result.center)
+            return
+
+        tracker.x, tracker.P = history[start][2].copy(), history[start][3].copy()
+        tracker.update(estimate.result.center)
+        for index in range(start + 1, len(history)):
+            entry = history[index]
+            tracker.predict(entry[4], entry[5])
+            entry[1], entry[2], entry[3] = tracker.tracks, tracker.x.copy(), tracker.P.copy()
+
+    def hold(self, height):
+        """
+        Commands of a tick without usable estimate: no roll or pitch, and the current throttle
+        (updated for the height when descending).
+
+        Returns:
+            list: Control actions [roll, pitch, yaw, throttle].
+        """
+        control = self.control
+        throttle = control.actions[3]
+        if throttle < 0:
+            throttle = -control.throttle_control(height)
+        control.detection = None
+        control.actions = [0.0, 0.0, 0.0, throttle]
+        return control.actions
+
+    def stats(self):
+        """
+        Returns:
+            dict: Ticks, ticks with a new estimate, and the age of the estimates when used.
+        """
+        ages = sorted(self.ages)
+        return {
+            "ticks": self.ticks,
+            "fresh_ticks": self.fresh_ticks,
+            "mean_age_ms": 1000 * sum(ages) / len(ages) if ages else None,
+            "max_age_ms": 1000 * ages[-1] if ages else None,
+        }
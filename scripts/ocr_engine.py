@@ -0,0 +1,180 @@
+import importlib.util
+import multiprocessing
+
+import numpy as np
+
+
+class OCREngine:
+    """
+    Long-lived OCR worker process.
+
+    The worker initialises Tesseract once through the `tesserocr` bindings to the Tesseract
+    library and then serves recognition requests sent over a pipe, so no process is spawned
+    per frame. Recognition is restricted to the characters in `whitelist`. Without
+    `tesserocr` there is no persistent engine to keep; use `RegionOCR` instead (see
+    `load_engine`).
+    """
+
+    def __init__(self, whitelist="H", psm=6):
+        """
+        Args:
+            whitelist (str): Characters Tesseract may recognise.
+            psm (int): Tesseract page segmentation mode.
+        """
+        # "spawn" avoids forking a process that runs other threads (preview, pipelined worker)
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child_conn, whitelist, psm), name="ocr-engine",
+                                        daemon=True)
+        self._process.start()
+        child_conn.close()
+
+        status, detail = self._conn.recv()
+        if status != "ok":
+            self.close()
+            raise RuntimeError(f"OCR engine failed to start: {detail}")
+        self.backend = detail
+
+    def image_to_boxes(self, image):
+        """
+        Recognise characters in a grayscale image.
+
+        Args:
+            image (numpy.ndarray): 2-D uint8 image.
+
+        Returns:
+            list: (char, x_min, y_min, x_max, y_max) boxes in image coordinates (origin top-left).
+        """
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        self._conn.send(image.shape)
+        self._conn.send_bytes(memoryview(image).cast("B"))
+        status, result = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def close(self):
+        """
+        Stop the worker process.
+        """
+        if self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._conn.close()
+
+
+class RegionOCR:
+    """
+    In-process `pytesseract` recognition with the same interface as `OCREngine`.
+
+    Each call still starts one `tesseract` process, so nothing is kept warm; only the
+    restriction to the pad region and to the characters in `whitelist` is kept.
+    """
+
+    backend = "pytesseract"
+
+    def __init__(self, whitelist="H", psm=6):
+        """
+        Args:
+            whitelist (str): Characters Tesseract may recognise.
+            psm (int): Tesseract page segmentation mode.
+        """
+        self.recognize = _pytesseract_recognizer(whitelist, psm)
+
+    def image_to_boxes(self, image):
+        """
+        Recognise characters in a grayscale image.
+
+        Args:
+            image (numpy.ndarray): 2-D uint8 image.
+
+        Returns:
+            list: (char, x_min, y_min, x_max, y_max) boxes in image coordinates (origin top-left).
+        """
+        try:
+            return self.recognize(np.ascontiguousarray(image, dtype=np.uint8))
+        except Exception as e:
+            raise RuntimeError(f"{type(e).__name__}: {e}") from e
+
+    def close(self):
+        pass
+
+
+def load_engine(whitelist="H", psm=6):
+    """
+    Start the persistent `OCREngine` if `tesserocr` is installed, otherwise fall back to `RegionOCR`.
+
+    Returns:
+        OCREngine or RegionOCR: Object with an `image_to_boxes` method.
+    """
+    if importlib.util.find_spec("tesserocr") is None:
+        print("tesserocr is not installed: OCR starts one tesseract process per frame (no persistent engine).")
+        return RegionOCR(whitelist, psm)
+    return OCREngine(whitelist, psm)
+
+
+def _serve(conn, whitelist, psm):
+    try:
+        recognize = _tesserocr_recognizer(whitelist, psm)
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ok", "tesserocr"))
+
+    while True:
+        try:
+            shape = conn.recv()
+        except EOFError:
+            break
+        if shape is None:
+            break
+        data = conn.recv_bytes()
+        try:
+            image = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+            conn.send(("ok", recognize(image)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _tesserocr_recognizer(whitelist, psm):
+    from tesserocr import RIL, PyTessBaseAPI, iterate_level
+
+    api = PyTessBaseAPI(psm=psm)
+    api.SetVariable("tessedit_char_whitelist", whitelist)
+
+    def recognize(image):
+        height, width = image.shape
+        api.SetImageBytes(image.tobytes(), width, height, 1, width)
+        api.Recognize()
+        boxes = []
+        for symbol in iterate_level(api.GetIterator(), RIL.SYMBOL):
+            char = symbol.GetUTF8Text(RIL.SYMBOL)
+            box = symbol.BoundingBox(RIL.SYMBOL)
+            if char and box:
+                boxes.append((char.strip(), *box))
+        return boxes
+
+    return recognize
+
+
+def _pytesseract_recognizer(whitelist, psm):
+    import pytesseract
+
+    pytesseract.get_tesseract_version()  # Fail now if the binary is missing
+    config = f"--psm {psm} -c tessedit_char_whitelist={whitelist}"
+
+    def recognize(image):
+        height = image.shape[0]
+        boxes = []
+        for line in pytesseract.image_to_boxes(image, config=config).splitlines():
+            char, x_min, y_min, x_max, y_max = line.split()[:5]
+            # Tesseract boxes have their origin at the bottom-left
+            boxes.append((char, int(x_min), height - int(y_max), int(x_max), height - int(y_min)))
+        return boxes
+
+    return recognize
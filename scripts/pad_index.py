@@ -0,0 +1,208 @@
+import functools
+import math
+
+
+class PadCandidate:
+    """
+    A pad-shaped contour, with the geometry it is scored on.
+    """
+
+    __slots__ = ("center", "approx", "contour", "area", "squareness", "fill", "score")
+
+    def __init__(self, center, approx, contour, area, squareness, fill):
+        """
+        Args:
+            center (list): [x, y] centroid, in full-resolution pixels.
+            approx (numpy.ndarray): 4-point outline, as returned by `cv2.approxPolyDP`.
+            contour (numpy.ndarray): Contour the outline was fitted to.
+            area (float): Contour area, in full-resolution pixels.
+            squareness (float): Short over long side of the minimum-area rectangle (1 for a square).
+            fill (float): Contour area over the area of that rectangle (1 for a full rectangle).
+        """
+        self.center = center
+        self.approx = approx
+        self.contour = contour
+        self.area = area
+        self.squareness = squareness
+        self.fill = fill
+        self.score = squareness * fill
+
+    def __repr__(self):
+        return (f"PadCandidate(center={self.center}, area={self.area:.0f}, squareness={self.squareness:.2f}, "
+                f"fill={self.fill:.2f})")
+
+
+@functools.lru_cache(maxsize=None)
+def ring_offsets(ring):
+    """
+    Returns:
+        tuple: (column, row) offsets of the cells at Chebyshev distance `ring` from a cell.
+    """
+    if ring == 0:
+        return ((0, 0),)
+    return tuple((dc, dr) for dc in range(-ring, ring + 1) for dr in range(-ring, ring + 1)
+                 if max(abs(dc), abs(dr)) == ring)
+
+
+class GridIndex:
+    """
+    Uniform grid over image points, for nearest-neighbour queries that only look at the
+    cells around the query point.
+    """
+
+    def __init__(self, cell):
+        """
+        Args:
+            cell (float): Cell side, in pixels.
+        """
+        self.cell = cell
+        self.cells = {}
+        self.points = []
+        self.bounds = None  # (min column, min row, max column, max row) of the occupied cells
+
+    def build(self, points):
+        """
+        Index a new set of [x, y] points, replacing the previous ones.
+        """
+        self.cells.clear()
+        self.points = points
+        for i, (x, y) in enumerate(points):
+            self.cells.setdefault((int(x // self.cell), int(y // self.cell)), []).append(i)
+        if self.cells:
+            columns = [key[0] for key in self.cells]
+            rows = [key[1] for key in self.cells]
+            self.bounds = (min(columns), min(rows), max(columns), max(rows))
+        else:
+            self.bounds = None
+
+    def nearest(self, point, max_distance=None, exclude=()):
+        """
+        Find the indexed point nearest to `point`.
+
+        Rings of cells are searched outwards until no unvisited cell can hold a nearer point.
+
+        Args:
+            point (list): [x, y] query point.
+            max_distance (float or None): Ignore points farther than this.
+            exclude (set): Indices of points to ignore.
+
+        Returns:
+            int or None: Index of the nearest point, or None.
+        """
+        if self.bounds is None:
+            return None
+        x, y = point
+        cell = self.cell
+        column, row = int(x // cell), int(y // cell)
+        x0, y0, x1, y1 = self.bounds
+        last_ring = max(column - x0, x1 - column, row - y0, y1 - row)
+        if max_distance is not None:
+            last_ring = min(last_ring, int(math.ceil(max_distance / cell)))
+        cells, points = self.cells, self.points
+        best, best_distance = None, math.inf if max_distance is None else max_distance ** 2
+        for ring in range(last_ring + 1):
+            # Points in this ring and beyond are at least `ring - 1` cells away
+            if best is not None and best_distance <= ((ring - 1) * cell) ** 2:
+                break
+            for dc, dr in ring_offsets(ring):
+                for i in cells.get((column + dc, row + dr), ()):
+                    if i in exclude:
+                        continue
+                    px, py = points[i]
+                    distance = (px - x) ** 2 + (py - y) ** 2
+                    if distance <= best_distance:
+                        best, best_distance = i, distance
+        return best
+
+
+class PadIndex:
+    """
+    Pads seen during a flight, with the pad being approached.
+
+    Each frame, the candidates are associated with the known pads: each pad, the target
+    first, takes the nearest unclaimed candidate within `max_distance` pixels of where it
+    was last seen, and the remaining candidates become new pads. Pads not seen for
+    `max_age` frames are forgotten. The target stays on the same pad as long as it is
+    associated; when it is lost, the candidate nearest the expected position (e.g.
+    `Control.last_rectangle_center`) is taken, or the best-scoring one without an expected
+    position. The candidates are held in a `GridIndex`, so each lookup only visits the
+    cells around its point.
+    """
+
+    def __init__(self, max_distance=80.0, max_age=15):
+        """
+        Args:
+            max_distance (float): Largest image motion of a pad between two frames, in pixels.
+            max_age (int): Frames after which an unseen pad is forgotten.
+        """
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.pads = {}  # Pad id -> [center, frame last seen]
+        self.grid = GridIndex(max_distance)  # Candidates of the current frame
+        self.frame = 0
+        self.next_id = 0
+        self.target = None  # Id of the pad being approached
+        self.switches = 0  # Times the target moved to another pad while still known
+
+    def associate(self, candidates):
+        """
+        Match the candidates of a new frame with the known pads.
+
+        Args:
+            candidates (list): `PadCandidate`s of the frame.
+
+        Returns:
+            list: Pad id of each candidate.
+        """
+        self.frame += 1
+        self.grid.build([candidate.center for candidate in candidates])
+        ids = [None] * len(candidates)
+        claimed = set()
+        pads = sorted(self.pads, key=lambda pad: pad != self.target)
+        for pad in pads:
+            i = self.grid.nearest(self.pads[pad][0], self.max_distance, claimed)
+            if i is not None:
+                claimed.add(i)
+                ids[i] = pad
+        for i, candidate in enumerate(candidates):
+            if ids[i] is None:
+                ids[i] = self.next_id
+                self.next_id += 1
+            self.pads[ids[i]] = [candidate.center, self.frame]
+
+        for pad in [pad for pad, (_, seen) in self.pads.items() if self.frame - seen > self.max_age]:
+            del self.pads[pad]
+        return ids
+
+    def select(self, candidates, ids, expected=None):
+        """
+        Choose the candidate of the pad being approached, and make its pad the target.
+
+        Args:
+            candidates (list): `PadCandidate`s of the frame (as passed to `associate`), best score first.
+            ids (list): Their pad ids, from `associate`.
+            expected (list or None): [x, y] position where the pad is expected.
+
+        Returns:
+            tuple: (index of the chosen candidate, whether it continues the previous target).
+        """
+        if self.target in ids:
+            return ids.index(self.target), True
+        index = 0
+        if expected is not None and len(candidates) > 1:
+            index = self.grid.nearest(expected)
+        if self.target is not None and self.target in self.pads:
+            self.switches += 1
+        self.target = ids[index]
+        return index, False
+
+    def reset(self):
+        """
+        Forget every pad and clear the counters, e.g. at the start of a new flight.
+        """
+        self.pads.clear()
+        self.grid.build([])
+        self.target = None
+        self.frame = 0
+        self.next_id = 0
+        self.switches = 0
@@ -0,0 +1,152 @@
+import numpy as np
+
+
+class PadTracker:
+    """
+    Constant-velocity Kalman filter of the landing pad centre in image space.
+
+    The state is `[x, y, vx, vy]` in pixels and pixels per frame. Between detections the
+    centre is predicted from its velocity, which relaxes towards the image motion caused
+    by the commanded roll and pitch; detections correct the estimate. The position
+    uncertainty tells the caller when a fresh detection is needed, and `expire` drops a
+    track that has coasted too long or out of the image, so a lost pad is not chased.
+    """
+
+    def __init__(self, process_noise=2.0, measurement_noise=3.0, command_gain=0.0, command_response=0.25,
+                 max_innovation=5.0, max_coast=15):
+        """
+        Args:
+            process_noise (float): Standard deviation of the unmodelled acceleration, in pixels per frame².
+            measurement_noise (float): Standard deviation of a detected centre, in pixels.
+            command_gain (float): Image motion of the pad at a full roll/pitch command, in pixels
+                per frame at 1 m altitude (0 disables the command input).
+            command_response (float): Fraction of the gap between the current and the commanded
+                image velocity closed each frame.
+            max_innovation (float): Detections further than this many standard deviations from the
+                prediction restart the track instead of updating it.
+            max_coast (int): Predictions without detection after which `expire` drops the track.
+        """
+        self.command_gain = command_gain
+        self.command_response = command_response if command_gain else 0.0
+        self.max_innovation = max_innovation
+        self.max_coast = max_coast
+        self.tracks = 0  # Tracks started so far; identifies the current one
+        self.drops = 0  # Tracks dropped by `expire`
+
+        decay = 1.0 - self.command_response
+        self.F = np.array([
+            [1.0, 0.0, decay, 0.0],
+            [0.0, 1.0, 0.0, decay],
+            [0.0, 0.0, decay, 0.0],
+            [0.0, 0.0, 0.0, decay],
+        ])
+        self.H = np.eye(2, 4)
+        # Piecewise-constant acceleration noise
+        g = np.array([[0.5, 0.0], [0.0, 0.5], [1.0, 0.0], [0.0, 1.0]])
+        self.Q = process_noise ** 2 * g @ g.T
+        self.R = measurement_noise ** 2 * np.eye(2)
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the track.
+        """
+        self.x = np.zeros(4)
+        self.P = np.eye(4)
+        self.initialized = False
+        self.steps_since_update = 0
+
+    @property
+    def center(self):
+        """
+        list or None: Estimated [x, y] pad centre in pixels (None before the first detection).
+        """
+        if not self.initialized:
+            return None
+        return [int(round(self.x[0])), int(round(self.x[1]))]
+
+    @property
+    def uncertainty(self):
+        """
+        float: Standard deviation of the estimated centre along its least certain axis, in pixels.
+        """
+        if not self.initialized:
+            return np.inf
+        return float(np.sqrt(np.linalg.eigvalsh(self.P[:2, :2])[-1]))
+
+    def predict(self, actions=None, altitude=None):
+        """
+        Advance the track by one frame.
+
+        Args:
+            actions (list or None): [roll, pitch, yaw, throttle] commanded during the frame.
+            altitude (float or None): Current altitude, to scale the command input.
+
+        Returns:
+            list or None: Predicted [x, y] pad centre.
+        """
+        if not self.initialized:
+            return None
+
+        self.x = self.F @ self.x
+        if actions is not None and self.command_response:
+            # Rolling right moves the pad left in the image; pitching forward moves it down.
+            gain = self.command_gain / max(altitude, 0.1) if altitude else self.command_gain
+            self.x[:2] += self.command_response * gain * np.array([-actions[0], actions[1]])
+            self.x[2:] += self.command_response * gain * np.array([-actions[0], actions[1]])
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        self.steps_since_update += 1
+        return self.center
+
+    def expire(self, frame_size=None):
+        """
+        Drop the track if it has been predicted more than `max_coast` times without
+        detection, or if its centre has left the frame.
+
+        Args:
+            frame_size (tuple or None): (width, height) of the frame, in pixels.
+
+        Returns:
+            bool: Whether the track was dropped.
+        """
+        if not self.initialized:
+            return False
+        x, y = self.x[:2]
+        outside = frame_size is not None and not (0 <= x < frame_size[0] and 0 <= y < frame_size[1])
+        if self.steps_since_update <= self.max_coast and not outside:
+            return False
+        self.reset()
+        self.drops += 1
+        return True
+
+    def update(self, measurement):
+        """
+        Correct the track with a detected pad centre.
+
+        Args:
+            measurement (list): Detected [x, y] pad centre.
+
+        Returns:
+            list: Updated [x, y] pad centre.
+        """
+        z = np.asarray(measurement, dtype=float)
+        if not self.initialized:
+            self.x = np.array([z[0], z[1], 0.0, 0.0])
+            self.P = np.diag([self.R[0, 0], self.R[1, 1], 100.0, 100.0])
+            self.initialized = True
+            self.tracks += 1
+            self.steps_since_update = 0
+            return self.center
+
+        innovation = z - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        if innovation @ np.linalg.solve(S, innovation) > self.max_innovation ** 2:
+            # The detection does not fit the motion model (e.g. another pad): restart on it.
+            self.initialized = False
+            return self.update(measurement)
+
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ innovation
+        self.P = (np.eye(4) - K @ self.H) @ self.P
+        self.steps_since_update = 0
+        return self.center
@@ -0,0 +1,126 @@
+import sys
+import threading
+
+import cv2
+import numpy as np
+
+from triggers import Triggers
+
+
+class PreviewWindow:
+    """
+    Preview window that renders only the latest annotated frame.
+
+    `show` never blocks: it replaces any frame that has not been rendered yet, so a
+    slow display drops frames instead of slowing the control loop. Key presses in the
+    window are forwarded to the triggers ('0' for emergency landing, ESC to exit).
+
+    The window is rendered by a display thread, except on macOS, where HighGUI only works
+    from the main thread: there, the main loop calls `render` once per iteration, and only
+    the hand-off of the frames stays asynchronous.
+    """
+
+    def __init__(self, triggers, window_name="Downward Camera View", position=(500, 250), threaded=None):
+        """
+        Args:
+            triggers (Triggers): Receives the commands issued from the keyboard.
+            window_name (str): Title of the OpenCV window.
+            position (tuple): (x, y) position of the window on screen.
+            threaded (bool or None): Render from a display thread (default: everywhere but macOS).
+        """
+        self.triggers = triggers
+        self.window_name = window_name
+        self.position = position
+        self.threaded = sys.platform != "darwin" if threaded is None else threaded
+        self.rendered_frames = 0
+        self.dropped_frames = 0
+
+        self._frame = None
+        self._buffers = [None, None]  # Double buffer: one being filled, one being rendered
+        self._rendering = None
+        self._running = True
+        self._moved = False
+        self._condition = threading.Condition()
+        self._thread = None
+        if self.threaded:
+            self._thread = threading.Thread(target=self._render_loop, name="preview", daemon=True)
+            self._thread.start()
+
+    def show(self, frame):
+        """
+        Hand the latest frame to the display thread.
+
+        The frame is copied, so the caller may reuse its buffer right away.
+
+        Args:
+            frame (numpy.ndarray or None): Annotated frame.
+        """
+        if frame is None:
+            return
+        with self._condition:
+            if self._frame is not None:
+                self.dropped_frames += 1
+            # Never write into the buffer the display thread is rendering
+            slot = 1 if self._buffers[0] is self._rendering else 0
+            if self._buffers[slot] is None or self._buffers[slot].shape != frame.shape:
+                self._buffers[slot] = np.empty_like(frame)
+            np.copyto(self._buffers[slot], frame)
+            self._frame = self._buffers[slot]
+            self._condition.notify()
+
+    def render(self):
+        """
+        Render the pending frame, if any, and poll the keyboard. Call it from the main thread;
+        it does nothing when a display thread renders.
+        """
+        if not self.threaded:
+            self._render_pending(timeout=0)
+
+    def _render_loop(self):
+        # Wake up regularly to keep the window responsive to key presses
+        while self._render_pending(timeout=0.03):
+            pass
+        cv2.destroyAllWindows()
+
+    def _render_pending(self, timeout):
+        """
+        Render the pending frame, waiting up to `timeout` seconds for one, and forward key presses.
+
+        Returns:
+            bool: False once the window is closed.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._frame is not None or not self._running, timeout=timeout)
+            if not self._running:
+                return False
+            frame, self._frame = self._frame, None
+            self._rendering = frame
+
+        if frame is not None:
+            # Rendering happens outside the lock; a new frame meanwhile goes to the other buffer
+            cv2.imshow(self.window_name, frame)
+            if not self._moved:
+                cv2.moveWindow(self.window_name, *self.position)
+                self._moved = True
+            self.rendered_frames += 1
+            with self._condition:
+                self._rendering = None
+
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord("0"):
+            self.triggers.put(Triggers.LAND)
+        elif key == 27:  # 27 is the ESC key ASCII code
+            self.triggers.put(Triggers.EXIT)
+        return True
+
+    def close(self):
+        """
+        Stop the display thread, if any, and close the window.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        else:
+            cv2.destroyAllWindows()
@@ -0,0 +1,167 @@
+import time
+
+
+class AdaptiveScheduler:
+    """
+    Keeps the control loop at a target rate by degrading detection quality when it runs late.
+
+    The scheduler wraps `Control.get_control_actions` and measures the loop period (time between
+    calls) and the cost of each call. When the smoothed period exceeds the budget, it moves one
+    step down the degradation ladder:
+
+        full -> no-annotation -> cheap-detector -> low-resolution -> skip-1-of-2 -> skip-3-of-4
+
+    Steps that do not apply are left out (e.g. cheap-detector when the OpenCV detector is
+    already used). It moves back up once the cost measured at the better level fits in the
+    budget. Every decision is recorded in `decisions`.
+    """
+
+    def __init__(self, control, target_rate=20.0, smoothing=0.2, cooldown=10, headroom=0.9, verbose=True):
+        """
+        Args:
+            control (Control): Controller to schedule.
+            target_rate (float): Control rate to maintain, in Hz.
+            smoothing (float): Weight of the newest sample in the moving averages.
+            cooldown (int): Minimum number of frames between two decisions.
+            headroom (float): Fraction of the budget the predicted period must fit in to upgrade.
+            verbose (bool): Print every decision.
+        """
+        self.control = control
+        self.budget = 1.0 / target_rate
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.headroom = headroom
+        self.verbose = verbose
+
+        # Configuration restored at the full level
+        self.detector = control.detector
+        self.detect_every = control.detect_every
+        self.tracker = control.tracker
+
+        self.levels = ["full", "no-annotation"]
+        if self.detector != "cv":
+            self.levels.append("cheap-detector")
+        self.levels += ["low-resolution", "skip-1-of-2", "skip-3-of-4"]
+
+        self.level = 0
+        self.period = None  # Smoothed loop period, in seconds
+        self.costs = [None] * len(self.levels)  # Smoothed cost of a call at each level
+        self.frames_at_level = 0
+        self.frames = [0] * len(self.levels)
+        self.decisions = []
+        self.last_call = None
+
+    def reached(self, name):
+        """
+        Returns:
+            bool: Whether the current level is at or below the named degradation step.
+        """
+        return name in self.levels and self.level >= self.levels.index(name)
+
+    def apply(self):
+        """
+        Configure the controller for the current level.
+        """
+        control = self.control
+        control.detector = "cv" if self.reached("cheap-detector") else self.detector
+        control.image_processing.min_level = 1 if self.reached("low-resolution") else 0
+
+        if self.reached("skip-1-of-2"):
+            if control.tracker is None:
+                control.tracker = control.make_tracker()
+                if control.last_rectangle_center is not None:
+                    # Without tracker, the last centre is the last detection
+                    control.last_detection = control.last_rectangle_center
+                    control.tracker.update(control.last_rectangle_center)
+            control.detect_every = max(self.detect_every, 4 if self.reached("skip-3-of-4") else 2)
+        else:
+            control.tracker = self.tracker
+            control.detect_every = self.detect_every
+
+    def change_level(self, level, reason):
+        """
+        Move to another level and record the decision.
+        """
+        decision = {
+            "frame": sum(self.frames),
+            "time": time.time(),
+            "from": self.levels[self.level],
+            "to": self.levels[level],
+            "reason": reason,
+        }
+        self.decisions.append(decision)
+        if self.verbose:
+            print(f"Scheduler: {decision['from']} -> {decision['to']} ({reason})")
+        self.level = level
+        self.frames_at_level = 0
+        self.apply()
+
+    def update(self, cost):
+        """
+        Account for one call and decide whether to change level.
+
+        Args:
+            cost (float): Duration of the call in seconds.
+        """
+        now = time.perf_counter()
+        if self.last_call is not None:
+            period = now - self.last_call
+            self.period = period if self.period is None else self.period + self.smoothing * (period - self.period)
+        self.last_call = now
+
+        previous = self.costs[self.level]
+        self.costs[self.level] = cost if previous is None else previous + self.smoothing * (cost - previous)
+        self.frames[self.level] += 1
+        self.frames_at_level += 1
+
+        if self.period is None or self.frames_at_level < self.cooldown:
+            return
+
+        budget_ms, period_ms = 1000 * self.budget, 1000 * self.period
+        if self.period > self.budget and self.level < len(self.levels) - 1:
+            self.change_level(self.level + 1, f"period {period_ms:.1f} ms > budget {budget_ms:.1f} ms")
+        elif self.level > 0:
+            # Period expected at the better level (always visited before), from the cost measured there
+            predicted = self.period - self.costs[self.level] + self.costs[self.level - 1]
+            if predicted < self.headroom * self.budget:
+                self.change_level(self.level - 1, f"predicted period {1000 * predicted:.1f} ms fits "
+                                                  f"budget {budget_ms:.1f} ms")
+
+    def get_control_actions(self, frame, pos, annotate=True):
+        """
+        Compute the control actions at the current level.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame): Camera frame.
+            pos (float): Current altitude or position.
+            annotate (bool): Whether the annotated frame is wanted (dropped under load).
+
+        Returns:
+            tuple: (control actions, annotated frame or None).
+        """
+        start = time.perf_counter()
+        result = self.control.get_control_actions(frame, pos, annotate and not self.reached("no-annotation"))
+        self.update(time.perf_counter() - start)
+        return result
+
+    def stats(self):
+        """
+        Returns:
+            dict: Frames spent at each level and the decisions taken.
+        """
+        return {
+            "budget_ms": 1000 * self.budget,
+            "level": self.levels[self.level],
+            "frames": dict(zip(self.levels, self.frames)),
+            "cost_ms": {name: None if cost is None else 1000 * cost for name, cost in zip(self.levels, self.costs)},
+            "decisions": self.decisions,
+        }
+
+    def report(self):
+        """
+        Print the time spent at each level.
+        """
+        total = max(sum(self.frames), 1)
+        shares = ", ".join(f"{name} {100 * frames / total:.0f}%" for name, frames in zip(self.levels, self.frames)
+                           if frames)
+        print(f"Scheduler: budget {1000 * self.budget:.1f} ms, {len(self.decisions)} decisions, levels: {shares}")
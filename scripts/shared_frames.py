@@ -0,0 +1,367 @@
+import argparse
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+from frame_ingest import IngestedFrame
+
+# Per-slot metadata; `seq` is -1 while the slot is being written
+SLOT_DTYPE = np.dtype([
+    ("seq", "<i8"),
+    ("time", "<f8"),
+    ("height", "<f8"),
+])
+
+# One row per detector, written only by that detector's process. `version` is odd while
+# the row is being written (a sequence lock), so readers never see half a result.
+RESULT_DTYPE = np.dtype([
+    ("version", "<i8"),
+    ("seq", "<i8"),  # Frame the result was computed from, -1 before the first result
+    ("time", "<f8"),  # Observation time of that frame (time.time())
+    ("center", "<i4", (2,)),  # [-1, -1] when the pad was not detected
+    ("confidence", "<f4"),  # NaN when the detector reports none
+    ("latency", "<f4"),  # Seconds from the observation to the result
+    ("processed", "<i8"),  # Frames detected so far
+    ("torn", "<i8"),  # Results dropped because the frame was overwritten during detection
+])
+
+_ALIGN = 64
+
+
+def _aligned(size):
+    return -(-size // _ALIGN) * _ALIGN
+
+
+class SharedFrameRing:
+    """
+    Ring of fixed-shape frame slots in shared memory, written by one process and read by many.
+
+    Frames are stored as HWC RGBX (see `IngestedFrame`), so readers hand a slot to the
+    detectors without copying or converting it. The writer fills the slots in turn and
+    publishes the sequence number of the newest frame; readers always take the newest frame
+    and skip the ones they were too slow for (latest wins). A slot is rewritten `slots`
+    frames later; `valid` tells a reader whether the frame it used was overwritten meanwhile.
+    """
+
+    def __init__(self, shape, slots=8, name=None):
+        """
+        Args:
+            shape (tuple): (height, width) of the frames.
+            slots (int): Number of frame slots.
+            name (str or None): Name of an existing ring to attach to, or None to create one.
+        """
+        self.shape = tuple(shape)
+        self.slots = slots
+        frame_bytes = self.shape[0] * self.shape[1] * 4
+        meta_offset = _ALIGN  # The first 8 bytes hold the newest sequence number
+        frames_offset = meta_offset + _aligned(slots * SLOT_DTYPE.itemsize)
+        size = frames_offset + slots * _aligned(frame_bytes)
+
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.name = self.shm.name
+        buf = self.shm.buf
+        self.latest_seq = np.ndarray((1,), "<i8", buf)
+        self.meta = np.ndarray((slots,), SLOT_DTYPE, buf, meta_offset)
+        self.frames = [
+            np.ndarray(self.shape + (4,), np.uint8, buf, frames_offset + slot * _aligned(frame_bytes))
+            for slot in range(slots)
+        ]
+        if self.owner:
+            self.latest_seq[0] = -1
+            self.meta["seq"] = -1
+            self.next_seq = 0
+            self._zeros = np.zeros(self.shape, np.uint8)
+
+    def write(self, chw, height=0.0):
+        """
+        Copy an observation into the next slot and publish it. Only the creating process writes.
+
+        Args:
+            chw (numpy.ndarray): (3, height, width) uint8 RGB image.
+            height (float): Altitude at the observation.
+
+        Returns:
+            int: Sequence number of the frame.
+        """
+        seq = self.next_seq
+        slot = seq % self.slots
+        meta = self.meta[slot]
+        meta["seq"] = -1
+        cv2.merge([chw[0], chw[1], chw[2], self._zeros], dst=self.frames[slot])
+        meta["time"] = time.time()
+        meta["height"] = height
+        meta["seq"] = seq
+        self.latest_seq[0] = seq
+        self.next_seq += 1
+        return seq
+
+    def latest(self, after=-1):
+        """
+        Take the newest frame, if it is newer than `after`.
+
+        Args:
+            after (int): Sequence number of the last frame the reader used.
+
+        Returns:
+            tuple or None: (sequence number, zero-copy RGBX view, altitude, observation time), or
+            None if there is no newer frame.
+        """
+        while True:
+            seq = int(self.latest_seq[0])
+            if seq <= after:
+                return None
+            slot = seq % self.slots
+            meta = self.meta[slot]
+            frame_time, height = float(meta["time"]), float(meta["height"])
+            if meta["seq"] == seq:
+                return seq, self.frames[slot], height, frame_time
+            # The writer lapped us between the two reads; take the newer frame
+
+    def valid(self, seq):
+        """
+        Returns:
+            bool: Whether frame `seq` is still in its slot (not overwritten since it was read).
+        """
+        return self.meta[seq % self.slots]["seq"] == seq
+
+    def close(self):
+        """
+        Detach from the ring; the creating process also frees it.
+        """
+        self.latest_seq = self.meta = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedResults:
+    """
+    Small shared table of the latest detection of each detector process (`RESULT_DTYPE` rows).
+    """
+
+    def __init__(self, rows, name=None):
+        """
+        Args:
+            rows (int): Number of detectors.
+            name (str or None): Name of an existing table to attach to, or None to create one.
+        """
+        self.rows = rows
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner,
+                                              size=rows * RESULT_DTYPE.itemsize if self.owner else 0)
+        self.name = self.shm.name
+        self.table = np.ndarray((rows,), RESULT_DTYPE, self.shm.buf)
+        if self.owner:
+            self.table[:] = 0
+            self.table["seq"] = -1
+            self.table["center"] = -1
+
+    def publish(self, row, seq, frame_time, center, confidence=None, processed=0, torn=0):
+        """
+        Write the result of a frame into a row. Only the row's detector process writes it.
+        """
+        entry = self.table[row]
+        entry["version"] += 1
+        entry["seq"] = seq
+        entry["time"] = frame_time
+        entry["center"] = center if center is not None else (-1, -1)
+        entry["confidence"] = np.nan if confidence is None else confidence
+        entry["latency"] = time.time() - frame_time
+        entry["processed"] = processed
+        entry["torn"] = torn
+        entry["version"] += 1
+
+    def read(self, row):
+        """
+        Returns:
+            numpy.void: Consistent copy of a row (`RESULT_DTYPE`).
+        """
+        entry = self.table[row]
+        while True:
+            version = int(entry["version"])
+            if version % 2 == 0:
+                copy = entry.copy()
+                if int(entry["version"]) == version:
+                    return copy
+
+    def close(self):
+        """
+        Detach from the table; the creating process also frees it.
+        """
+        self.table = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def vision_worker(ring_name, shape, slots, results_name, rows, row, detector, control_options, stop):
+    """
+    Detector process: detect the pad on the newest frame of the ring, publish, repeat.
+
+    Args:
+        ring_name (str): Name of the `SharedFrameRing`.
+        shape (tuple): (height, width) of its frames.
+        slots (int): Its number of slots.
+        results_name (str): Name of the `SharedResults` table.
+        rows (int): Its number of rows.
+        row (int): Row this worker publishes to.
+        detector (str): `Control` detector name.
+        control_options (dict): Other `Control` arguments.
+        stop (multiprocessing.Event): Set to end the worker.
+    """
+    from control_actions import Control
+
+    # One core per detector; keep OpenCV from spreading over the others
+    cv2.setNumThreads(1)
+    ring = SharedFrameRing(shape, slots, name=ring_name)
+    results = SharedResults(rows, name=results_name)
+    control = Control(detector=detector, **control_options)
+    frame = IngestedFrame()
+    seq, processed, torn = -1, 0, 0
+    try:
+        while not stop.is_set():
+            latest = ring.latest(seq)
+            if latest is None:
+                time.sleep(0.0005)
+                continue
+            seq, rgbx, height, frame_time = latest
+            result = control.detect_result(frame.attach(rgbx), height)
+            if not ring.valid(seq):
+                torn += 1  # The writer reused the slot while we were reading it
+                continue
+            processed += 1
+            detection = result.detection
+            results.publish(row, seq, frame_time, result.center,
+                            None if detection is None else detection.confidence, processed, torn)
+    finally:
+        frame = None
+        ring.close()
+        results.close()
+
+
+class SharedVision:
+    """
+    Detectors running in their own processes on the frames of the environment process.
+
+    The environment process writes each observation once into a `SharedFrameRing`; every
+    detector process reads the newest frame from it without copying and publishes its
+    detection to a `SharedResults` row. No image is pickled between processes.
+    """
+
+    def __init__(self, shape, detectors=("cv",), slots=8, control_options=None):
+        """
+        Args:
+            shape (tuple): (height, width) of the camera frames.
+            detectors (tuple): `Control` detector names, one process each.
+            slots (int): Frame slots of the ring (frames a slow detector may lag before its
+                frame is overwritten).
+            control_options (dict or None): Other `Control` arguments of the detector processes.
+        """
+        self.detectors = list(detectors)
+        self.ring = SharedFrameRing(shape, slots)
+        self.results = SharedResults(len(self.detectors))
+        context = multiprocessing.get_context("spawn")
+        self.stop = context.Event()
+        self.processes = [
+            context.Process(target=vision_worker, name=f"vision-{detector}", daemon=True,
+                            args=(self.ring.name, self.ring.shape, slots, self.results.name, len(self.detectors),
+                                  row, detector, control_options or {}, self.stop))
+            for row, detector in enumerate(self.detectors)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def publish(self, chw, height):
+        """
+        Hand an observation to the detectors.
+
+        Returns:
+            int: Sequence number of the frame.
+        """
+        return self.ring.write(chw, height)
+
+    def result(self, detector):
+        """
+        Returns:
+            numpy.void: Latest result of a detector (`RESULT_DTYPE`; `seq` is -1 before the first).
+        """
+        return self.results.read(self.detectors.index(detector))
+
+    def wait(self, detector, seq, timeout=10.0):
+        """
+        Wait until a detector has a result for frame `seq` or a later one.
+
+        Returns:
+            numpy.void or None: The result, or None on timeout.
+        """
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            result = self.result(detector)
+            if result["seq"] >= seq:
+                return result
+            time.sleep(0.0005)
+        return None
+
+    def close(self):
+        """
+        Stop the detector processes and free the shared memory.
+        """
+        self.stop.set()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.ring.close()
+        self.results.close()
+
+
+if __name__ == "__main__":
+    from control_actions import Control
+    from drone_simulator import KinematicDroneSimulator
+
+    parser = argparse.ArgumentParser(description="Fly the kinematic simulator with detectors in their own processes.")
+    parser.add_argument("--detectors", default="cv", help="Comma-separated detectors, one process each; the "
+                                                          "first one steers the drone.")
+    parser.add_argument("--episodes", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=8)
+    args = parser.parse_args()
+
+    env = KinematicDroneSimulator(seed=0)
+    detectors = args.detectors.split(",")
+    vision = SharedVision(env.image_size, detectors, args.slots)
+    image_center = [env.image_size[1] // 2, env.image_size[0] // 2]
+    steps, landed, timeouts = 0, 0, 0
+    start = time.perf_counter()
+    try:
+        for episode in range(args.episodes):
+            env.seed(episode)
+            observation, done, info = env.reset(), False, {}
+            control = Control(command_gain=env.command_gain)
+            while not done:
+                seq = vision.publish(observation[0], observation[1][1])
+                # Wait for the steering detector, as the single-process loop does
+                result = vision.wait(detectors[0], seq)
+                if result is None:
+                    # The steering detector is stuck: hold position rather than fly blind
+                    timeouts += 1
+                    actions = [0.0, 0.0, 0.0, 0.0]
+                else:
+                    center = None if result["center"][0] < 0 else result["center"].tolist()
+                    actions = control.compute_actions(image_center, center, observation[1][1])
+                observation, reward, done, info = env.step(actions)
+                steps += 1
+            landed += info.get("landed", False)
+        elapsed = time.perf_counter() - start
+        print(f"{landed}/{args.episodes} landings, {steps} steps in {elapsed:.2f} s ({steps / elapsed:.0f} steps/s)")
+        if timeouts:
+            print(f"{detectors[0]} timed out on {timeouts} frames; the drone held position on them")
+        for row, detector in enumerate(detectors):
+            result = vision.results.read(row)
+            print(f"{detector}: {result['processed']} frames detected ({100 * result['processed'] / steps:.0f}%), "
+                  f"{result['torn']} overwritten during detection, last latency {1000 * result['latency']:.1f} ms")
+    finally:
+        vision.close()
+        env.close()
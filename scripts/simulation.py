@@ -1,15 +1,22 @@
-from mlagents_envs.environment import UnityEnvironment
-from mlagents_envs.envs.unity_gym_env import UnityToGymWrapper
-
 class UnityEnvironmentWrapper:
-    def __init__(self, env_path):
+    def __init__(self, env_path, worker_id=0, base_port=None, no_graphics=False):
         """
         Initialize the Unity environment wrapper with the given path.
         
         Args:
             env_path (str): Path to the Unity environment application.
-        """
-        self.unity_env = UnityEnvironment(env_path, no_graphics_monitor=False, no_graphics=False)
+            worker_id (int): Offset added to the base port, so that several environments can
+                run at the same time.
+            base_port (int or None): Port of worker 0 (None: the mlagents default).
+            no_graphics (bool): Run Unity without rendering the main window. Camera
+                observations are still rendered.
+        """
+        # Imported here so that runs on the kinematic simulator do not need mlagents_envs
+        from mlagents_envs.environment import UnityEnvironment
+        from mlagents_envs.envs.unity_gym_env import UnityToGymWrapper
+
+        self.unity_env = UnityEnvironment(env_path, worker_id=worker_id, base_port=base_port,
+                                          no_graphics_monitor=no_graphics, no_graphics=False)
         self.env = UnityToGymWrapper(self.unity_env, uint8_visual=True, allow_multiple_obs=True)
 
     def reset(self):
@@ -0,0 +1,94 @@
+import os
+import queue
+import signal
+import threading
+
+
+class Triggers:
+    """
+    Non-blocking sources for the emergency-landing and exit commands.
+
+    Commands can come from:
+        - signals: SIGUSR1 requests an emergency landing, SIGINT/SIGTERM request exit.
+        - a trigger file: writing "land" or "exit" into it issues the command (the file is then removed).
+        - a queue: any thread (e.g. the preview window) can `put` a command.
+    """
+
+    LAND = "land"
+    EXIT = "exit"
+
+    def __init__(self, trigger_file=None):
+        """
+        Args:
+            trigger_file (str or None): Path of the file polled for commands.
+        """
+        self.trigger_file = trigger_file
+        self.commands = queue.Queue()
+        self.emergency_landing = False
+        self.exit_requested = False
+        self.previous_handlers = {}
+
+    def install_signal_handlers(self):
+        """
+        Route SIGUSR1, SIGINT and SIGTERM to the trigger flags. Only possible from the main thread.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        # Signal handlers only set flags: taking the queue lock here could deadlock.
+        handlers = {signal.SIGINT: self._on_exit_signal, signal.SIGTERM: self._on_exit_signal}
+        if hasattr(signal, "SIGUSR1"):  # Not available on Windows
+            handlers[signal.SIGUSR1] = self._on_land_signal
+
+        for signum, handler in handlers.items():
+            self.previous_handlers[signum] = signal.signal(signum, handler)
+
+    def restore_signal_handlers(self):
+        """
+        Restore the signal handlers replaced by `install_signal_handlers`.
+        """
+        for signum, handler in self.previous_handlers.items():
+            signal.signal(signum, handler)
+        self.previous_handlers = {}
+
+    def _on_land_signal(self, signum, frame):
+        self.emergency_landing = True
+
+    def _on_exit_signal(self, signum, frame):
+        self.exit_requested = True
+
+    def put(self, command):
+        """
+        Issue a command from any thread.
+
+        Args:
+            command (str): `Triggers.LAND` or `Triggers.EXIT`.
+        """
+        self.commands.put(command)
+
+    def poll(self):
+        """
+        Collect pending commands without blocking and update the trigger flags.
+        """
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                break
+
+        if self.trigger_file is not None and os.path.exists(self.trigger_file):
+            try:
+                with open(self.trigger_file) as f:
+                    commands.append(f.read().strip().lower())
+                os.remove(self.trigger_file)
+            except OSError as e:
+                print(f"Trigger file error: {e}")
+
+        for command in commands:
+            if command == self.LAND:
+                self.emergency_landing = True
+            elif command == self.EXIT:
+                self.exit_requested = True
+            else:
+                print(f"Unknown trigger command: {command!r}")
@@ -0,0 +1,191 @@
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+from frame_ingest import IngestedFrame
+
+# Codecs of the container formats written with OpenCV
+FOURCC = {".mp4": "mp4v", ".avi": "MJPG", ".mkv": "mp4v"}
+
+
+class VideoExporter:
+    """
+    Encodes frames of a run to an MP4 (or AVI/MKV) video or an animated GIF on a background thread.
+
+    The control loop only copies the frame into a pooled buffer; downscaling, colour
+    conversion and encoding happen on the writer thread. Every `every`-th frame is kept
+    (decimation), and when the writer falls behind and the pool is empty, frames are
+    dropped (and counted) rather than delaying the loop. GIF frames are kept in memory,
+    palette-compressed, until `close` writes the file (needs Pillow), so a GIF holds at
+    most `max_gif_frames` frames; later frames are counted as truncated. Use a video
+    format for long runs.
+    """
+
+    def __init__(self, path, fps=20.0, scale=1.0, every=1, queue_size=16, max_gif_frames=600):
+        """
+        Args:
+            path (str): Output file; its extension selects the format (.mp4, .avi, .mkv or .gif).
+            fps (float): Frame rate of the input frames; the output plays at `fps / every`.
+            scale (float): Size of the output relative to the frames.
+            every (int): Keep one frame out of `every`.
+            queue_size (int): Frames that may wait for the writer.
+            max_gif_frames (int): Frames kept in a GIF (each takes width x height bytes until `close`).
+        """
+        self.extension = os.path.splitext(path)[1].lower()
+        if self.extension != ".gif" and self.extension not in FOURCC:
+            raise ValueError(f"Unsupported video format '{self.extension}'. Use .gif or one of {sorted(FOURCC)}.")
+        if every < 1:
+            raise ValueError("every must be at least 1.")
+        if self.extension == ".gif":
+            # Fail now rather than after the run
+            from PIL import Image  # noqa: F401
+
+        self.path = path
+        self.fps = fps
+        self.scale = scale
+        self.every = every
+        self.pool = queue.SimpleQueue()
+        self.pool_size = queue_size
+        self.max_frames = max_gif_frames if self.extension == ".gif" else None
+        self.pending = queue.Queue()
+        self.frames = 0  # Frames passed to `write`
+        self.written = 0
+        self.decimated = 0
+        self.dropped = 0
+        self.queued = 0
+        self.truncated = 0  # GIF frames beyond `max_gif_frames`
+        self.mismatched = 0  # Frames of another shape than the first one
+        self.failed = 0  # Frames not written because the video could not be opened
+        self.error = None
+        self.shape = None
+        self.size = None
+        self.writer = None
+        self.thread = None
+
+    def start(self, shape):
+        """
+        Open the video, allocate the buffer pool for frames of the given shape and start the writer.
+
+        If the video cannot be opened, `error` is set and later frames are counted as failed;
+        `close` reports it.
+        """
+        self.shape = shape
+        height, width = shape[:2]
+        self.size = (max(1, int(round(width * self.scale))), max(1, int(round(height * self.scale))))
+        if self.extension != ".gif":
+            self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*FOURCC[self.extension]),
+                                          self.fps / self.every, self.size)
+            if not self.writer.isOpened():
+                self.error = (f"could not open '{self.path}' for writing with the "
+                              f"'{FOURCC[self.extension]}' codec")
+                self.writer = None
+                return
+        for _ in range(self.pool_size):
+            self.pool.put(np.empty(shape, np.uint8))
+        self.thread = threading.Thread(target=self._write, name="video-export", daemon=True)
+        self.thread.start()
+
+    def write(self, frame):
+        """
+        Queue a frame. Never blocks, and never raises on a bad frame: frames that cannot be
+        exported are counted and dropped.
+
+        Args:
+            frame (numpy.ndarray or IngestedFrame or None): BGR image (e.g. an annotated frame) or
+                camera frame; None is ignored.
+        """
+        if frame is None:
+            return
+        index = self.frames
+        self.frames += 1
+        if index % self.every:
+            self.decimated += 1
+            return
+
+        image = frame.rgbx if isinstance(frame, IngestedFrame) else frame
+        if self.shape is None:
+            self.start(image.shape)
+        if self.error is not None:
+            self.failed += 1
+            return
+        if image.shape != self.shape:
+            self.mismatched += 1
+            return
+        if self.max_frames is not None and self.queued >= self.max_frames:
+            self.truncated += 1
+            return
+        try:
+            buffer = self.pool.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+        np.copyto(buffer, image)
+        self.queued += 1
+        self.pending.put(buffer)
+
+    def _write(self):
+        writer = self.writer
+        gif_frames = []
+        height, width = self.shape[:2]
+        size = self.size
+        bgr = np.empty((height, width, 3), np.uint8)
+        fps = self.fps / self.every
+        while True:
+            buffer = self.pending.get()
+            if buffer is None:
+                break
+            if buffer.shape[2] == 4:
+                cv2.cvtColor(buffer, cv2.COLOR_RGBA2BGR, dst=bgr)
+                image = bgr
+            else:
+                image = buffer
+            if size != (width, height):
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+            if self.extension == ".gif":
+                from PIL import Image
+
+                # Palette images take a third of the memory of RGB ones
+                rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                gif_frames.append(Image.fromarray(rgb).quantize(colors=256))
+            else:
+                writer.write(image if image.flags.c_contiguous else np.ascontiguousarray(image))
+            self.pool.put(buffer)
+            self.written += 1
+
+        if writer is not None:
+            writer.release()
+        if gif_frames:
+            gif_frames[0].save(self.path, save_all=True, append_images=gif_frames[1:],
+                               duration=int(round(1000 / fps)), loop=0)
+
+    def close(self):
+        """
+        Encode the queued frames, finish the file and print the export statistics.
+        """
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            print(f"Video export failed: {self.error}; {self.failed} frames not written")
+            return
+        print(f"Video export: {self.written} frames written to {self.path}, {self.dropped} dropped "
+              f"(writer behind), {self.decimated} skipped (keeping 1 in {self.every})")
+        if self.truncated:
+            print(f"Video export: GIF limited to {self.max_frames} frames, {self.truncated} later frames not written")
+        if self.mismatched:
+            print(f"Video export: {self.mismatched} frames of another size than {self.shape} not written")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Frames received, written, dropped under backpressure, skipped by decimation,
+            beyond the GIF limit, of the wrong shape, or not written because the video could not
+            be opened.
+        """
+        return {"frames": self.frames, "written": self.written, "dropped": self.dropped,
+                "decimated": self.decimated, "truncated": self.truncated, "mismatched": self.mismatched,
+                "failed": self.failed}
@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def export_onnx(model_path, imgsz=640):
+    """
+    Export YOLO weights to ONNX with a fixed input size (needs `ultralytics` and `onnx`).
+
+    Args:
+        model_path (str): Path of the `.pt` weights.
+        imgsz (int): Square input size of the exported model.
+
+    Returns:
+        str: Path of the `.onnx` file, next to the weights.
+    """
+    from ultralytics import YOLO
+
+    return YOLO(model_path).export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+
+
+class OnnxYolo:
+    """
+    CPU inference of a YOLOv8 detector exported to ONNX, with ONNX Runtime.
+
+    Frames are letterboxed into a preallocated input tensor of the model's fixed size,
+    the session is warmed up at load, and the raw output is decoded with vectorised
+    confidence filtering and OpenCV NMS. Detections use the layout of ultralytics'
+    `result.boxes.data`: one row `[x1, y1, x2, y2, confidence, class]` per box, in frame
+    pixels, sorted by decreasing confidence.
+    """
+
+    def __init__(self, model_path, conf=0.25, iou=0.7, threads=None, warmup=2):
+        """
+        Args:
+            model_path (str): `.onnx` model, or `.pt` weights to export on first use.
+            conf (float): Minimum confidence kept by the decoder.
+            iou (float): IoU threshold of the non-maximum suppression.
+            threads (int or None): ONNX Runtime intra-op threads (None: one per core).
+            warmup (int): Inference runs at load time.
+        """
+        import onnxruntime as ort
+
+        model_path = Path(model_path)
+        if model_path.suffix != ".onnx":
+            onnx_path = model_path.with_suffix(".onnx")
+            model_path = onnx_path if onnx_path.exists() else Path(export_onnx(str(model_path)))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        _, _, self.input_height, self.input_width = model_input.shape
+        self.conf = conf
+        self.iou = iou
+
+        # Preallocated letterbox canvas and input tensor
+        self.canvas = np.full((self.input_height, self.input_width, 3), 114, np.uint8)
+        self.tensor = np.empty((1, 3, self.input_height, self.input_width), np.float32)
+
+        for _ in range(warmup):
+            self.session.run(None, {self.input_name: self.tensor})
+
+    def letterbox(self, frame):
+        """
+        Resize a BGR frame into the input tensor, keeping its aspect ratio.
+
+        Returns:
+            tuple: (scale, pad_x, pad_y) to map model coordinates back to the frame.
+        """
+        height, width = frame.shape[:2]
+        scale = min(self.input_width / width, self.input_height / height)
+        new_w, new_h = round(width * scale), round(height * scale)
+        pad_x, pad_y = (self.input_width - new_w) // 2, (self.input_height - new_h) // 2
+
+        self.canvas[:] = 114
+        cv2.resize(frame, (new_w, new_h), dst=self.canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w],
+                   interpolation=cv2.INTER_LINEAR)
+
+        # HWC BGR uint8 -> NCHW RGB float in [0, 1]
+        for channel in range(3):
+            np.multiply(self.canvas[..., 2 - channel], 1 / 255, out=self.tensor[0, channel])
+        return scale, pad_x, pad_y
+
+    def __call__(self, frame):
+        """
+        Detect objects in a BGR frame.
+
+        Returns:
+            numpy.ndarray: (N, 6) detections `[x1, y1, x2, y2, confidence, class]`.
+        """
+        scale, pad_x, pad_y = self.letterbox(frame)
+        output = self.session.run(None, {self.input_name: self.tensor})[0][0]  # (4 + classes, anchors)
+
+        scores = output[4:]
+        classes = scores.argmax(axis=0)
+        confidences = scores[classes, np.arange(scores.shape[1])]
+        keep = confidences > self.conf
+        if not keep.any():
+            return np.empty((0, 6), np.float32)
+
+        cx, cy, w, h = output[:4, keep]
+        confidences, classes = confidences[keep], classes[keep]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        boxes -= (pad_x, pad_y, pad_x, pad_y)
+        boxes /= scale
+
+        frame_h, frame_w = frame.shape[:2]
+        np.clip(boxes, 0, (frame_w, frame_h, frame_w, frame_h), out=boxes)
+
+        # Class-aware NMS: offset each class so boxes of different classes never overlap
+        offsets = classes[:, None] * (max(frame_w, frame_h) + 1)
+        shifted = boxes + offsets
+        xywh = np.column_stack([shifted[:, :2], shifted[:, 2:] - shifted[:, :2]])
+        indices = np.asarray(cv2.dnn.NMSBoxes(xywh.tolist(), confidences.tolist(), self.conf, self.iou),
+                             dtype=int).reshape(-1)
+        indices = indices[np.argsort(-confidences[indices])]
+
+        return np.column_stack([boxes[indices], confidences[indices], classes[indices]]).astype(np.float32)
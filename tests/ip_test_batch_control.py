@@ -0,0 +1,69 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from batch_control import BatchControl
+from control_actions import Control
+
+
+def random_detections(rng, n_steps, n_drones):
+    """
+    Detections around a 640x480 image centre, with gaps (None) of random length.
+
+    Returns:
+        tuple: ((n_steps, n_drones, 2) integer centres, (n_steps, n_drones) detected mask,
+        (n_steps, n_drones) altitudes).
+    """
+    centers = rng.integers(0, [640, 480], size=(n_steps, n_drones, 2))
+    detected = rng.random((n_steps, n_drones)) < 0.6
+    detected[: rng.integers(0, 20)] = False  # Exploration before the first detection
+    heights = np.linspace(5.0, 0.0, n_steps)[:, None] + rng.normal(0.0, 0.05, (n_steps, n_drones))
+    return centers, detected, heights
+
+
+def match_control(n_steps=300, n_drones=40, seed=0, dynamic_gains=False):
+    """
+    Drive a `BatchControl` and one `Control` per drone with the same detections, and check that
+    every action of every drone is identical.
+    """
+    rng = np.random.default_rng(seed)
+    centers, detected, heights = random_detections(rng, n_steps, n_drones)
+    kp = rng.uniform(0.005, 0.03, (2, n_drones))
+    batch = BatchControl(n_drones, kp_min=kp[0], kp_max=kp[1], dynamic_gains=dynamic_gains)
+    controls = [Control(kp_min=kp[0, i], kp_max=kp[1, i], dynamic_gains=dynamic_gains) for i in range(n_drones)]
+    image_center = [320, 240]
+
+    for step in range(n_steps):
+        actions = batch.compute_actions(image_center, centers[step], detected[step], heights[step])
+        for i, control in enumerate(controls):
+            center = centers[step, i].tolist() if detected[step, i] else None
+            expected = control.compute_actions(image_center, center, float(heights[step, i]))
+            assert np.array_equal(actions[i], expected), f"step {step}, drone {i}: {actions[i]} != {expected}"
+            assert batch.landing_mode[i] == control.landing_mode
+    print(f"{n_drones} drones, {n_steps} steps{' (dynamic gains)' if dynamic_gains else ''}: "
+          f"batch actions identical to Control")
+
+
+def throughput(n_drones=10000, n_steps=200, seed=0):
+    """
+    Time one batched step for many drones.
+    """
+    rng = np.random.default_rng(seed)
+    centers, detected, heights = random_detections(rng, n_steps, n_drones)
+    batch = BatchControl(n_drones)
+    start = time.perf_counter()
+    for step in range(n_steps):
+        batch.compute_actions([320, 240], centers[step], detected[step], heights[step])
+    per_step = (time.perf_counter() - start) / n_steps
+    print(f"{n_drones} drones: {1e3 * per_step:.3f} ms per step ({1e9 * per_step / n_drones:.0f} ns per drone)")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_batch_control.py
+    match_control()
+    match_control(dynamic_gains=True)
+    throughput()
+    print("BatchControl matches Control.")
@@ -1,13 +1,19 @@
+import sys
+from pathlib import Path
+
 import cv2
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from color_lut import ColorLUT
+
 # Initialize the webcam
 cap = cv2.VideoCapture(0)
 
 if not cap.isOpened():
     raise RuntimeError("Error: Unable to access the webcam. Check camera connection.")
 
-print("Press 'q' to quit.")
+print("Press 'q' to quit, 'l' to check the colour lookup table against the HSV thresholds.")
 
 # Create a window for trackbars
 cv2.namedWindow("Processed Image")
@@ -24,6 +30,13 @@ cv2.createTrackbar("Upper R", "Processed Image", upper_blue[0], 255, lambda x: N
 cv2.createTrackbar("Upper G", "Processed Image", upper_blue[1], 255, lambda x: None)
 cv2.createTrackbar("Upper B", "Processed Image", upper_blue[2], 255, lambda x: None)
 
+# --- HSV Thresholds of the landing pad ---
+cv2.namedWindow("HSV Thresholds")
+for name, value, maximum in [("H min", lower_blue[0], 180), ("S min", lower_blue[1], 255), ("V min", lower_blue[2], 255),
+                             ("H max", upper_blue[0], 180), ("S max", upper_blue[1], 255), ("V max", upper_blue[2], 255)]:
+    cv2.createTrackbar(name, "HSV Thresholds", int(value), maximum, lambda x: None)
+
+check_lut = False
 while True:
     ret, frame = cap.read()
     if not ret:
@@ -47,13 +60,22 @@ while True:
     masked_rgb_image = cv2.bitwise_and(frame, frame, mask=mask_rgb)
 
     # --- Landing Pad Detection using HSV ---
+    lower_hsv = np.array([cv2.getTrackbarPos(name, "HSV Thresholds") for name in ("H min", "S min", "V min")])
+    upper_hsv = np.array([cv2.getTrackbarPos(name, "HSV Thresholds") for name in ("H max", "S max", "V max")])
+
+    # Live preview with the plain HSV threshold; building a lookup table takes too long per slider move
     hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    threshold = cv2.inRange(hsv, lower_hsv, upper_hsv)
 
-    mask_hsv = cv2.inRange(hsv, lower_blue, upper_blue)
+    if check_lut:
+        # Build the table for the settled thresholds (not cached: tuning would fill the cache)
+        lut = ColorLUT(lower_hsv, upper_hsv, cache_dir=None)
+        agreement = np.mean(lut.apply(frame, cv2.COLOR_BGR2RGBA) == threshold)
+        print(f"Colour LUT for HSV range {lower_hsv} - {upper_hsv}: {100 * agreement:.2f}% of pixels agree")
 
     # Morphological operations to clean the mask
     kernel = np.ones((5, 5), np.uint8)
-    mask_hsv = cv2.morphologyEx(mask_hsv, cv2.MORPH_CLOSE, kernel)
+    mask_hsv = cv2.morphologyEx(threshold, cv2.MORPH_CLOSE, kernel)
 
     # Find contours
     contours, _ = cv2.findContours(mask_hsv, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -81,8 +103,11 @@ while True:
     cv2.moveWindow("Processed Image", 500, 50)
     
 
+    key = cv2.waitKey(1) & 0xFF
+    check_lut = key == ord('l')
+
     # Exit the loop when 'q' is pressed
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+    if key == ord('q'):
         print("Exiting...")
         break
 
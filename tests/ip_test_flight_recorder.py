@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from drone_simulator import KinematicDroneSimulator
+from flight_recorder import FlightLog, FlightRecorder
+from frame_ingest import FrameIngest
+
+
+def round_trip(n_steps=150, chunk_frames=16, size=(48, 64)):
+    """
+    Record random frames, read them back in random order, then check that a log cut in the
+    middle of a chunk still reads up to the last complete chunk.
+    """
+    rng = np.random.default_rng(0)
+    observations = rng.integers(0, 256, size=(n_steps, 3) + size, dtype=np.uint8)
+    ingest = FrameIngest()
+    path = os.path.join(tempfile.mkdtemp(), "flight.log")
+
+    # A pool as large as the flight, so that a slow writer thread cannot make the recorder drop steps
+    recorder = FlightRecorder(path, chunk_frames=chunk_frames, pool_bytes=n_steps * size[0] * size[1] * 4)
+    for index, chw in enumerate(observations):
+        detection = None if index % 7 == 0 else [index, 2 * index]
+        recorder.record(index, ingest.ingest(chw), 10.0 - index / 20, detection, [0.1, -0.2, 0.0, index / 100])
+    recorder.close()
+    assert recorder.dropped == 0, f"{recorder.dropped} steps dropped"
+
+    log = FlightLog(path)
+    assert len(log) == n_steps, f"{len(log)} steps read, {n_steps} recorded"
+    for index in rng.permutation(n_steps):
+        record = log.record(index)
+        assert record["index"] == index
+        assert np.array_equal(log.frame(index), observations[index].transpose(1, 2, 0)), f"frame {index} differs"
+        expected = [-1, -1] if index % 7 == 0 else [index, 2 * index]
+        assert list(record["detection"]) == expected, f"step {index}: detection {record['detection']}"
+    log.close()
+
+    # Simulate a crash in the middle of the last full chunk
+    full_chunks = n_steps // chunk_frames
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1000 - (n_steps % chunk_frames) * (48 * 64 * 3))
+    log = FlightLog(path)
+    assert len(log) == (full_chunks - 1) * chunk_frames, f"{len(log)} steps read after truncation"
+    log.close()
+
+    print(f"{n_steps} steps recorded and read back, truncated log reads {(full_chunks - 1) * chunk_frames} steps")
+
+
+def compression(n_steps=100):
+    """
+    Record a simulated descent and check that its frames are compressed, and that the pool
+    stays within its memory budget.
+    """
+    env = KinematicDroneSimulator(seed=0)
+    ingest = FrameIngest()
+    path = os.path.join(tempfile.mkdtemp(), "flight.log")
+    recorder = FlightRecorder(path, pool_bytes=8 * 2 ** 20)
+    observation = env.reset()
+    frames = []
+    for index in range(n_steps):
+        frames.append(observation[0])
+        recorder.record(index, ingest.ingest(observation[0]), observation[1][1], None, [0.0, 0.0, 0.0, -0.5])
+        observation, _, done, _ = env.step([0.0, 0.0, 0.0, -0.5])
+        if done:
+            observation = env.reset()
+    recorder.close()
+    env.close()
+
+    height, width = env.image_size
+    assert recorder.pool_size == 8 * 2 ** 20 // (height * width * 4)
+    raw = recorder.recorded * height * width * 3
+    size = os.path.getsize(path)
+    print(f"{recorder.recorded} simulated frames: {size / 2 ** 20:.1f} MB logged for {raw / 2 ** 20:.1f} MB raw")
+    assert size < raw / 3, "the frames are not compressed"
+
+    log = FlightLog(path)
+    for index in (0, len(log) - 1, 1):
+        step = log.record(index)["index"]  # Steps may have been dropped if the writer fell behind
+        assert np.array_equal(log.frame(index), frames[step].transpose(1, 2, 0)), f"frame {step} differs"
+    log.close()
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_flight_recorder.py
+    round_trip()
+    compression()
+    print("Flight logs round-trip.")
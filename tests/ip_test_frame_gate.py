@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from control_actions import Control
+
+PAD_IMAGE = Path("./landing_pad_images/landing_pad.png")
+
+
+def hover(frame_size=(480, 640), n_frames=60, pad_size=120):
+    """
+    Render a hover over the landing pad: the camera stays still (with sensor noise), then
+    drifts slowly, then jumps to another view.
+
+    Yields:
+        tuple: (frame, pad centre)
+    """
+    pad = cv2.resize(cv2.imread(str(PAD_IMAGE)), (pad_size, pad_size), interpolation=cv2.INTER_AREA)
+    height, width = frame_size
+    rng = np.random.default_rng(0)
+    ground = rng.integers(40, 90, size=(2 * height, 2 * width, 3), dtype=np.uint8)
+    ground[..., 1] += 40  # Greenish ground
+    pad_x, pad_y = width, height
+    ground[pad_y:pad_y + pad_size, pad_x:pad_x + pad_size] = pad
+
+    for i in range(n_frames):
+        if i < n_frames // 2:
+            x, y = 400, 300  # Still
+        elif i < n_frames - 5:
+            x, y = 400 - (i - n_frames // 2), 300 - (i - n_frames // 2) // 2  # Slow drift
+        else:
+            x, y = 600, 200  # Jump
+        frame = ground[y:y + height, x:x + width].astype(np.int16)
+        noise = rng.integers(-3, 4, size=frame.shape)
+        yield np.clip(frame + noise, 0, 255).astype(np.uint8), (pad_x - x + pad_size // 2, pad_y - y + pad_size // 2)
+
+
+def compare(max_age=10):
+    """
+    Run the OpenCV detector with and without the frame gate, and check that the gate skips
+    most detections while keeping the centre on the pad.
+    """
+    plain = Control(roi_tracking=False)
+    gated = Control(roi_tracking=False, gate=True, gate_max_age=max_age)
+    errors = []
+    for index, (frame, center) in enumerate(hover()):
+        expected = plain.detect_result(frame, 5.0).center
+        result = gated.detect_result(frame, 5.0)
+        assert (expected is None) == (result.center is None), f"frame {index}: {expected} vs {result.center}"
+        if expected is not None:
+            errors.append(np.hypot(*np.subtract(result.center, expected)))
+            # Translations are estimated on a thumbnail 10 times smaller than the frame
+            assert errors[-1] <= 10, f"frame {index}: reused centre {result.center}, detected {expected}"
+        if index == 55:  # The jump
+            assert gated.gate.change is None or gated.gate.change > gated.gate.threshold, "jump not detected"
+
+    stats = gated.gate.stats()
+    print(f"Gate: {stats}, mean centre error {np.mean(errors):.2f} px")
+    assert stats["hit_rate"] > 0.6, f"hit rate {stats['hit_rate']:.2f}"
+    assert stats["forced"] > 0, "the maximum age never forced a detection"
+
+
+def probe_after_bypass(max_age=10, probe_every=20):
+    """
+    Bypass the gate on a hover, and check that no reused detection, on the probes in
+    particular, is older than `max_age` frames.
+    """
+    gated = Control(roi_tracking=False, gate=True, gate_max_age=max_age)
+    gate = gated.gate
+    gate.probe_every, gate.min_samples = probe_every, 5
+    gate.margin = np.inf  # Bypass as soon as the costs are measured
+    stored, oldest, probe_hits = None, 0, 0
+    for index, (frame, _) in enumerate(hover(n_frames=120)):
+        hits, misses, bypassed = gate.hits, gate.misses, gate.bypassed
+        gated.detect_result(frame, 5.0)
+        if gate.hits > hits:
+            # Age of the frame the reused detection was made on
+            oldest = max(oldest, index - stored)
+            probe_hits += bypassed > 0
+        elif gate.misses > misses:
+            stored = index
+
+    print(f"Bypassed gate: {gate.stats()}, {probe_hits} probe hits, oldest reused detection {oldest} frames")
+    assert gate.bypassed > 0, "the gate was never bypassed"
+    assert probe_hits > 0, "no probe reused a detection"
+    assert oldest <= max_age, f"a detection {oldest} frames old was reused"
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_frame_gate.py
+    compare()
+    probe_after_bypass()
+    print("The frame gate reuses detections on still frames.")
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from episode_runner import KinematicFactory
+from gain_sweep import grid, random_search, sweep
+
+
+def search_spaces():
+    """
+    Grids enumerate every combination; random search stays in its ranges and is reproducible.
+    """
+    candidates = grid({"kp_min": [0.01, 0.02], "dynamic_gains": [False, True], "error_threshold": [15]})
+    assert len(candidates) == 4 and {c["error_threshold"] for c in candidates} == {15}
+    samples = random_search({"kp_min": (0.005, 0.03), "dynamic_gains": [False, True]}, 10, seed=1)
+    assert all(0.005 <= s["kp_min"] <= 0.03 for s in samples)
+    assert samples == random_search({"kp_min": (0.005, 0.03), "dynamic_gains": [False, True]}, 10, seed=1)
+    print(f"{len(candidates)} grid points, {len(samples)} random samples")
+
+
+def incremental(episodes=2):
+    """
+    A rerun with one more candidate only flies the new one.
+    """
+    factory = KinematicFactory(max_steps=300)
+    cache_path = os.path.join(tempfile.mkdtemp(), "sweep.jsonl")
+    options = {"command_gain": factory(0).command_gain}
+    first = sweep(factory, grid({"kp_min": [0.01, 0.02]}), episodes, 1, options, cache_path=cache_path,
+                  verbose=False)
+    assert not any(entry["cached"] for entry in first)
+
+    second = sweep(factory, grid({"kp_min": [0.01, 0.02, 0.03]}), episodes, 1, options, cache_path=cache_path,
+                   verbose=False)
+    cached = {entry["params"]["kp_min"] for entry in second if entry["cached"]}
+    assert cached == {0.01, 0.02}, f"cached: {cached}"
+    assert [entry["summary"] for entry in first] == [entry["summary"] for entry in second if entry["cached"]]
+    print(f"Rerun flew 1 of 3 parameter sets; best: {second[0]['params']}")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_gain_sweep.py
+    search_spaces()
+    incremental()
+    print("Sweeps are ranked and cached.")
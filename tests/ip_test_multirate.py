@@ -0,0 +1,102 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from annotation import Detection, DetectionResult
+from control_actions import Control
+from multirate import Estimate, MultiRateController, VisionThread
+
+
+class SlowControl(Control):
+    """
+    Control whose detector takes `delay` seconds and finds the pad at a fixed position.
+    """
+
+    delay = 0.02
+
+    def run_detector(self, frame, pos):
+        time.sleep(self.delay)
+        return DetectionResult(frame, [320, 240], Detection([400, 300], "cv"))
+
+
+def vision_rate(n_frames=50, control_rate=200.0):
+    """
+    Feed frames faster than the detector handles them: the vision thread must skip frames,
+    never block the caller, and publish estimates in frame order.
+    """
+    controller = MultiRateController(SlowControl())
+    vision = VisionThread(controller.control, controller.estimates)
+    chw = np.zeros((3, 480, 640), np.uint8)
+    seqs = []
+    start = time.perf_counter()
+    for seq in range(n_frames):
+        vision.submit(chw, 5.0, seq, time.perf_counter())
+        estimate = controller.estimates.read()
+        if estimate is not None:
+            seqs.append(estimate.seq)
+        time.sleep(1 / control_rate)
+    elapsed = time.perf_counter() - start
+    vision.close()
+
+    print(f"{n_frames} frames in {elapsed:.2f} s: {vision.processed} detected, {vision.dropped} skipped")
+    assert elapsed < n_frames * SlowControl.delay / 2, "submit waited for the detector"
+    assert vision.dropped > 0 and vision.processed < n_frames
+    assert seqs == sorted(seqs), "estimates out of order"
+
+
+def hold_between_estimates():
+    """
+    Without tracker, a correction is applied on the tick of a new estimate only, while the
+    descent throttle follows the height on every tick.
+    """
+    control = Control()
+    controller = MultiRateController(control, max_age=1.0)
+    now = time.perf_counter()
+    frame = np.zeros((480, 640, 3), np.uint8)
+
+    # Far from the pad: roll and pitch once, then hold
+    controller.estimates.write(Estimate(0, now, DetectionResult(frame, [320, 240], Detection([400, 300], "cv"))))
+    actions = controller.tick(5.0, now)
+    assert actions[0] != 0 and actions[1] != 0, actions
+    actions = controller.tick(5.0, now + 0.05)
+    assert actions[:2] == [0.0, 0.0] and actions[3] == 0.0, actions
+
+    # Centred: the descent throttle is recomputed from each new height
+    controller.estimates.write(Estimate(1, now + 0.1, DetectionResult(frame, [320, 240], Detection([322, 241], "cv"))))
+    throttles = [controller.tick(height, now + 0.1)[3] for height in (3.0, 2.4, 1.8)]
+    assert throttles == [-3.0 / 1.5, -2.4 / 1.5, -1.8 / 1.5], throttles
+    print(f"Correction once per estimate, descent throttle per tick: {throttles}")
+
+
+def latency_compensation(lag=3, speed=4.0, n_ticks=60, period=0.05):
+    """
+    Estimates arrive `lag` ticks after their frame while the pad moves at constant speed: the
+    tracked centre must follow the current position only when measurements are moved forward.
+    """
+    frame = np.zeros((480, 640, 3), np.uint8)
+    errors = {}
+    for compensate in (False, True):
+        controller = MultiRateController(Control(track=True), max_age=1.0, compensate=compensate)
+        for tick in range(n_ticks):
+            now = tick * period
+            seq = tick - lag
+            if seq >= 0:
+                center = [100 + speed * seq, 240]
+                result = DetectionResult(frame, [320, 240], Detection(center, "cv"))
+                controller.estimates.write(Estimate(seq, seq * period, result))
+            controller.tick(5.0, now)
+        errors[compensate] = abs(controller.control.tracker.x[0] - (100 + speed * (n_ticks - 1)))
+    print(f"Tracked centre error with a {lag}-tick delay: {errors[False]:.1f} px uncompensated, "
+          f"{errors[True]:.1f} px compensated")
+    assert errors[False] > 0.8 * lag * speed and errors[True] < 1.0, errors
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_multirate.py
+    vision_rate()
+    hold_between_estimates()
+    latency_compensation()
+    print("The control stage runs at its own rate.")
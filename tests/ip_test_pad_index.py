@@ -0,0 +1,132 @@
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from image_processing import image_processing
+from pad_index import GridIndex, PadCandidate, PadIndex
+
+PAD_IMAGE = Path("./landing_pad_images/landing_pad.png")
+
+
+def multi_pad_yard(n_frames=60, view=(480, 640)):
+    """
+    Fly over a yard of several pads: the camera pans, and a perfectly square pad enters the
+    view while the drone approaches a slightly elongated one.
+
+    Yields:
+        tuple: (frame, [x, y] centre of the approached pad in the frame)
+    """
+    pad = cv2.imread(str(PAD_IMAGE))
+    if pad is None:
+        raise FileNotFoundError(f"Landing pad image '{PAD_IMAGE}' not found!")
+
+    rng = np.random.default_rng(0)
+    ground = rng.integers(40, 90, size=(view[0] + 200, view[1] + 800, 3), dtype=np.uint8)
+    ground[..., 1] += 40  # Greenish ground
+
+    # (x, y, width, height) of the pads on the ground; the first one is approached
+    pads = [(400, 150, 120, 100), (620, 260, 90, 90), (260, 330, 100, 95), (780, 200, 130, 130)]
+    for x, y, w, h in pads:
+        ground[y:y + h, x:x + w] = cv2.resize(pad, (w, h), interpolation=cv2.INTER_AREA)
+
+    for i in range(n_frames):
+        x0 = 5 * i
+        target = [pads[0][0] + pads[0][2] // 2 - x0, pads[0][1] + pads[0][3] // 2 - 100]
+        yield ground[100:100 + view[0], x0:x0 + view[1]].copy(), target
+
+
+def nearest_matches_brute_force(n_points=200, n_queries=500):
+    """
+    The grid search must return the same point as a brute-force search.
+    """
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 1000, size=(n_points, 2)).tolist()
+    grid = GridIndex(50)
+    grid.build(points)
+    for query in rng.uniform(-200, 1200, size=(n_queries, 2)).tolist():
+        distances = np.hypot(*(np.array(points) - query).T)
+        assert np.isclose(distances[grid.nearest(query)], distances.min())
+        within = grid.nearest(query, max_distance=30)
+        assert (within is None) == (distances.min() > 30)
+    print(f"Grid nearest-neighbour search agrees with brute force on {n_queries} queries.")
+
+
+def follow_target():
+    """
+    The detector must stay on the approached pad when a better-scoring pad enters the view.
+    """
+    detector = image_processing(roi_tracking=False, multires=False, min_area=2000)
+    expected = None
+    for i, (frame, target) in enumerate(multi_pad_yard()):
+        result = detector.cv_detect(frame, expected=expected if i else target)
+        assert result.center is not None, f"Frame {i}: no pad found"
+        error = np.hypot(result.center[0] - target[0], result.center[1] - target[1])
+        assert error < 5, f"Frame {i}: detection jumped to {result.center}, expected {target}"
+        expected = result.center
+    best = detector.pad_candidates[0]
+    assert best.squareness > 0.95 and best.center != result.center, "The square pad should score best"
+    assert detector.pad_index.switches == 0
+    print(f"Followed the approached pad over {i + 1} frames with up to {len(detector.pad_index.pads)} pads known.")
+
+
+def detection_gap(max_age=15, view=(480, 640)):
+    """
+    A pad must keep its id across a short gap in the detections, and be forgotten after a
+    gap longer than `max_age` frames: another pad appearing at its place is then a new pad.
+    """
+    pad = cv2.resize(cv2.imread(str(PAD_IMAGE)), (120, 120), interpolation=cv2.INTER_AREA)
+    rng = np.random.default_rng(3)
+    empty = rng.integers(40, 90, size=view + (3,), dtype=np.uint8)
+    empty[..., 1] += 40  # Greenish ground
+    seen = empty.copy()
+    seen[180:300, 260:380] = pad
+
+    detector = image_processing(roi_tracking=False, multires=False, min_area=2000)
+    detector.pad_index.max_age = max_age
+    targets = []
+    for gap in (max_age // 2, max_age + 5):
+        for frame in [seen] * 3 + [empty] * gap + [seen] * 3:
+            detector.cv_detect(frame)
+        targets.append(detector.pad_index.target)
+    assert targets[0] == 0, f"The pad changed id ({targets[0]}) over a {max_age // 2}-frame gap"
+    assert targets[1] == 1, f"The pad kept id {targets[1]} over a {max_age + 5}-frame gap"
+    print(f"Pad kept over a {max_age // 2}-frame gap and forgotten after a {max_age + 5}-frame gap.")
+
+
+def association_cost(n_candidates=50, n_frames=500):
+    """
+    Association must stay cheap with dozens of candidates.
+    """
+    rng = np.random.default_rng(2)
+    centers = rng.uniform(0, [1280, 720], size=(n_candidates, 2))
+    index = PadIndex(max_distance=40)
+    index.associate([PadCandidate([0.0, 0.0], None, None, 5000.0, 1.0, 1.0)])
+    index.select([], [0])
+    index.reset()
+    assert index.next_id == 0 and index.switches == 0 and not index.pads, "reset must clear the counters"
+    elapsed = 0.0
+    for _ in range(n_frames):
+        centers += rng.normal(0, 3, size=centers.shape)
+        order = rng.permutation(n_candidates)  # Contour order is arbitrary
+        candidates = [PadCandidate(centers[i].tolist(), None, None, 5000.0, 1.0, 1.0) for i in order]
+        start = time.perf_counter()
+        ids = index.associate(candidates)
+        index.select(candidates, ids, centers[0])
+        elapsed += time.perf_counter() - start
+    assert index.switches == 0
+    per_frame = 1000 * elapsed / n_frames
+    print(f"Association of {n_candidates} candidates: {per_frame:.3f} ms per frame")
+    assert per_frame < 1.0
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_pad_index.py
+    nearest_matches_brute_force()
+    follow_target()
+    detection_gap()
+    association_cost()
+    print("The pad index follows the approached pad among several candidates.")
@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from control_actions import Control
+from pad_tracker import PadTracker
+
+PAD_IMAGE = Path("./landing_pad_images/landing_pad.png")
+
+
+def pad_path(n_frames=200):
+    """
+    Pad centre drifting across a 640x480 image with a slowly turning velocity.
+
+    Returns:
+        numpy.ndarray: (n_frames, 2) centres in pixels.
+    """
+    t = np.arange(n_frames)
+    return np.stack([320 + 150 * np.sin(t / 40), 240 + 100 * np.cos(t / 55)], axis=1)
+
+
+def compare(detect_every, noise=2.0, seed=0):
+    """
+    Follow the path with noisy detections on one frame out of `detect_every`, and compare the
+    tracker with holding the last detection (the behaviour without tracker).
+    """
+    rng = np.random.default_rng(seed)
+    path = pad_path()
+    tracker = PadTracker(measurement_noise=noise)
+    tracked_errors, held_errors = [], []
+    last_detection = None
+
+    for index, center in enumerate(path):
+        tracker.predict()
+        if index % detect_every == 0 or tracker.uncertainty > 12.0:
+            last_detection = center + rng.normal(0.0, noise, 2)
+            tracker.update(last_detection)
+        tracked_errors.append(np.linalg.norm(np.subtract(tracker.center, center)))
+        held_errors.append(np.linalg.norm(last_detection - center))
+
+    tracked, held = np.mean(tracked_errors[10:]), np.mean(held_errors[10:])
+    print(f"detect every {detect_every}: tracker error {tracked:.2f} px, last detection error {held:.2f} px")
+    assert tracked < held, f"detect every {detect_every}: tracker is worse than the last detection"
+
+
+def lost_pad(n_seen=10, n_lost=200, frame_size=(480, 640), altitude=5.0):
+    """
+    Fly over the pad moving 5 px per frame, then lose it for `n_lost` frames: the track must be
+    dropped and the commands stay bounded, ending up as without tracker (holding the last
+    detected centre).
+    """
+    pad = cv2.imread(str(PAD_IMAGE))
+    if pad is None:
+        raise FileNotFoundError(f"Landing pad image '{PAD_IMAGE}' not found!")
+    height, width = frame_size
+    rng = np.random.default_rng(0)
+    ground = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+    ground[..., 1] += 40  # Greenish ground
+
+    tracked = Control(track=True)
+    held = Control(track=False)
+    commands = []
+    for i in range(n_seen + n_lost):
+        frame = ground.copy()
+        if i < n_seen:
+            x = 400 + 5 * i
+            frame[150:270, x:x + 120] = cv2.resize(pad, (120, 120), interpolation=cv2.INTER_AREA)
+        actions, _ = tracked.get_control_actions(frame, altitude, annotate=False)
+        baseline, _ = held.get_control_actions(frame, altitude, annotate=False)
+        commands.append(actions[:2])
+        if i < n_seen:
+            assert tracked.tracker.center is not None, f"Frame {i}: pad not tracked"
+
+    largest = np.abs(commands).max()
+    assert tracked.tracker.center is None and tracked.tracker.drops == 1, "The lost track was not dropped"
+    assert largest <= 1.0, f"Roll/pitch command reached {largest:.3f}"
+    assert np.allclose(actions, baseline), f"Held commands {actions} differ from the baseline {baseline}"
+    print(f"Lost pad: track dropped, largest roll/pitch command {largest:.3f}, then {np.round(actions[:2], 3).tolist()} as without tracker")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_pad_tracker.py
+    for detect_every in (1, 3, 5):
+        compare(detect_every)
+    lost_pad()
+    print("The tracker predicts the pad between detections.")
@@ -0,0 +1,101 @@
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from image_processing import image_processing
+
+PAD_IMAGE = Path("./landing_pad_images/landing_pad.png")
+
+
+def synthetic_descent(frame_size=(720, 1280), n_frames=120):
+    """
+    Render a descent over the landing pad: the pad drifts across the view and grows
+    as the altitude drops.
+
+    Yields:
+        tuple: (frame, altitude)
+    """
+    pad = cv2.imread(str(PAD_IMAGE))
+    if pad is None:
+        raise FileNotFoundError(f"Landing pad image '{PAD_IMAGE}' not found!")
+
+    height, width = frame_size
+    rng = np.random.default_rng(0)
+    background = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+    background[..., 1] += 40  # Greenish ground
+
+    for i in range(n_frames):
+        t = i / (n_frames - 1)
+        altitude = 10.0 - 8.5 * t
+        size = int(1200 / altitude)
+        x = int(width * (0.2 + 0.4 * t) + 30 * np.sin(6 * t)) - size // 2
+        y = int(height * (0.3 + 0.3 * t) + 20 * np.cos(5 * t)) - size // 2
+
+        frame = background.copy()
+        resized = cv2.resize(pad, (size, size), interpolation=cv2.INTER_AREA)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + size), min(height, y + size)
+        frame[y0:y1, x0:x1] = resized[y0 - y:y1 - y, x0 - x:x1 - x]
+        yield frame, altitude
+
+
+def recorded_sequence(video_path):
+    """
+    Read the frames of a recorded flight video (altitude unknown).
+
+    Yields:
+        tuple: (frame, None)
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Error: Could not open video '{video_path}'.")
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame, None
+    finally:
+        cap.release()
+
+
+def compare(sequence, name):
+    """
+    Run tracked and full-frame detection side by side and check that they agree on every frame.
+    """
+    tracked = image_processing(roi_tracking=True)
+    full = image_processing(roi_tracking=False)
+    tracked_time = full_time = 0.0
+    n_frames = n_detected = 0
+
+    for index, (frame, altitude) in enumerate(sequence):
+        start = time.perf_counter()
+        _, full_center, _ = full.cv_detection(frame.copy(), altitude)
+        full_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, tracked_center, _ = tracked.cv_detection(frame.copy(), altitude)
+        tracked_time += time.perf_counter() - start
+
+        assert tracked_center == full_center, (
+            f"{name}: frame {index} tracked {tracked_center} != full-frame {full_center}"
+        )
+        n_frames += 1
+        n_detected += full_center is not None
+
+    print(f"{name}: {n_frames} frames, {n_detected} detections, "
+          f"full-frame {1000 * full_time / n_frames:.2f} ms/frame, "
+          f"tracked {1000 * tracked_time / n_frames:.2f} ms/frame, "
+          f"speedup x{full_time / tracked_time:.1f}")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_roi_tracking.py [recorded_video ...]
+    compare(synthetic_descent(), "synthetic descent")
+    for video_path in sys.argv[1:]:
+        compare(recorded_sequence(video_path), video_path)
+    print("ROI tracking matches full-frame detection.")
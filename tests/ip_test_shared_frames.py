@@ -0,0 +1,70 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from shared_frames import SharedFrameRing, SharedResults
+
+
+def read_back(ring_name, shape, slots, results_name, seqs):
+    """
+    Reader process: attach to the ring by name, sum each frame it is given and publish the
+    sum through the results table, one row per frame.
+    """
+    ring = SharedFrameRing(shape, slots, name=ring_name)
+    results = SharedResults(len(seqs), name=results_name)
+    for row, seq in enumerate(seqs):
+        _, rgbx, height, frame_time = ring.latest(seq - 1)
+        results.publish(row, seq, frame_time, [int(rgbx[..., :3].sum() % 100000), int(rgbx[..., 3].max())],
+                        confidence=height)
+    ring.close()
+    results.close()
+
+
+def round_trip(shape=(48, 64), slots=4):
+    """
+    Write observations into the ring, read them in another process and check the copies.
+    """
+    rng = np.random.default_rng(0)
+    ring = SharedFrameRing(shape, slots)
+    observations = rng.integers(0, 256, size=(slots, 3) + shape, dtype=np.uint8)
+    seqs = [ring.write(chw, height=float(index)) for index, chw in enumerate(observations)]
+    results = SharedResults(slots)
+
+    # Latest wins: an up-to-date reader only ever gets the newest frame
+    seq, rgbx, height, _ = ring.latest()
+    assert seq == seqs[-1] and height == slots - 1
+    assert np.array_equal(rgbx[..., :3], observations[-1].transpose(1, 2, 0)) and not rgbx[..., 3].any()
+    assert ring.latest(seq) is None
+
+    # Another process reads the same memory: each frame, as of its sequence number
+    for row, seq in enumerate(seqs):
+        ring.latest_seq[0] = seq  # Replay the publications one by one
+        process = multiprocessing.get_context("spawn").Process(
+            target=read_back, args=(ring.name, shape, slots, results.name, [seq]))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        result = results.read(0)
+        expected = int(observations[row].astype(np.int64).sum() % 100000)
+        assert result["seq"] == seq and list(result["center"]) == [expected, 0], f"frame {seq}: {result}"
+        assert result["confidence"] == row
+
+    # A slot rewritten while a reader used it is reported
+    ring.latest_seq[0] = seqs[-1]
+    seq, _, _, _ = ring.latest()
+    for chw in observations:
+        ring.write(chw)
+    assert not ring.valid(seq), "overwritten frame reported valid"
+
+    ring.close()
+    results.close()
+    print(f"{slots} frames of {shape[1]}x{shape[0]} shared with another process")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_shared_frames.py
+    round_trip()
+    print("Frames and results are shared between processes.")
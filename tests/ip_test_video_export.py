@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from frame_ingest import FrameIngest
+from video_export import VideoExporter
+
+
+def export(extension, n_frames=120, queue_size=4, every=2, scale=0.5):
+    """
+    Push frames faster than the writer encodes them: every frame must be written, dropped or
+    decimated, and the file must hold the written frames. With a pool holding every kept
+    frame, nothing may be dropped.
+    """
+    rng = np.random.default_rng(0)
+    ingest = FrameIngest()
+    frames = [ingest.ingest(rng.integers(0, 256, size=(3, 240, 320), dtype=np.uint8)).bgr().copy()
+              for _ in range(8)]
+    path = os.path.join(tempfile.mkdtemp(), f"run{extension}")
+    exporter = VideoExporter(path, fps=20, scale=scale, every=every, queue_size=queue_size)
+
+    # Opening the file and allocating the pool happen once, before the loop
+    exporter.start(frames[0].shape)
+    durations = []
+    for index in range(n_frames):
+        start = time.perf_counter()
+        exporter.write(frames[index % len(frames)])
+        durations.append(time.perf_counter() - start)
+    exporter.close()
+
+    stats = exporter.stats()
+    assert stats["written"] + stats["dropped"] + stats["decimated"] == n_frames, stats
+    assert stats["decimated"] == n_frames - n_frames // every
+    if queue_size >= n_frames // every:
+        assert stats["dropped"] == 0 and stats["written"] == n_frames // every, stats
+    # Write times are only reported: they depend on the machine's load. A write never waits for
+    # the writer, which the drops above show when the pool is small.
+    median, slowest = np.median(durations), max(durations)
+
+    capture = cv2.VideoCapture(path)
+    count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    capture.release()
+    if extension == ".gif" and count <= 0:
+        from PIL import Image
+
+        with Image.open(path) as image:
+            count, width = image.n_frames, image.size[0]
+    assert count == stats["written"], f"{count} frames in the file, {stats['written']} written"
+    assert width == int(320 * scale)
+    print(f"{extension}: {stats}, write {1000 * median:.2f} ms median, {1000 * slowest:.2f} ms max")
+
+
+def bad_frames():
+    """
+    Frames of another size, frames beyond the GIF limit and a video that cannot be opened are
+    counted, not raised.
+    """
+    directory = tempfile.mkdtemp()
+    frame = np.zeros((48, 64, 3), np.uint8)
+
+    exporter = VideoExporter(os.path.join(directory, "short.gif"), queue_size=32, max_gif_frames=5)
+    for _ in range(10):
+        exporter.write(frame)
+    exporter.write(np.zeros((24, 32, 3), np.uint8))
+    exporter.close()
+    stats = exporter.stats()
+    assert (stats["written"], stats["truncated"], stats["mismatched"]) == (5, 5, 1), stats
+
+    exporter = VideoExporter(os.path.join(directory, "missing", "run.mp4"))
+    for _ in range(3):
+        exporter.write(frame)
+    exporter.close()
+    stats = exporter.stats()
+    assert exporter.error is not None and (stats["written"], stats["failed"]) == (0, 3), stats
+    print(f"Bad frames and unopenable videos are counted: {stats}")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_video_export.py
+    export(".mp4")
+    export(".gif")
+    export(".mp4", queue_size=64)
+    export(".gif", queue_size=64)
+    bad_frames()
+    print("Frames are exported without blocking the caller.")
@@ -0,0 +1,74 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from frame_sources import load_images
+from image_processing import image_processing
+
+MODEL_PATH = Path("./models/landing_pad.pt")
+
+
+def box_iou(a, b):
+    """
+    Intersection over union of two `[x1, y1, x2, y2]` boxes.
+    """
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def compare(frames, min_iou=0.9, max_conf_diff=0.05):
+    """
+    Run the ultralytics and ONNX Runtime backends on the same frames and check that their
+    most confident detections agree.
+    """
+    reference = image_processing(yolo_backend="ultralytics")
+    onnx = image_processing(yolo_backend="onnx")
+    reference.preload(yolo=True)
+    onnx.preload(yolo=True)
+    reference_time = onnx_time = 0.0
+
+    for frame in frames:
+        start = time.perf_counter()
+        expected, _ = reference.yolo_detections(frame.image.copy())
+        reference_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual, _ = onnx.yolo_detections(frame.image.copy())
+        onnx_time += time.perf_counter() - start
+
+        expected = expected[expected[:, 4] > reference.yolo_conf]
+        actual = actual[actual[:, 4] > onnx.yolo_conf]
+        assert len(expected) == len(actual), (
+            f"{frame.name}: {len(expected)} ultralytics detections != {len(actual)} ONNX detections"
+        )
+        if len(expected):
+            iou = box_iou(expected[0], actual[0])
+            assert iou > min_iou, f"{frame.name}: IoU {iou:.3f} <= {min_iou}"
+            assert abs(expected[0, 4] - actual[0, 4]) < max_conf_diff, (
+                f"{frame.name}: confidence {expected[0, 4]:.3f} vs {actual[0, 4]:.3f}"
+            )
+
+    print(f"{len(frames)} frames, ultralytics {1000 * reference_time / len(frames):.1f} ms/frame, "
+          f"ONNX {1000 * onnx_time / len(frames):.1f} ms/frame, "
+          f"speedup x{reference_time / onnx_time:.1f}")
+
+
+if __name__ == "__main__":
+    # Usage: python tests/ip_test_yolo_onnx.py
+    if not MODEL_PATH.exists():
+        sys.exit(f"Model '{MODEL_PATH}' not found, skipping.")
+    try:
+        import onnxruntime  # noqa: F401
+        import ultralytics  # noqa: F401
+    except ImportError as exc:
+        sys.exit(f"{exc.name} is not installed, skipping.")
+
+    frames = load_images()
+    compare(frames)
+    print("ONNX backend matches ultralytics.")